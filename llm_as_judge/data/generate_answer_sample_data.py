@@ -83,6 +83,7 @@ for item in chunks_and_questions:
         'Chunk': item["chunk"],
         'Question': item["question"],
         'Answer': generated_answer,
+        'Ground Truth Answer': item["ground_truth_answer"],
     }
     entry.update(scores)
     data.append(entry)
@@ -105,7 +106,7 @@ df = pd.DataFrame(data)
 
 # Reorder columns to group LLM and Human scores together
 metric_columns = ['Stand-alone Quality', 'Readiness', 'Relevance', 'Completeness']
-column_order = ['Chunk', 'Question', 'Answer']
+column_order = ['Chunk', 'Question', 'Answer', 'Ground Truth Answer']
 for metric in metric_columns:
     column_order.extend([f'LLM {metric}', f'Human {metric}'])
 
@@ -2,9 +2,9 @@ import os
 from pathlib import Path
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 from llm_as_judge.metrics.evaluation_metrics import EvaluationMetrics
 from llm_as_judge.metrics.metrics_recorder import MetricsRecorder
+from llm_as_judge.score_analysis.density import BinnedDensity, density_scatter
 from llm_as_judge.score_analysis.score_distribution_analyzer import ScoreDistributionAnalyzer
 import numpy as np
 
@@ -132,8 +132,8 @@ def analyze_answer_evaluation(data_path: str, output_dir: Path):
     plt.figure(figsize=(15, 10))
     for idx, metric in enumerate(metrics, 1):
         plt.subplot(2, 2, idx)
-        sns.kdeplot(data=df[f'LLM {metric}'], label='LLM')
-        sns.kdeplot(data=df[f'Human {metric}'], label='Human')
+        plt.plot(*BinnedDensity(df[f'LLM {metric}'].values).kde(), label='LLM')
+        plt.plot(*BinnedDensity(df[f'Human {metric}'].values).kde(), label='Human')
         plt.title(metric)
         plt.xlabel('Score')
         plt.ylabel('Density')
@@ -147,9 +147,10 @@ def analyze_answer_evaluation(data_path: str, output_dir: Path):
     plt.figure(figsize=(12, 6))
     
     # Position bias plot
-    plt.subplot(1, 2, 1)
-    for col in llm_columns:
-        plt.scatter(range(len(df)), df[col], alpha=0.5, label=col)
+    ax = plt.subplot(1, 2, 1)
+    positions = np.arange(len(df))
+    for col, cmap in zip(llm_columns, ['Blues', 'Oranges', 'Greens', 'Reds']):
+        density_scatter(ax, positions, df[col].values, label=col, cmap=cmap)
     plt.title('Position Bias Analysis')
     plt.xlabel('Answer Position')
     plt.ylabel('Score')
@@ -2,9 +2,10 @@ import os
 from pathlib import Path
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 from llm_as_judge.metrics.evaluation_metrics import EvaluationMetrics
 from llm_as_judge.metrics.metrics_recorder import MetricsRecorder
+from llm_as_judge.metrics.question_similarity import question_similarity
+from llm_as_judge.score_analysis.density import BinnedDensity, density_scatter
 from llm_as_judge.score_analysis.score_distribution_analyzer import ScoreDistributionAnalyzer
 import numpy as np
 
@@ -117,10 +118,26 @@ def analyze_question_evaluation(data_path: str, output_dir: Path):
             f"{col.lower().replace(' ', '_')}_length_bias": bias_values['length_bias']
         })
     
+    # Question similarity to ground truth and near-duplicate generated questions
+    similarity = question_similarity(df['Ground Truth Question'], df['LLM Generated Question'])
+    similarity_metrics = {
+        'semantic_similarity_mean': similarity['semantic_similarity'].mean(),
+        'lexical_similarity_mean': similarity['lexical_similarity'].mean(),
+        'near_duplicate_rate': similarity['is_near_duplicate'].mean()
+    }
+    report.extend([
+        "\n## Question Similarity\n```\n",
+        f"Semantic Similarity (mean): {similarity_metrics['semantic_similarity_mean']:.3f}\n",
+        f"Lexical Similarity (mean): {similarity_metrics['lexical_similarity_mean']:.3f}\n",
+        f"Near-Duplicate Rate: {similarity_metrics['near_duplicate_rate']:.3f}\n",
+        "```\n"
+    ])
+    all_metrics.update(similarity_metrics)
+
     # Plot score distributions
     plt.figure(figsize=(10, 6))
-    sns.kdeplot(data=df['LLM Generated Score'], label='LLM Score')
-    sns.kdeplot(data=df['Human Evaluation Score'], label='Human Score')
+    plt.plot(*BinnedDensity(df['LLM Generated Score'].values).kde(), label='LLM Score')
+    plt.plot(*BinnedDensity(df['Human Evaluation Score'].values).kde(), label='Human Score')
     plt.title('Score Distribution: LLM vs Human Evaluation')
     plt.xlabel('Score')
     plt.ylabel('Density')
@@ -132,19 +149,20 @@ def analyze_question_evaluation(data_path: str, output_dir: Path):
     plt.figure(figsize=(12, 6))
     
     # Position bias plot
-    plt.subplot(1, 2, 1)
-    plt.scatter(range(len(df)), df['LLM Generated Score'], alpha=0.5, label='LLM Scores')
-    plt.scatter(range(len(df)), df['Human Evaluation Score'], alpha=0.5, label='Human Scores')
+    ax = plt.subplot(1, 2, 1)
+    positions = np.arange(len(df))
+    density_scatter(ax, positions, df['LLM Generated Score'].values, label='LLM Scores', cmap='Blues')
+    density_scatter(ax, positions, df['Human Evaluation Score'].values, label='Human Scores', cmap='Oranges')
     plt.title('Position Bias Analysis')
     plt.xlabel('Question Position')
     plt.ylabel('Score')
     plt.legend()
     
     # Length bias plot
-    plt.subplot(1, 2, 2)
+    ax = plt.subplot(1, 2, 2)
     df['question_length'] = df['LLM Generated Question'].str.len()
-    plt.scatter(df['question_length'], df['LLM Generated Score'], alpha=0.5, label='LLM Scores')
-    plt.scatter(df['question_length'], df['Human Evaluation Score'], alpha=0.5, label='Human Scores')
+    density_scatter(ax, df['question_length'].values, df['LLM Generated Score'].values, label='LLM Scores', cmap='Blues')
+    density_scatter(ax, df['question_length'].values, df['Human Evaluation Score'].values, label='Human Scores', cmap='Oranges')
     plt.title('Length Bias Analysis')
     plt.xlabel('Question Length')
     plt.ylabel('Score')
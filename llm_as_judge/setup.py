@@ -8,12 +8,17 @@ setup(
     install_requires=[
         "numpy>=1.24.0",
         "pandas>=2.0.0",
+        "pyarrow>=12.0.0",
         "scipy>=1.6.0",
         "scikit-learn>=1.2.0",
         "matplotlib>=3.7.0",
         "seaborn>=0.12.0",
         "loguru>=0.7.0"
     ],
+    extras_require={
+        "judge": ["aiohttp>=3.9.0"],
+        "embeddings": ["sentence-transformers>=2.2.0"]
+    },
     author="Your Name",
     author_email="your.email@example.com",
     description="A package for evaluating LLM-based evaluation systems against human judgments",
@@ -5,20 +5,55 @@ This module provides tools and metrics for evaluating LLM-based evaluation syste
 against human judgments in question-answering tasks.
 """
 
-from .core.config import LLMJudgeConfig
-from .core.evaluator import LLMJudgeEvaluator
-from .metrics import (
-    agreement_metrics,
-    correlation_metrics,
-    bias_metrics,
-    robustness_metrics
-)
+import importlib
+from typing import TYPE_CHECKING
 
 __version__ = "0.1.0"
 __author__ = "Your Name"
 
+# Attributes resolved on first access, so `import llm_as_judge` stays cheap and
+# importing one submodule does not pull in pandas, scipy and scikit-learn
+_LAZY_ATTRIBUTES = {
+    'LLMJudgeConfig': ('.core.config', 'LLMJudgeConfig'),
+    'configure_logging': ('.core.config', 'configure_logging'),
+    'LLMJudgeEvaluator': ('.core.evaluator', 'LLMJudgeEvaluator'),
+    'ConfigSweep': ('.core.sweep', 'ConfigSweep'),
+    'agreement_metrics': ('.metrics.agreement_metrics', None),
+    'correlation_metrics': ('.metrics.correlation_metrics', None),
+    'bias_metrics': ('.metrics.bias_metrics', None),
+    'history_analytics': ('.metrics.history_analytics', None),
+    'multi_rater_metrics': ('.metrics.multi_rater_metrics', None),
+    'question_similarity': ('.metrics.question_similarity', None),
+    'robustness_metrics': ('.metrics.robustness_metrics', None)
+}
+
+if TYPE_CHECKING:
+    from .core.config import LLMJudgeConfig, configure_logging
+    from .core.evaluator import LLMJudgeEvaluator
+    from .core.sweep import ConfigSweep
+    from .metrics import (
+        agreement_metrics, bias_metrics, correlation_metrics, history_analytics,
+        multi_rater_metrics, question_similarity, robustness_metrics
+    )
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    module = importlib.import_module(module_name, __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
 # Export main classes
 __all__ = [
     'LLMJudgeConfig',
-    'LLMJudgeEvaluator'
+    'LLMJudgeEvaluator',
+    'configure_logging'
 ] 
\ No newline at end of file
@@ -1,27 +1,112 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Union, Optional
+from typing import List, Dict, Union, Optional, Sequence, Tuple
 import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 
+from .metrics.lexical_overlap import lexical_overlap
+from .score_analysis.density import BinnedDensity
+
+ANSWER_METRICS = ['Stand-alone Quality', 'Readiness', 'Relevance', 'Completeness']
+TEXT_COLUMNS = ['Chunk', 'Question', 'Answer']
+REFERENCE_COLUMN = 'Ground Truth Answer'
+
+
+def _read_columns(data_path: Path) -> List[str]:
+    """Column names of a CSV or Parquet file without reading its rows."""
+    if data_path.suffix in ('.parquet', '.pq'):
+        import pyarrow.parquet as pq
+        return pq.read_schema(data_path).names
+    return pd.read_csv(data_path, nrows=0).columns.tolist()
+
+
+def _compact_scores(scores: pd.Series) -> pd.Series:
+    """Store integer-valued scores without missing values as int8, others as float32."""
+    values = scores.to_numpy(dtype=np.float32, na_value=np.nan)
+    if (np.isfinite(values).all() and np.array_equal(values, np.round(values))
+            and values.size and -128 <= values.min() and values.max() <= 127):
+        return pd.Series(values.astype(np.int8), index=scores.index, name=scores.name)
+    return pd.Series(values, index=scores.index, name=scores.name)
+
+
+def load_answer_evaluations(
+    data_path: Union[str, Path],
+    metrics: Sequence[str] = ANSWER_METRICS,
+    text_dtype: str = 'category'
+) -> pd.DataFrame:
+    """Load answer evaluations with only the needed columns and compact dtypes.
+    
+    CSV files are parsed with the pyarrow engine and Parquet files are read
+    column-wise. Scores are stored as float32, or int8 when every score of a
+    column is a whole number; text columns are stored as `text_dtype`. The
+    optional reference answer column is loaded when the file has it.
+    
+    Args:
+        data_path: Path to a CSV or Parquet file
+        metrics: Metrics whose 'LLM <metric>' and 'Human <metric>' columns to load
+        text_dtype: dtype for Chunk/Question/Answer, 'category' (repeated
+            chunks and questions are stored once) or 'string'
+        
+    Returns:
+        DataFrame with the text and score columns
+    """
+    data_path = Path(data_path)
+    score_cols = [f'{evaluator} {metric}' for metric in metrics for evaluator in ('LLM', 'Human')]
+    required_cols = TEXT_COLUMNS + score_cols
+    
+    available_cols = _read_columns(data_path)
+    missing_cols = [col for col in required_cols if col not in available_cols]
+    if missing_cols:
+        raise ValueError(f"Missing required columns: {missing_cols}")
+    text_cols = TEXT_COLUMNS + [REFERENCE_COLUMN] * (REFERENCE_COLUMN in available_cols)
+    load_cols = text_cols + score_cols
+    
+    if data_path.suffix in ('.parquet', '.pq'):
+        data = pd.read_parquet(data_path, columns=load_cols)
+        data[text_cols] = data[text_cols].astype(text_dtype)
+    else:
+        dtypes = {col: text_dtype for col in text_cols}
+        dtypes.update({col: np.float32 for col in score_cols})
+        data = pd.read_csv(data_path, engine='pyarrow', usecols=load_cols, dtype=dtypes)
+    
+    for col in score_cols:
+        data[col] = _compact_scores(data[col])
+    return data[load_cols]
+
+
+def _merge_moments(a: Tuple[np.ndarray, ...], b: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, ...]:
+    """Combine (count, mean, M2) of two row chunks (Chan et al. parallel update)."""
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta = np.where(n > 0, mean_b - mean_a, 0.0)
+        weight = np.where(n > 0, n_b / n, 0.0)
+    return n, mean_a + delta * weight, m2_a + m2_b + delta ** 2 * n_a * weight
+
 
 class AnswerEvaluationAnalyzer:
     """A class for analyzing LLM and Human evaluations of answers."""
     
-    def __init__(self, data_path: Union[str, Path]):
+    def __init__(self, data_path: Union[str, Path], text_dtype: str = 'category',
+                 chunk_rows: int = 1_000_000):
         """Initialize the analyzer with data path.
         
         Args:
-            data_path: Path to the CSV file containing evaluation data
+            data_path: Path to the CSV or Parquet file containing evaluation data
+            text_dtype: dtype for the text columns ('category' or 'string')
+            chunk_rows: Rows processed at a time by the analysis pass
         """
-        self.data = pd.read_csv(data_path)
-        self.metrics = ['Stand-alone Quality', 'Readiness', 'Relevance', 'Completeness']
+        self.metrics = list(ANSWER_METRICS)
+        self.data = load_answer_evaluations(data_path, self.metrics, text_dtype)
+        self.chunk_rows = chunk_rows
+        self._analysis: Dict[float, Dict] = {}
+        self._overlap: Optional[pd.DataFrame] = None
         self._validate_data()
     
     def _validate_data(self):
         """Validate that the data contains required columns."""
-        required_cols = ['Chunk', 'Question', 'Answer']
+        required_cols = list(TEXT_COLUMNS)
         for metric in self.metrics:
             required_cols.extend([f'LLM {metric}', f'Human {metric}'])
         
@@ -29,6 +114,133 @@ class AnswerEvaluationAnalyzer:
         if missing_cols:
             raise ValueError(f"Missing required columns: {missing_cols}")
     
+    def _fused_pass(self, min_score: float = 4.0) -> Dict:
+        """Statistics, agreement and high-quality counts for all metrics in one sweep.
+        
+        Rows are processed in chunks; each chunk is stacked into (rows, metrics)
+        LLM and human matrices so every metric is handled by the same vectorized
+        operations. Moments are merged across chunks, quartiles are taken from
+        the full columns. Results are cached per `min_score`.
+        
+        Args:
+            min_score: Minimum score to consider an answer high quality
+            
+        Returns:
+            Dictionary with per-evaluator 'describe' arrays, pairwise agreement
+            arrays and high-quality counts and example row positions
+        """
+        if min_score in self._analysis:
+            return self._analysis[min_score]
+        
+        n_metrics = len(self.metrics)
+        threshold = float(np.float32(min_score))
+        columns = {evaluator: [self.data[f'{evaluator} {metric}'].to_numpy() for metric in self.metrics]
+                   for evaluator in ('LLM', 'Human')}
+        marginal = {evaluator: tuple(np.zeros(n_metrics) for _ in range(3)) for evaluator in columns}
+        minimum = {evaluator: np.full(n_metrics, np.inf) for evaluator in columns}
+        maximum = {evaluator: np.full(n_metrics, -np.inf) for evaluator in columns}
+        paired_n, paired_mean_x, paired_mean_y, paired_m2_x, paired_m2_y, paired_cov = np.zeros((6, n_metrics))
+        abs_diff_sum, sq_diff_sum, llm_high, human_high, both_high = np.zeros((5, n_metrics))
+        examples: List[List[int]] = [[] for _ in self.metrics]
+        
+        for start in range(0, len(self.data), self.chunk_rows):
+            stop = min(start + self.chunk_rows, len(self.data))
+            chunk = {evaluator: np.column_stack([col[start:stop] for col in cols]).astype(np.float64)
+                     for evaluator, cols in columns.items()}
+            
+            # Marginal moments and extremes per evaluator
+            for evaluator, values in chunk.items():
+                valid = ~np.isnan(values)
+                count = valid.sum(axis=0).astype(float)
+                filled = np.where(valid, values, 0.0)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    mean = np.where(count > 0, filled.sum(axis=0) / count, 0.0)
+                m2 = (np.where(valid, values - mean, 0.0) ** 2).sum(axis=0)
+                marginal[evaluator] = _merge_moments(marginal[evaluator], (count, mean, m2))
+                minimum[evaluator] = np.minimum(minimum[evaluator], np.where(valid, values, np.inf).min(axis=0))
+                maximum[evaluator] = np.maximum(maximum[evaluator], np.where(valid, values, -np.inf).max(axis=0))
+            
+            # Pairwise-complete agreement statistics
+            llm, human = chunk['LLM'], chunk['Human']
+            both = ~(np.isnan(llm) | np.isnan(human))
+            count = both.sum(axis=0).astype(float)
+            x = np.where(both, llm, 0.0)
+            y = np.where(both, human, 0.0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean_x = np.where(count > 0, x.sum(axis=0) / count, 0.0)
+                mean_y = np.where(count > 0, y.sum(axis=0) / count, 0.0)
+            dx = np.where(both, llm - mean_x, 0.0)
+            dy = np.where(both, human - mean_y, 0.0)
+            cov = (dx * dy).sum(axis=0)
+            n_before, mean_x_before, mean_y_before = paired_n, paired_mean_x, paired_mean_y
+            paired_n, paired_mean_x, paired_m2_x = _merge_moments(
+                (n_before, mean_x_before, paired_m2_x), (count, mean_x, (dx ** 2).sum(axis=0)))
+            _, paired_mean_y, paired_m2_y = _merge_moments(
+                (n_before, mean_y_before, paired_m2_y), (count, mean_y, (dy ** 2).sum(axis=0)))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                weight = np.where(paired_n > 0, n_before * count / paired_n, 0.0)
+            paired_cov = paired_cov + cov + (mean_x - mean_x_before) * (mean_y - mean_y_before) * weight
+            diff = x - y
+            abs_diff_sum += np.abs(diff).sum(axis=0)
+            sq_diff_sum += (diff ** 2).sum(axis=0)
+            
+            # High-quality counts (NaN compares False). Scores are stored as float32,
+            # so the threshold is rounded the same way: float32(3.3) < 3.3 would
+            # otherwise drop rows scored exactly 3.3
+            llm_ok = llm >= threshold
+            human_ok = human >= threshold
+            both_ok = llm_ok & human_ok
+            llm_high += llm_ok.sum(axis=0)
+            human_high += human_ok.sum(axis=0)
+            both_high += both_ok.sum(axis=0)
+            for idx in range(n_metrics):
+                if len(examples[idx]) < 3:
+                    needed = 3 - len(examples[idx])
+                    examples[idx].extend((start + np.flatnonzero(both_ok[:, idx])[:needed]).tolist())
+        
+        describe = {}
+        for evaluator, cols in columns.items():
+            count, mean, m2 = marginal[evaluator]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                std = np.where(count > 1, np.sqrt(m2 / (count - 1)), np.nan)
+            quartiles = np.array([
+                np.nanquantile(col.astype(np.float64), [0.25, 0.5, 0.75]) if count[idx] else [np.nan] * 3
+                for idx, col in enumerate(cols)
+            ]).T
+            empty = count == 0
+            describe[evaluator] = np.vstack([
+                count,
+                np.where(empty, np.nan, mean),
+                std,
+                np.where(empty, np.nan, minimum[evaluator]),
+                quartiles,
+                np.where(empty, np.nan, maximum[evaluator])
+            ])
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = paired_cov / np.sqrt(paired_m2_x * paired_m2_y)
+            correlation = np.where(paired_n > 1, correlation, np.nan)
+            mae = abs_diff_sum / paired_n
+            rmse = np.sqrt(sq_diff_sum / paired_n)
+        
+        self._analysis[min_score] = {
+            'describe': describe,
+            'correlation': correlation,
+            'mae': mae,
+            'rmse': rmse,
+            'llm_high': llm_high.astype(int),
+            'human_high': human_high.astype(int),
+            'both_high': both_high.astype(int),
+            'examples': examples
+        }
+        return self._analysis[min_score]
+    
+    def _any_pass(self) -> Dict:
+        """Cached analysis for statistics that do not depend on the score threshold."""
+        if self._analysis:
+            return next(iter(self._analysis.values()))
+        return self._fused_pass()
+    
     def get_score_statistics(self, evaluator_type: str = 'all') -> pd.DataFrame:
         """Get basic statistics for all metrics.
         
@@ -38,20 +250,18 @@ class AnswerEvaluationAnalyzer:
         Returns:
             DataFrame with statistics for each metric
         """
-        stats_list = []
+        describe = self._any_pass()['describe']
+        index = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+        stats_columns = {}
         
-        for metric in self.metrics:
+        for idx, metric in enumerate(self.metrics):
             if evaluator_type.lower() in ['llm', 'all']:
-                llm_stats = self.data[f'LLM {metric}'].describe()
-                llm_stats.name = f'LLM {metric}'
-                stats_list.append(llm_stats)
+                stats_columns[f'LLM {metric}'] = describe['LLM'][:, idx]
             
             if evaluator_type.lower() in ['human', 'all']:
-                human_stats = self.data[f'Human {metric}'].describe()
-                human_stats.name = f'Human {metric}'
-                stats_list.append(human_stats)
+                stats_columns[f'Human {metric}'] = describe['Human'][:, idx]
         
-        return pd.concat(stats_list, axis=1)
+        return pd.DataFrame(stats_columns, index=index)
     
     def calculate_agreement(self) -> pd.DataFrame:
         """Calculate agreement between LLM and Human evaluations.
@@ -59,24 +269,13 @@ class AnswerEvaluationAnalyzer:
         Returns:
             DataFrame with correlation and mean absolute difference for each metric
         """
-        agreement_data = []
-        
-        for metric in self.metrics:
-            llm_scores = self.data[f'LLM {metric}']
-            human_scores = self.data[f'Human {metric}']
-            
-            correlation = llm_scores.corr(human_scores)
-            mae = np.abs(llm_scores - human_scores).mean()
-            rmse = np.sqrt(((llm_scores - human_scores) ** 2).mean())
-            
-            agreement_data.append({
-                'Metric': metric,
-                'Correlation': correlation,
-                'MAE': mae,
-                'RMSE': rmse
-            })
-        
-        return pd.DataFrame(agreement_data)
+        analysis = self._any_pass()
+        return pd.DataFrame({
+            'Metric': self.metrics,
+            'Correlation': analysis['correlation'],
+            'MAE': analysis['mae'],
+            'RMSE': analysis['rmse']
+        })
     
     def analyze_answer_quality(self, min_score: float = 4.0) -> Dict:
         """Analyze high quality answers based on score threshold.
@@ -87,27 +286,56 @@ class AnswerEvaluationAnalyzer:
         Returns:
             Dictionary with analysis results
         """
+        analysis = self._fused_pass(min_score)
+        answers = self.data['Answer']
         high_quality = {}
         
-        for metric in self.metrics:
-            llm_high = self.data[self.data[f'LLM {metric}'] >= min_score]
-            human_high = self.data[self.data[f'Human {metric}'] >= min_score]
-            
-            # Find answers rated highly by both
-            both_high = self.data[
-                (self.data[f'LLM {metric}'] >= min_score) & 
-                (self.data[f'Human {metric}'] >= min_score)
-            ]
-            
+        for idx, metric in enumerate(self.metrics):
             high_quality[metric] = {
-                'llm_count': len(llm_high),
-                'human_count': len(human_high),
-                'agreement_count': len(both_high),
-                'example_answers': both_high['Answer'].tolist()[:3]  # Top 3 examples
+                'llm_count': int(analysis['llm_high'][idx]),
+                'human_count': int(analysis['human_high'][idx]),
+                'agreement_count': int(analysis['both_high'][idx]),
+                'example_answers': answers.iloc[analysis['examples'][idx]].astype(str).tolist()  # Top 3 examples
             }
         
         return high_quality
     
+    def compute_lexical_overlap(self, n_jobs: int = 1, chunk_rows: int = 50_000) -> pd.DataFrame:
+        """Reference-based overlap of every answer with its ground truth answer.
+        
+        Cheap lexical metrics for triaging answers before spending judge calls.
+        Results are cached.
+        
+        Args:
+            n_jobs: Worker processes for the overlap computation
+            chunk_rows: Rows per chunk
+            
+        Returns:
+            DataFrame with ROUGE-1/2/L F1, BLEU and token F1 per answer
+        """
+        if self._overlap is None:
+            if REFERENCE_COLUMN not in self.data.columns:
+                raise ValueError(f"Lexical overlap needs a '{REFERENCE_COLUMN}' column")
+            self._overlap = lexical_overlap(
+                self.data['Answer'].astype(str), self.data[REFERENCE_COLUMN].astype(str),
+                chunk_rows=chunk_rows, n_jobs=n_jobs
+            )
+        return self._overlap
+    
+    def summarize_lexical_overlap(self) -> pd.DataFrame:
+        """Mean of each overlap metric and its correlation with the human scores.
+        
+        Returns:
+            DataFrame indexed by overlap metric with the mean and the Pearson
+            correlation with each 'Human <metric>' column
+        """
+        overlap = self.compute_lexical_overlap()
+        summary = pd.DataFrame({'Mean': overlap.mean()})
+        for metric in self.metrics:
+            human = self.data[f'Human {metric}'].astype(float)
+            summary[f'Corr Human {metric}'] = overlap.corrwith(human)
+        return summary
+    
     def plot_score_distributions(self, save_path: Optional[str] = None):
         """Plot distribution of scores for each metric.
         
@@ -120,8 +348,9 @@ class AnswerEvaluationAnalyzer:
         for idx, metric in enumerate(self.metrics):
             ax = axes[idx // 2, idx % 2]
             
-            sns.kdeplot(data=self.data[f'LLM {metric}'], ax=ax, label='LLM')
-            sns.kdeplot(data=self.data[f'Human {metric}'], ax=ax, label='Human')
+            for evaluator in ['LLM', 'Human']:
+                grid, density = BinnedDensity(self.data[f'{evaluator} {metric}'].to_numpy()).kde()
+                ax.plot(grid, density, label=evaluator)
             
             ax.set_title(metric)
             ax.set_xlabel('Score')
@@ -165,5 +394,11 @@ class AnswerEvaluationAnalyzer:
             for idx, answer in enumerate(data['example_answers'], 1):
                 report.append(f"{idx}. {answer}\n")
         
+        if REFERENCE_COLUMN in self.data.columns:
+            report.extend([
+                "\n## Reference Overlap\n",
+                f"```\n{self.summarize_lexical_overlap().to_string()}\n```\n"
+            ])
+        
         with open(output_path, 'w') as f:
             f.write(''.join(report)) 
\ No newline at end of file
@@ -4,7 +4,46 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-from loguru import logger
+DEFAULT_LOG_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+
+# (handler id, level, format) of the handler installed by configure_logging
+_log_handler: Optional[tuple[int, str, str]] = None
+
+
+def configure_logging(level: str = "INFO", log_format: str = DEFAULT_LOG_FORMAT) -> None:
+    """
+    Route loguru output to stdout with the given level and format.
+    
+    Idempotent: calling again with the same settings is a no-op, and new
+    settings replace the handler installed by the previous call instead of
+    adding another one. loguru's default stderr handler is removed on the
+    first call; handlers added elsewhere are left alone.
+    
+    Args:
+        level: Minimum level to emit
+        log_format: loguru format string
+    """
+    global _log_handler
+    if _log_handler is not None and _log_handler[1:] == (level, log_format):
+        return
+    
+    from loguru import logger
+    
+    if _log_handler is None:
+        try:
+            logger.remove(0)  # loguru's default stderr handler
+        except ValueError:
+            pass
+    else:
+        logger.remove(_log_handler[0])
+    handler_id = logger.add(
+        sink=lambda msg: print(msg),
+        format=log_format,
+        level=level,
+        colorize=True
+    )
+    _log_handler = (handler_id, level, log_format)
+
 
 @dataclass
 class LLMJudgeConfig:
@@ -23,20 +62,24 @@ class LLMJudgeConfig:
     n_bins_kappa: int = 5
     robustness_perturbation_std: float = 0.05
     robustness_stability_threshold: float = 0.1
+    robustness_n_trials: int = 1
+    robustness_random_seed: Optional[int] = None
+    robustness_quantiles: tuple[float, ...] = (0.05, 0.5, 0.95)
+    robustness_chunk_elements: int = 10_000_000
+    human_rater_columns: tuple[str, ...] = ()
+    panel_agreement_level: str = 'interval'
+    similarity_encoder: Optional[str] = None
+    duplicate_similarity_threshold: float = 0.9
     
-    # Logging configuration
+    # Logging configuration (applied only when setup_logging is True)
+    setup_logging: bool = False
     log_level: str = "INFO"
-    log_format: str = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+    log_format: str = DEFAULT_LOG_FORMAT
     
     def __post_init__(self):
-        """Setup logging configuration."""
-        logger.remove()  # Remove default handler
-        logger.add(
-            sink=lambda msg: print(msg),
-            format=self.log_format,
-            level=self.log_level,
-            colorize=True
-        )
+        """Setup logging configuration if requested."""
+        if self.setup_logging:
+            configure_logging(self.log_level, self.log_format)
         
     def validate_score_range(self, scores: list[float]) -> bool:
         """
@@ -11,8 +11,11 @@ from ..metrics import (
     agreement_metrics,
     correlation_metrics,
     bias_metrics,
+    multi_rater_metrics,
+    question_similarity,
     robustness_metrics
 )
+from ..score_analysis.calibration import ScoreCalibrator
 
 class LLMJudgeEvaluator:
     """Main evaluator class that integrates all metrics with robust error handling."""
@@ -51,41 +54,53 @@ class LLMJudgeEvaluator:
     def compute_agreement_metrics(self) -> Dict[str, float]:
         """Compute agreement-based metrics with error handling."""
         try:
-            metrics = {
-                'exact_match': agreement_metrics.exact_match_agreement(
-                    self.df['LLM Generated Score'],
-                    self.df['Human Evaluation Score']
-                ),
-                'cohen_kappa': agreement_metrics.cohen_kappa(
-                    self.df['LLM Generated Score'],
-                    self.df['Human Evaluation Score'],
-                    n_bins=self.config.n_bins_kappa
-                )
-            }
+            metrics = self._agreement_metrics()
             logger.debug(f"Agreement metrics computed: {metrics}")
             return metrics
         except Exception as e:
             logger.error(f"Error computing agreement metrics: {str(e)}")
             raise
             
-    def compute_correlation_metrics(self) -> Dict[str, float]:
-        """Compute correlation-based metrics with error handling."""
+    def compute_kappa_sensitivity(
+        self,
+        n_bins_range: Optional[range] = None,
+        binning: tuple[str, ...] = ('fixed', 'quantile'),
+        weights: tuple[Optional[str], ...] = (None, 'linear', 'quadratic')
+    ) -> pd.DataFrame:
+        """
+        Compute Cohen's Kappa across bin counts and binning schemes.
+        
+        The 'fixed' / unweighted row for config.n_bins_kappa equals the
+        'cohen_kappa' agreement metric.
+        
+        Args:
+            n_bins_range: Bin counts to evaluate, defaults to 2..2*n_bins_kappa
+            binning: Binning schemes ('fixed' and/or 'quantile')
+            weights: Kappa weightings (None, 'linear', 'quadratic')
+            
+        Returns:
+            DataFrame with columns binning, n_bins, weights and kappa
+        """
         try:
-            spearman_corr, spearman_p = correlation_metrics.spearman_correlation(
+            if n_bins_range is None:
+                n_bins_range = range(2, 2 * self.config.n_bins_kappa + 1)
+            sweep = agreement_metrics.cohen_kappa_sweep(
                 self.df['LLM Generated Score'],
-                self.df['Human Evaluation Score']
-            )
-            pearson_corr, pearson_p = correlation_metrics.pearson_correlation(
-                self.df['LLM Generated Score'],
-                self.df['Human Evaluation Score']
+                self.df['Human Evaluation Score'],
+                n_bins_range=n_bins_range,
+                binning=binning,
+                weights=weights
             )
+            logger.debug(f"Kappa sensitivity computed for {len(sweep)} settings")
+            return sweep
+        except Exception as e:
+            logger.error(f"Error computing kappa sensitivity: {str(e)}")
+            raise
             
-            metrics = {
-                'spearman_correlation': spearman_corr,
-                'spearman_p_value': spearman_p,
-                'pearson_correlation': pearson_corr,
-                'pearson_p_value': pearson_p
-            }
+    def compute_correlation_metrics(self) -> Dict[str, float]:
+        """Compute correlation-based metrics with error handling."""
+        try:
+            metrics = self._correlation_metrics()
             logger.debug(f"Correlation metrics computed: {metrics}")
             return metrics
         except Exception as e:
@@ -95,26 +110,7 @@ class LLMJudgeEvaluator:
     def compute_bias_metrics(self) -> Dict[str, float]:
         """Compute bias-related metrics with error handling."""
         try:
-            # Position bias
-            positions = np.arange(len(self.df))
-            pos_corr, pos_p = bias_metrics.position_bias(
-                positions,
-                self.df['LLM Generated Score']
-            )
-            
-            # Length bias
-            lengths = self.df['LLM Generated Question'].apply(bias_metrics.calculate_word_count)
-            len_corr, len_p = bias_metrics.length_bias(
-                lengths,
-                self.df['LLM Generated Score']
-            )
-            
-            metrics = {
-                'position_bias': pos_corr,
-                'position_bias_p_value': pos_p,
-                'length_bias': len_corr,
-                'length_bias_p_value': len_p
-            }
+            metrics = self._bias_metrics()
             logger.debug(f"Bias metrics computed: {metrics}")
             return metrics
         except Exception as e:
@@ -123,54 +119,347 @@ class LLMJudgeEvaluator:
             
     def compute_robustness_metrics(
         self,
-        perturbed_scores: Optional[np.ndarray] = None
+        perturbed_scores: Optional[np.ndarray] = None,
+        n_trials: Optional[int] = None,
+        random_state: Optional[Union[int, np.random.Generator]] = None
     ) -> Dict[str, float]:
         """
         Compute robustness metrics with error handling.
         
+        A 1-D `perturbed_scores` array (or a single simulated trial) yields one
+        value per metric. A 2-D array of shape (n_trials, n_rows), e.g. from
+        several re-judging runs, or `n_trials` > 1 simulated trials yields the
+        mean across trials under the usual keys plus their standard deviation
+        and the configured quantiles.
+        
         Args:
-            perturbed_scores: Optional pre-computed perturbed scores
+            perturbed_scores: Optional pre-computed perturbed scores, shape
+                (n_rows,) or (n_trials, n_rows)
+            n_trials: Number of simulated trials, defaults to config.robustness_n_trials
+            random_state: Seed or Generator for simulated perturbations,
+                defaults to config.robustness_random_seed
             
         Returns:
             Dictionary containing robustness metrics
         """
         try:
-            if perturbed_scores is None:
-                # Simulate perturbations
-                perturbed_scores = (
-                    self.df['LLM Generated Score'] +
-                    np.random.normal(0, self.config.robustness_perturbation_std, len(self.df))
-                )
-                perturbed_scores = np.clip(perturbed_scores, *self.config.score_range)
-                
-            metrics = {
-                'variance_ratio': robustness_metrics.score_variance_ratio(
-                    self.df['LLM Generated Score'],
-                    perturbed_scores
-                ),
-                'stability': robustness_metrics.score_stability(
-                    self.df['LLM Generated Score'],
-                    perturbed_scores,
-                    threshold=self.config.robustness_stability_threshold
+            original = self.df['LLM Generated Score'].to_numpy(dtype=float)
+            threshold = self.config.robustness_stability_threshold
+            
+            if perturbed_scores is not None:
+                perturbed_scores = np.asarray(perturbed_scores, dtype=float)
+                if perturbed_scores.shape[-1] != len(original):
+                    raise ValueError(
+                        f"Perturbed scores have {perturbed_scores.shape[-1]} columns, expected {len(original)}"
+                    )
+                if perturbed_scores.ndim == 1:
+                    metrics = {
+                        'variance_ratio': robustness_metrics.score_variance_ratio(original, perturbed_scores),
+                        'stability': robustness_metrics.score_stability(original, perturbed_scores, threshold=threshold)
+                    }
+                    logger.debug(f"Robustness metrics computed: {metrics}")
+                    return metrics
+                variance_ratios = robustness_metrics.score_variance_ratio_trials(original, perturbed_scores)
+                stabilities = robustness_metrics.score_stability_trials(original, perturbed_scores, threshold=threshold)
+            else:
+                n_trials = n_trials or self.config.robustness_n_trials
+                if random_state is None:
+                    random_state = self.config.robustness_random_seed
+                variance_ratios, stabilities = self._simulate_robustness_trials(
+                    original, n_trials, np.random.default_rng(random_state)
                 )
-            }
+                if n_trials == 1:
+                    metrics = {
+                        'variance_ratio': float(variance_ratios[0]),
+                        'stability': float(stabilities[0])
+                    }
+                    logger.debug(f"Robustness metrics computed: {metrics}")
+                    return metrics
+            
+            metrics = robustness_metrics.summarize_trials(
+                variance_ratios, stabilities, self.config.robustness_quantiles
+            )
             logger.debug(f"Robustness metrics computed: {metrics}")
             return metrics
         except Exception as e:
             logger.error(f"Error computing robustness metrics: {str(e)}")
             raise
             
+    def _simulate_robustness_trials(
+        self,
+        original: np.ndarray,
+        n_trials: int,
+        rng: np.random.Generator
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Draw an (n_trials x n_rows) Gaussian perturbation matrix and score every trial.
+        
+        Trials are processed in chunks of at most config.robustness_chunk_elements
+        perturbed values so memory stays bounded for large datasets.
+        
+        Returns:
+            Tuple of per-trial (variance_ratio, stability) arrays
+        """
+        n_rows = len(original)
+        trials_per_chunk = max(1, self.config.robustness_chunk_elements // max(n_rows, 1))
+        variance_ratios = np.empty(n_trials)
+        stabilities = np.empty(n_trials)
+        
+        for start in range(0, n_trials, trials_per_chunk):
+            stop = min(start + trials_per_chunk, n_trials)
+            perturbed = rng.normal(0, self.config.robustness_perturbation_std, size=(stop - start, n_rows))
+            perturbed += original
+            np.clip(perturbed, *self.config.score_range, out=perturbed)
+            variance_ratios[start:stop] = robustness_metrics.score_variance_ratio_trials(original, perturbed)
+            stabilities[start:stop] = robustness_metrics.score_stability_trials(
+                original, perturbed, threshold=self.config.robustness_stability_threshold
+            )
+        return variance_ratios, stabilities
+            
+    @classmethod
+    def _from_validated(cls, df: pd.DataFrame, config: LLMJudgeConfig) -> 'LLMJudgeEvaluator':
+        """Evaluator over rows of already validated data, without re-validating or logging."""
+        evaluator = cls.__new__(cls)
+        evaluator.config = config
+        evaluator.df = df
+        return evaluator
+    
+    def _agreement_metrics(self) -> Dict[str, float]:
+        return {
+            'exact_match': agreement_metrics.exact_match_agreement(
+                self.df['LLM Generated Score'],
+                self.df['Human Evaluation Score']
+            ),
+            'cohen_kappa': agreement_metrics.cohen_kappa(
+                self.df['LLM Generated Score'],
+                self.df['Human Evaluation Score'],
+                n_bins=self.config.n_bins_kappa
+            )
+        }
+    
+    def _correlation_metrics(self) -> Dict[str, float]:
+        spearman_corr, spearman_p = correlation_metrics.spearman_correlation(
+            self.df['LLM Generated Score'],
+            self.df['Human Evaluation Score']
+        )
+        pearson_corr, pearson_p = correlation_metrics.pearson_correlation(
+            self.df['LLM Generated Score'],
+            self.df['Human Evaluation Score']
+        )
+        return {
+            'spearman_correlation': spearman_corr,
+            'spearman_p_value': spearman_p,
+            'pearson_correlation': pearson_corr,
+            'pearson_p_value': pearson_p
+        }
+    
+    def _bias_metrics(self) -> Dict[str, float]:
+        # Position bias
+        positions = np.arange(len(self.df))
+        pos_corr, pos_p = bias_metrics.position_bias(
+            positions,
+            self.df['LLM Generated Score']
+        )
+        
+        # Length bias
+        lengths = self.df['LLM Generated Question'].apply(bias_metrics.calculate_word_count)
+        len_corr, len_p = bias_metrics.length_bias(
+            lengths,
+            self.df['LLM Generated Score']
+        )
+        return {
+            'position_bias': pos_corr,
+            'position_bias_p_value': pos_p,
+            'length_bias': len_corr,
+            'length_bias_p_value': len_p
+        }
+    
+    def _point_metrics(self) -> Dict[str, float]:
+        """Agreement, correlation and bias metrics of the current rows, without logging."""
+        metrics = {}
+        metrics.update(self._agreement_metrics())
+        metrics.update(self._correlation_metrics())
+        metrics.update(self._bias_metrics())
+        return metrics
+    
+    def evaluate_approximate(
+        self,
+        sample_size: int = 1000,
+        n_strata: int = 5,
+        n_bootstrap: int = 200,
+        confidence: float = 0.95,
+        random_state: Optional[Union[int, np.random.Generator]] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Estimate the evaluation metrics from a stratified sample with confidence intervals.
+        
+        Rows are stratified into `n_strata` quantile buckets of the human score
+        and sampled proportionally, so the sample is self-weighting. Confidence
+        intervals come from bootstrap resamples drawn within each stratum of the
+        sample. Sampled rows keep their original order, so position bias stays
+        meaningful. Robustness metrics are not included.
+        
+        Args:
+            sample_size: Number of rows to evaluate
+            n_strata: Number of human score buckets
+            n_bootstrap: Number of bootstrap resamples for the intervals
+            confidence: Confidence level of the intervals
+            random_state: Seed or generator for sampling
+            
+        Returns:
+            Dict mapping each metric to its 'estimate', 'ci_lower' and 'ci_upper',
+            plus 'sample' with the sample size and population size
+        """
+        rng = np.random.default_rng(random_state)
+        n_rows = len(self.df)
+        human = self.df['Human Evaluation Score'].to_numpy(dtype=float)
+        edges = np.unique(np.quantile(human, np.linspace(0, 1, n_strata + 1)[1:-1]))
+        strata = np.searchsorted(edges, human, side='right')
+        
+        # Proportional allocation, rounding by largest remainder
+        labels, counts = np.unique(strata, return_counts=True)
+        quota = min(sample_size, n_rows) * counts / n_rows
+        allocation = np.floor(quota).astype(int)
+        shortfall = min(sample_size, n_rows) - allocation.sum()
+        allocation[np.argsort(allocation - quota, kind='stable')[:shortfall]] += 1
+        positions = [rng.choice(np.flatnonzero(strata == label), size=n, replace=False)
+                     for label, n in zip(labels, allocation)]
+        sample = np.sort(np.concatenate(positions))
+        
+        logger.info(f"Approximate evaluation on {len(sample)} of {n_rows} rows in {len(labels)} strata")
+        estimates = self._from_validated(self.df.iloc[sample], self.config)._point_metrics()
+        
+        # Stratified bootstrap of the sample
+        sample_strata = strata[sample]
+        groups = [np.flatnonzero(sample_strata == label) for label in labels]
+        resampled = {name: [] for name in estimates}
+        for _ in range(n_bootstrap):
+            rows = np.sort(np.concatenate([rng.choice(group, size=group.size) for group in groups if group.size]))
+            metrics = self._from_validated(self.df.iloc[sample[rows]], self.config)._point_metrics()
+            for name, value in metrics.items():
+                resampled[name].append(value)
+        
+        alpha = 1 - confidence
+        result = {}
+        for name, estimate in estimates.items():
+            lower, upper = np.nanquantile(resampled[name], [alpha / 2, 1 - alpha / 2])
+            result[name] = {'estimate': float(estimate), 'ci_lower': float(lower), 'ci_upper': float(upper)}
+        result['sample'] = {'sample_size': len(sample), 'population_size': n_rows}
+        return result
+            
+    def compute_panel_agreement(
+        self,
+        human_columns: Optional[tuple[str, ...]] = None,
+        level: Optional[str] = None
+    ) -> Dict[str, float]:
+        """
+        Compute LLM-vs-panel agreement alongside inter-human agreement.
+        
+        Each human column holds one rater's scores, NaN where that rater did
+        not score the item.
+        
+        Args:
+            human_columns: Individual human rater columns, defaults to
+                config.human_rater_columns
+            level: Measurement level for Krippendorff's alpha ('nominal',
+                'ordinal' or 'interval'), defaults to config.panel_agreement_level
+            
+        Returns:
+            Dictionary containing panel agreement metrics
+        """
+        try:
+            human_columns = list(human_columns or self.config.human_rater_columns)
+            if len(human_columns) < 2:
+                raise ValueError("Panel agreement needs at least two human rater columns")
+            missing = [col for col in human_columns if col not in self.df.columns]
+            if missing:
+                raise ValueError(f"Missing human rater columns: {missing}")
+            metrics = multi_rater_metrics.panel_agreement(
+                self.df['LLM Generated Score'].to_numpy(dtype=float),
+                self.df[human_columns].to_numpy(dtype=float),
+                level=level or self.config.panel_agreement_level,
+                n_bins=self.config.n_bins_kappa
+            )
+            logger.debug(f"Panel agreement metrics computed: {metrics}")
+            return metrics
+        except Exception as e:
+            logger.error(f"Error computing panel agreement metrics: {str(e)}")
+            raise
+            
+    def compute_question_similarity(self, encoder: Optional[Any] = None) -> Dict[str, float]:
+        """
+        Compute similarity of generated questions to ground truth and to each other.
+        
+        Args:
+            encoder: Encoder instance or name ('sentence-transformers' or
+                'hashing'), defaults to config.similarity_encoder
+            
+        Returns:
+            Dictionary containing question similarity metrics
+        """
+        try:
+            similarity = question_similarity.question_similarity(
+                self.df['Ground Truth Question'],
+                self.df['LLM Generated Question'],
+                encoder=encoder or self.config.similarity_encoder,
+                duplicate_threshold=self.config.duplicate_similarity_threshold
+            )
+            semantic = similarity['semantic_similarity']
+            human_corr, human_p = correlation_metrics.spearman_correlation(
+                semantic, self.df['Human Evaluation Score']
+            )
+            metrics = {
+                'semantic_similarity_mean': float(semantic.mean()),
+                'semantic_similarity_median': float(semantic.median()),
+                'lexical_similarity_mean': float(similarity['lexical_similarity'].mean()),
+                'near_duplicate_rate': float(similarity['is_near_duplicate'].mean()),
+                'similarity_human_correlation': human_corr,
+                'similarity_human_p_value': human_p
+            }
+            logger.debug(f"Question similarity metrics computed: {metrics}")
+            return metrics
+        except Exception as e:
+            logger.error(f"Error computing question similarity metrics: {str(e)}")
+            raise
+            
+    def fit_calibrator(self, method: str = 'isotonic') -> ScoreCalibrator:
+        """
+        Fit a mapping from LLM Generated Score to the human score scale.
+        
+        Args:
+            method: Calibration method ('isotonic' or 'quantile')
+            
+        Returns:
+            ScoreCalibrator: Fitted calibrator, apply with calibrator.transform
+        """
+        try:
+            calibrator = ScoreCalibrator(method).fit(
+                self.df['LLM Generated Score'],
+                self.df['Human Evaluation Score']
+            )
+            logger.debug(f"Fitted {method} calibrator with {len(calibrator.knots_x)} knots")
+            return calibrator
+        except Exception as e:
+            logger.error(f"Error fitting calibrator: {str(e)}")
+            raise
+            
     def evaluate(
         self,
         include_robustness: bool = True,
-        perturbed_scores: Optional[np.ndarray] = None
+        perturbed_scores: Optional[np.ndarray] = None,
+        n_trials: Optional[int] = None,
+        include_similarity: bool = False
     ) -> Dict[str, Any]:
         """
         Run full evaluation pipeline with comprehensive error handling.
         
         Args:
             include_robustness: Whether to include robustness metrics
-            perturbed_scores: Optional pre-computed perturbed scores
+            perturbed_scores: Optional pre-computed perturbed scores, shape
+                (n_rows,) or (n_trials, n_rows)
+            n_trials: Number of simulated robustness trials
+            include_similarity: Whether to include question similarity metrics,
+                which encodes both question columns
             
         Returns:
             Dictionary containing all computed metrics
@@ -183,7 +472,13 @@ class LLMJudgeEvaluator:
             metrics.update(self.compute_bias_metrics())
             
             if include_robustness:
-                metrics.update(self.compute_robustness_metrics(perturbed_scores))
+                metrics.update(self.compute_robustness_metrics(perturbed_scores, n_trials=n_trials))
+            
+            if self.config.human_rater_columns:
+                metrics.update(self.compute_panel_agreement())
+            
+            if include_similarity:
+                metrics.update(self.compute_question_similarity())
                 
             logger.info("Evaluation pipeline completed successfully")
             return metrics
@@ -0,0 +1,303 @@
+"""Grid sweeps over LLMJudgeConfig metric parameters."""
+
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .config import LLMJudgeConfig
+from .evaluator import LLMJudgeEvaluator
+from ..metrics import agreement_metrics, multi_rater_metrics, robustness_metrics
+
+# Config fields a sweep may vary; every other metric is computed once per sweep
+SWEEP_PARAMETERS = (
+    'n_bins_kappa',
+    'robustness_perturbation_std',
+    'robustness_stability_threshold',
+    'score_range'
+)
+
+# Perturbation setup of the current process, installed by _init_robustness_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_robustness_worker(original, n_trials, seed, chunk_elements, quantiles):
+    """Store the shared perturbation setup in this (worker) process."""
+    n_rows = len(original)
+    trials_per_chunk = max(1, chunk_elements // max(n_rows, 1))
+    _worker_state.clear()
+    _worker_state.update(
+        original=original,
+        n_trials=n_trials,
+        seed=seed,
+        trials_per_chunk=trials_per_chunk,
+        quantiles=quantiles,
+        # The noise of all trials is kept when it fits in one chunk, else redrawn per group
+        noise=None
+    )
+    if trials_per_chunk >= n_trials:
+        _worker_state['noise'] = [np.random.default_rng(seed).standard_normal((n_trials, n_rows))]
+
+
+def _noise_chunks():
+    """Standard normal perturbations of all trials, chunked as the evaluator draws them."""
+    if _worker_state['noise'] is not None:
+        yield from _worker_state['noise']
+        return
+    rng = np.random.default_rng(_worker_state['seed'])
+    n_trials, trials_per_chunk = _worker_state['n_trials'], _worker_state['trials_per_chunk']
+    n_rows = len(_worker_state['original'])
+    for start in range(0, n_trials, trials_per_chunk):
+        yield rng.standard_normal((min(trials_per_chunk, n_trials - start), n_rows))
+
+
+def _robustness_batch(groups):
+    """
+    Robustness metrics of a batch of (std, score_range, thresholds) groups.
+
+    Every group clips one perturbed matrix, shared by all of its stability
+    thresholds: the absolute differences are sorted per trial once and each
+    threshold's stable proportion is a binary search.
+
+    Returns:
+        list: For every group, one metrics dict per threshold
+    """
+    original = _worker_state['original']
+    n_trials = _worker_state['n_trials']
+    n_rows = len(original)
+    results = []
+    for std, (low, high), thresholds in groups:
+        thresholds = np.asarray(thresholds, dtype=float)
+        variance_ratios = np.empty(n_trials)
+        stabilities = np.empty((len(thresholds), n_trials))
+        start = 0
+        for noise in _noise_chunks():
+            stop = start + len(noise)
+            # Same values as the evaluator's rng.normal(0, std) + original
+            perturbed = std * noise
+            perturbed += original
+            np.clip(perturbed, low, high, out=perturbed)
+            variance_ratios[start:stop] = robustness_metrics.score_variance_ratio_trials(original, perturbed)
+            differences = np.abs(perturbed - original[np.newaxis, :])
+            if len(thresholds) == 1:
+                stabilities[0, start:stop] = np.mean(differences <= thresholds[0], axis=1)
+            else:
+                differences.sort(axis=1)
+                for trial, row in enumerate(differences, start=start):
+                    stabilities[:, trial] = np.searchsorted(row, thresholds, side='right') / n_rows
+            start = stop
+        if n_trials == 1:
+            results.append([{'variance_ratio': float(variance_ratios[0]), 'stability': float(s[0])}
+                            for s in stabilities])
+        else:
+            results.append([robustness_metrics.summarize_trials(variance_ratios, s, _worker_state['quantiles'])
+                            for s in stabilities])
+    return results
+
+
+def parameter_grid(grid: Dict[str, Sequence[Any]], config: Optional[LLMJudgeConfig] = None) -> pd.DataFrame:
+    """
+    Expand a parameter grid into one row per combination.
+
+    Args:
+        grid: Values to try per parameter (any of SWEEP_PARAMETERS)
+        config: Supplies the value of every parameter not in the grid
+
+    Returns:
+        DataFrame with one column per sweep parameter
+    """
+    config = config or LLMJudgeConfig()
+    unknown = [name for name in grid if name not in SWEEP_PARAMETERS]
+    if unknown:
+        raise ValueError(f"Cannot sweep {unknown}; sweepable parameters are {list(SWEEP_PARAMETERS)}")
+    values = [list(grid.get(name, [getattr(config, name)])) for name in SWEEP_PARAMETERS]
+    combinations = pd.DataFrame(list(itertools.product(*values)), columns=list(SWEEP_PARAMETERS))
+    combinations['score_range'] = [tuple(map(float, r)) for r in combinations['score_range']]
+    return combinations
+
+
+class ConfigSweep:
+    """
+    Evaluate many LLMJudgeConfig parameter combinations on one dataset.
+
+    Constructing an evaluator per combination re-validates the data and
+    recomputes every metric. A sweep validates once, computes the metrics
+    that no sweep parameter affects (exact match, correlations, bias) once,
+    Cohen's kappa once per distinct n_bins_kappa from a single cumulative
+    table, and the score-range checks from sorted scores. Robustness metrics
+    are computed per (perturbation std, score range) group from one shared,
+    seeded noise draw, so every combination sees the same perturbations and
+    matches compute_robustness_metrics with that seed. Groups are dispatched
+    in batches to a process pool.
+    """
+
+    def __init__(
+        self,
+        data: Union[pd.DataFrame, Dict[str, list]],
+        config: Optional[LLMJudgeConfig] = None
+    ):
+        """
+        Initialize the sweep with data and a base configuration.
+
+        Args:
+            data: Input data containing questions and scores
+            config: Base configuration; supplies every parameter not swept
+        """
+        self.evaluator = LLMJudgeEvaluator(data, config)
+        self.config = self.evaluator.config
+        self.llm_scores = self.evaluator.df['LLM Generated Score'].to_numpy(dtype=float)
+        self.human_scores = self.evaluator.df['Human Evaluation Score'].to_numpy(dtype=float)
+        self._sorted_scores = {
+            'llm': np.sort(self.llm_scores),
+            'human': np.sort(self.human_scores)
+        }
+        self._shared_metrics: Optional[Dict[str, float]] = None
+
+    def shared_metrics(self) -> Dict[str, float]:
+        """Metrics that do not depend on any sweep parameter, computed on first use."""
+        if self._shared_metrics is None:
+            metrics = {
+                'exact_match': agreement_metrics.exact_match_agreement(self.llm_scores, self.human_scores)
+            }
+            metrics.update(self.evaluator.compute_correlation_metrics())
+            metrics.update(self.evaluator.compute_bias_metrics())
+            self._shared_metrics = metrics
+        return self._shared_metrics
+
+    def _in_range(self, score_ranges: Sequence[tuple]) -> pd.DataFrame:
+        """Fraction of LLM and human scores inside each score range."""
+        columns = {}
+        for name, sorted_scores in self._sorted_scores.items():
+            low, high = np.asarray(score_ranges, dtype=float).T
+            inside = (np.searchsorted(sorted_scores, high, side='right')
+                      - np.searchsorted(sorted_scores, low, side='left'))
+            columns[f'{name}_in_range'] = inside / max(len(sorted_scores), 1)
+        return pd.DataFrame(columns)
+
+    def _kappa_metrics(self, n_bins_values: Sequence[int]) -> pd.DataFrame:
+        """Cohen's kappa (and panel agreement, if configured) per distinct n_bins."""
+        n_bins_values = sorted(set(n_bins_values))
+        kappa = agreement_metrics.cohen_kappa_sweep(
+            self.llm_scores, self.human_scores,
+            n_bins_range=n_bins_values, binning=('fixed',), weights=(None,)
+        )
+        table = pd.DataFrame({'n_bins_kappa': kappa['n_bins'], 'cohen_kappa': kappa['kappa']})
+        if self.config.human_rater_columns:
+            raters = self.evaluator.df[list(self.config.human_rater_columns)].to_numpy(dtype=float)
+            panel = pd.DataFrame([
+                multi_rater_metrics.panel_agreement(
+                    self.llm_scores, raters, level=self.config.panel_agreement_level, n_bins=n_bins
+                )
+                for n_bins in n_bins_values
+            ])
+            table = pd.concat([table, panel], axis=1)
+        return table
+
+    def _robustness_metrics(
+        self,
+        combinations: pd.DataFrame,
+        n_trials: int,
+        seed: int,
+        n_jobs: int,
+        batch_size: Optional[int]
+    ) -> pd.DataFrame:
+        """Robustness metrics of every combination, computed per (std, score range) group."""
+        keys = ['robustness_perturbation_std', 'score_range']
+        groups = []
+        for (std, score_range), group in combinations.groupby(keys, sort=False):
+            thresholds = sorted(set(group['robustness_stability_threshold']))
+            groups.append((float(std), score_range, thresholds))
+
+        init_args = (self.llm_scores, n_trials, seed,
+                     self.config.robustness_chunk_elements, self.config.robustness_quantiles)
+        if batch_size is None:
+            batch_size = max(1, math.ceil(len(groups) / (4 * n_jobs)))
+        batches = [groups[i:i + batch_size] for i in range(0, len(groups), batch_size)]
+        if n_jobs == 1 or len(batches) == 1:
+            _init_robustness_worker(*init_args)
+            results = [_robustness_batch(batch) for batch in batches]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_robustness_worker,
+                                     initargs=init_args) as pool:
+                results = list(pool.map(_robustness_batch, batches))
+
+        rows = []
+        for (std, score_range, thresholds), group_metrics in zip(groups, itertools.chain.from_iterable(results)):
+            for threshold, metrics in zip(thresholds, group_metrics):
+                rows.append({'robustness_perturbation_std': std, 'score_range': score_range,
+                             'robustness_stability_threshold': threshold, **metrics})
+        return pd.DataFrame(rows)
+
+    def run(
+        self,
+        grid: Dict[str, Sequence[Any]],
+        include_robustness: bool = True,
+        n_trials: Optional[int] = None,
+        random_state: Optional[Union[int, np.random.Generator]] = None,
+        n_jobs: int = 1,
+        batch_size: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Evaluate every combination of the grid.
+
+        Args:
+            grid: Values to try per parameter, e.g. {'n_bins_kappa': range(3, 11),
+                'robustness_perturbation_std': [0.02, 0.05, 0.1]}; parameters not
+                in the grid keep the base configuration's value
+            include_robustness: Whether to include robustness metrics
+            n_trials: Number of simulated robustness trials, defaults to
+                config.robustness_n_trials
+            random_state: Seed shared by all combinations, defaults to
+                config.robustness_random_seed (a fresh seed if that is None)
+            n_jobs: Worker processes for the robustness groups; 1 computes them
+                in this process
+            batch_size: Robustness groups per task, defaults to about four
+                tasks per worker
+
+        Returns:
+            DataFrame with one row per combination: the sweep parameters (score
+            range as score_range_min and score_range_max), the fraction of
+            scores inside the range and the evaluate() metrics
+        """
+        combinations = parameter_grid(grid, self.config)
+        logger.info(f"Sweeping {len(combinations)} configurations")
+
+        table = combinations.join(self._in_range(list(combinations['score_range'])))
+        table = table.merge(self._kappa_metrics(combinations['n_bins_kappa']), on='n_bins_kappa', how='left')
+        for name, value in self.shared_metrics().items():
+            table[name] = value
+
+        if include_robustness:
+            n_trials = n_trials or self.config.robustness_n_trials
+            if random_state is None:
+                random_state = self.config.robustness_random_seed
+            if isinstance(random_state, np.random.Generator):
+                random_state = int(random_state.integers(2**63))
+            elif random_state is None:
+                random_state = int(np.random.SeedSequence().entropy % 2**63)
+            robustness = self._robustness_metrics(combinations, n_trials, random_state, n_jobs, batch_size)
+            table = table.merge(
+                robustness, how='left',
+                on=['robustness_perturbation_std', 'score_range', 'robustness_stability_threshold']
+            )
+
+        low, high = zip(*table.pop('score_range'))
+        table.insert(3, 'score_range_min', low)
+        table.insert(4, 'score_range_max', high)
+        logger.info("Configuration sweep completed")
+        return table
+
+    def config_for(self, row: Union[pd.Series, Dict[str, Any]]) -> LLMJudgeConfig:
+        """Base configuration with the sweep parameters of one result row."""
+        return replace(
+            self.config,
+            n_bins_kappa=int(row['n_bins_kappa']),
+            robustness_perturbation_std=float(row['robustness_perturbation_std']),
+            robustness_stability_threshold=float(row['robustness_stability_threshold']),
+            score_range=(float(row['score_range_min']), float(row['score_range_max']))
+        )
@@ -0,0 +1,135 @@
+"""Persistent content-addressed cache of judge scores."""
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .prompts import JudgePromptTemplate
+
+# SQLite limits the number of bound parameters per statement
+_SQLITE_BATCH = 900
+
+
+def judgment_key(template: JudgePromptTemplate, model: str, inputs: Sequence[str]) -> str:
+    """
+    Content address of a judgment.
+
+    The key covers everything that determines the score: the rubric dimension,
+    the prompt template version, the judge model and the row inputs.
+
+    Args:
+        template: Rubric template used for scoring
+        model: Judge model name
+        inputs: Row values for the template's input columns, in order
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        [template.name, template.version, model, list(inputs)],
+        ensure_ascii=False,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def deduplicate_rows(df: pd.DataFrame, columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the distinct combinations of `columns` in `df`.
+
+    Args:
+        df: Input data
+        columns: Columns that define identity
+
+    Returns:
+        Tuple of (positions of the first row of each distinct combination,
+        group code of every row). Scores computed for the distinct rows are
+        broadcast back with ``unique_scores[codes]``.
+    """
+    codes = df.groupby(columns, sort=False, dropna=False).ngroup().to_numpy()
+    _, first_positions = np.unique(codes, return_index=True)
+    return first_positions, codes
+
+
+class JudgeCache:
+    """SQLite-backed store of judge scores keyed by :func:`judgment_key`."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS judgments ("
+            "key TEXT PRIMARY KEY, score REAL NOT NULL, template TEXT, "
+            "template_version TEXT, model TEXT, created_at TEXT)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, float]:
+        """
+        Look up cached scores.
+
+        Args:
+            keys: Judgment keys
+
+        Returns:
+            Dict mapping each cached key to its score; misses are omitted
+        """
+        found = {}
+        for start in range(0, len(keys), _SQLITE_BATCH):
+            batch = list(keys[start:start + _SQLITE_BATCH])
+            placeholders = ','.join('?' * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, score FROM judgments WHERE key IN ({placeholders})", batch
+            )
+            found.update(rows)
+        return found
+
+    def put_many(
+        self,
+        items: Iterable[Tuple[str, float]],
+        template: Optional[JudgePromptTemplate] = None,
+        model: Optional[str] = None
+    ) -> None:
+        """
+        Store scores, replacing existing entries with the same key.
+
+        Args:
+            items: (key, score) pairs
+            template: Template the scores were produced with, kept for auditing
+            model: Judge model name, kept for auditing
+        """
+        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        name = template.name if template else None
+        version = template.version if template else None
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO judgments VALUES (?, ?, ?, ?, ?, ?)",
+                ((key, float(score), name, version, model, created_at) for key, score in items)
+            )
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM judgments").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'JudgeCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
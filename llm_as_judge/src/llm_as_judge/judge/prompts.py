@@ -0,0 +1,119 @@
+"""Prompt templates and score parsing for LLM judge scoring."""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+ANSWER_METRICS = ('Stand-alone Quality', 'Readiness', 'Relevance', 'Completeness')
+
+_NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+
+
+@dataclass(frozen=True)
+class JudgePromptTemplate:
+    """A versioned rubric prompt that scores one dimension of a row."""
+
+    name: str
+    version: str
+    output_column: str
+    input_columns: Tuple[str, ...]
+    system_prompt: str
+    user_prompt: str
+    score_range: Tuple[float, float]
+
+    def render(self, row: Dict[str, str]) -> str:
+        """
+        Fill the user prompt with the row's input columns.
+
+        Args:
+            row: Mapping from input column name to text
+
+        Returns:
+            str: Rendered user prompt
+        """
+        return self.user_prompt.format(**{
+            _placeholder(col): row[col] for col in self.input_columns
+        })
+
+    def parse_score(self, content: str) -> Optional[float]:
+        """
+        Extract a score from a judge response.
+
+        Accepts a JSON object with a ``score`` field, falling back to the first
+        number in the text. Scores are clipped to the template's range.
+
+        Args:
+            content: Raw message content returned by the judge
+
+        Returns:
+            float or None: Parsed score, None if no score could be found
+        """
+        score = None
+        try:
+            parsed = json.loads(content)
+            if isinstance(parsed, dict) and 'score' in parsed:
+                score = float(parsed['score'])
+        except (ValueError, TypeError):
+            pass
+
+        if score is None:
+            match = _NUMBER_PATTERN.search(content or '')
+            if match is None:
+                return None
+            score = float(match.group())
+
+        low, high = self.score_range
+        return min(max(score, low), high)
+
+
+def _placeholder(column: str) -> str:
+    """Map a DataFrame column name to its prompt placeholder name."""
+    return column.lower().replace(' ', '_').replace('-', '_')
+
+
+_SYSTEM_PROMPT = (
+    "You are an impartial evaluator. Follow the rubric exactly and reply with "
+    "a JSON object of the form {\"score\": <number>, \"reasoning\": \"<one sentence>\"}."
+)
+
+QUESTION_TEMPLATE = JudgePromptTemplate(
+    name='question_similarity',
+    version='1',
+    output_column='LLM Generated Score',
+    input_columns=('Ground Truth Question', 'LLM Generated Question'),
+    system_prompt=_SYSTEM_PROMPT,
+    user_prompt=(
+        "Rate how well the generated question preserves the intent and information "
+        "need of the ground truth question on a scale from 0.5 (unrelated) to 1.0 "
+        "(equivalent).\n\n"
+        "Ground truth question: {ground_truth_question}\n"
+        "Generated question: {llm_generated_question}"
+    ),
+    score_range=(0.5, 1.0)
+)
+
+_ANSWER_RUBRICS = {
+    'Stand-alone Quality': "how well the answer can be understood on its own without the context",
+    'Readiness': "how ready the answer is to be shown to an end user without further editing",
+    'Relevance': "how directly the answer addresses the question",
+    'Completeness': "how fully the answer covers the information in the context that the question asks for"
+}
+
+ANSWER_TEMPLATES = {
+    metric: JudgePromptTemplate(
+        name=f"answer_{_placeholder(metric)}",
+        version='1',
+        output_column=f'LLM {metric}',
+        input_columns=('Chunk', 'Question', 'Answer'),
+        system_prompt=_SYSTEM_PROMPT,
+        user_prompt=(
+            f"Rate {rubric} on a scale from 1 (very poor) to 5 (excellent).\n\n"
+            "Context: {chunk}\n"
+            "Question: {question}\n"
+            "Answer: {answer}"
+        ),
+        score_range=(1.0, 5.0)
+    )
+    for metric, rubric in _ANSWER_RUBRICS.items()
+}
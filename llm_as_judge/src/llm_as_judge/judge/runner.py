@@ -0,0 +1,317 @@
+"""Concurrent judge runner that scores rows against an OpenAI-compatible endpoint."""
+
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .cache import JudgeCache, deduplicate_rows, judgment_key
+from .prompts import ANSWER_TEMPLATES, QUESTION_TEMPLATE, JudgePromptTemplate
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class JudgeRunnerConfig:
+    """Configuration for concurrent judge scoring."""
+
+    # Endpoint configuration
+    base_url: str = "http://localhost:8000/v1"
+    api_key: Optional[str] = None
+    model: str = "gpt-4o-mini"
+    temperature: float = 0.0
+    max_tokens: int = 64
+
+    # Concurrency and connection pooling
+    max_concurrency: int = 32
+    keepalive_timeout: float = 30.0
+    request_timeout: float = 60.0
+    batch_size: int = 1024
+
+    # Retries
+    max_retries: int = 5
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+
+    # Rate limiting (None disables the limit)
+    tokens_per_minute: Optional[int] = None
+    chars_per_token: float = 4.0
+
+
+class TokenBucket:
+    """Asynchronous token bucket used to stay under a tokens-per-minute quota."""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float) -> None:
+        """
+        Wait until `amount` tokens are available and consume them.
+
+        Requests larger than the bucket are clamped to its capacity so they can
+        still proceed once the bucket is full.
+        """
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class JudgeRunner:
+    """Scores evaluation rows with an LLM judge using bounded concurrent requests.
+
+    All requests share one pooled keep-alive HTTP client. Rows are processed in
+    batches of ``batch_size`` so that at most one batch of tasks is pending at a
+    time, which keeps memory flat for very large DataFrames. Identical input rows
+    are scored once and, when a cache is given, judgments already stored for the
+    same template version and model are reused.
+    """
+
+    def __init__(
+        self,
+        config: Optional[JudgeRunnerConfig] = None,
+        cache: Optional[JudgeCache] = None
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            config: Runner configuration, uses default if None
+            cache: Optional persistent cache; cached judgments are not re-scored
+        """
+        if aiohttp is None:
+            raise ImportError("JudgeRunner requires aiohttp; install with `pip install llm_as_judge[judge]`")
+        self.config = config or JudgeRunnerConfig()
+        self.cache = cache
+        self.failed_requests = 0
+
+    def _estimate_tokens(self, template: JudgePromptTemplate, prompt: str) -> float:
+        """Rough token estimate for a request, used by the rate limiter."""
+        chars = len(template.system_prompt) + len(prompt)
+        return math.ceil(chars / self.config.chars_per_token) + self.config.max_tokens
+
+    async def _request_score(
+        self,
+        session: "aiohttp.ClientSession",
+        template: JudgePromptTemplate,
+        prompt: str,
+        semaphore: asyncio.Semaphore,
+        bucket: Optional[TokenBucket]
+    ) -> Optional[float]:
+        """Send one chat completion request with retries and return the parsed score."""
+        payload = {
+            "model": self.config.model,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "messages": [
+                {"role": "system", "content": template.system_prompt},
+                {"role": "user", "content": prompt}
+            ]
+        }
+
+        url = f"{self.config.base_url.rstrip('/')}/chat/completions"
+
+        for attempt in range(self.config.max_retries + 1):
+            if bucket is not None:
+                await bucket.acquire(self._estimate_tokens(template, prompt))
+
+            retry_after = None
+            async with semaphore:
+                try:
+                    async with session.post(url, json=payload) as response:
+                        if response.status == 200:
+                            try:
+                                body = await response.json()
+                                return template.parse_score(body["choices"][0]["message"]["content"])
+                            except (ValueError, KeyError, IndexError, TypeError) as e:
+                                logger.warning(f"Judge response could not be parsed ({type(e).__name__}: {e})")
+                                return None
+                        text = await response.text()
+                        if response.status not in RETRYABLE_STATUS_CODES:
+                            logger.warning(f"Judge request rejected with status {response.status}: {text[:200]}")
+                            return None
+                        retry_after = response.headers.get("Retry-After")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.debug(f"Judge request failed ({type(e).__name__}), attempt {attempt + 1}")
+
+            if attempt < self.config.max_retries:
+                # Full jitter: sleep uniformly in [0, capped exponential backoff]
+                delay = random.uniform(0, min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt))
+                if retry_after is not None:
+                    try:
+                        delay = max(delay, float(retry_after))
+                    except ValueError:
+                        pass
+                await asyncio.sleep(delay)
+
+        logger.warning(f"Judge request gave up after {self.config.max_retries + 1} attempts")
+        return None
+
+    async def score_prompts(
+        self,
+        template: JudgePromptTemplate,
+        prompts: Sequence[str],
+        on_batch: Optional[Callable[[int, np.ndarray], None]] = None
+    ) -> np.ndarray:
+        """
+        Score already-rendered prompts for a single rubric template.
+
+        Args:
+            template: Template the prompts were rendered from
+            prompts: Rendered user prompts
+            on_batch: Called as on_batch(start, scores) after each batch of
+                prompts[start:start + len(scores)] completes, e.g. to persist
+                judgments before the whole run finishes
+
+        Returns:
+            np.ndarray: float32 scores, NaN where the judge failed
+        """
+        scores = np.full(len(prompts), np.nan, dtype=np.float32)
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        bucket = TokenBucket(self.config.tokens_per_minute) if self.config.tokens_per_minute else None
+
+        headers = {}
+        if self.config.api_key:
+            headers["Authorization"] = f"Bearer {self.config.api_key}"
+        connector = aiohttp.TCPConnector(
+            limit=self.config.max_concurrency,
+            keepalive_timeout=self.config.keepalive_timeout
+        )
+
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=self.config.request_timeout)
+        ) as session:
+            for start in range(0, len(prompts), self.config.batch_size):
+                batch = prompts[start:start + self.config.batch_size]
+                results = await asyncio.gather(*[
+                    self._request_score(session, template, prompt, semaphore, bucket)
+                    for prompt in batch
+                ])
+                for offset, score in enumerate(results):
+                    if score is not None:
+                        scores[start + offset] = score
+                if on_batch is not None:
+                    on_batch(start, scores[start:start + len(batch)])
+                logger.debug(f"Scored {min(start + len(batch), len(prompts))}/{len(prompts)} rows for {template.name}")
+
+        failed = int(np.isnan(scores).sum())
+        self.failed_requests += failed
+        if failed:
+            logger.warning(f"{failed} of {len(prompts)} rows could not be scored for {template.name}")
+        return scores
+
+    async def score_dataframe(
+        self,
+        df: pd.DataFrame,
+        templates: Sequence[JudgePromptTemplate]
+    ) -> pd.DataFrame:
+        """
+        Score every row of `df` with each template and add the output columns.
+
+        Args:
+            df: DataFrame containing each template's input columns
+            templates: Rubric templates to score
+
+        Returns:
+            pd.DataFrame: Copy of `df` with one score column per template
+        """
+        missing = sorted({col for t in templates for col in t.input_columns if col not in df.columns})
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+
+        result = df.copy()
+        dedup: Dict[tuple, tuple] = {}
+        for template in templates:
+            columns = list(template.input_columns)
+            if tuple(columns) not in dedup:
+                inputs = df[columns].astype(str)
+                first_positions, codes = deduplicate_rows(inputs, columns)
+                dedup[tuple(columns)] = (inputs.iloc[first_positions].to_numpy(), codes)
+            unique_inputs, codes = dedup[tuple(columns)]
+
+            unique_scores = np.full(len(unique_inputs), np.nan, dtype=np.float32)
+            pending = np.arange(len(unique_inputs))
+            keys = None
+            if self.cache is not None:
+                keys = [judgment_key(template, self.config.model, row) for row in unique_inputs]
+                cached = self.cache.get_many(keys)
+                hits = np.array([key in cached for key in keys], dtype=bool)
+                unique_scores[hits] = [cached[key] for key, hit in zip(keys, hits) if hit]
+                pending = np.flatnonzero(~hits)
+
+            logger.info(
+                f"Scoring {len(df)} rows with {template.name} v{template.version}: "
+                f"{len(unique_inputs)} distinct, {len(pending)} not cached"
+            )
+            prompts = [template.render(dict(zip(columns, unique_inputs[i]))) for i in pending]
+
+            def store_batch(start, batch_scores, template=template, keys=keys, pending=pending):
+                # Persist each finished batch, so an interrupted run keeps what it paid for
+                self.cache.put_many(
+                    ((keys[i], score) for i, score in zip(pending[start:], batch_scores) if not np.isnan(score)),
+                    template=template,
+                    model=self.config.model
+                )
+
+            new_scores = await self.score_prompts(
+                template, prompts, on_batch=store_batch if self.cache is not None else None
+            )
+            unique_scores[pending] = new_scores
+
+            # Broadcast the distinct-row scores back to every duplicate
+            result[template.output_column] = unique_scores[codes]
+        return result
+
+    def score_questions(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Produce the `LLM Generated Score` column expected by LLMJudgeEvaluator.
+
+        Args:
+            df: DataFrame with 'Ground Truth Question' and 'LLM Generated Question'
+
+        Returns:
+            pd.DataFrame: Copy of `df` with 'LLM Generated Score'
+        """
+        return asyncio.run(self.score_dataframe(df, [QUESTION_TEMPLATE]))
+
+    def score_answers(
+        self,
+        df: pd.DataFrame,
+        metrics: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Produce the `LLM <metric>` columns expected by AnswerEvaluationAnalyzer.
+
+        Args:
+            df: DataFrame with 'Chunk', 'Question' and 'Answer'
+            metrics: Subset of answer metrics to score, all four if None
+
+        Returns:
+            pd.DataFrame: Copy of `df` with one 'LLM <metric>' column per metric
+        """
+        templates: Dict[str, JudgePromptTemplate] = ANSWER_TEMPLATES
+        selected = [templates[m] for m in (metrics or list(templates))]
+        return asyncio.run(self.score_dataframe(df, selected))
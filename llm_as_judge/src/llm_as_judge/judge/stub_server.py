@@ -0,0 +1,188 @@
+"""Local OpenAI-compatible stub judge server for tests and load experiments."""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+_SCALE_PATTERN = re.compile(r'from (\d+(?:\.\d+)?) \([^)]*\) to (\d+(?:\.\d+)?)')
+
+
+def stub_score(prompt: str) -> float:
+    """
+    Deterministic pseudo-score for a prompt.
+
+    The score is derived from a hash of the prompt and mapped onto the scale
+    mentioned in it ("from 1 (...) to 5 (...)"), defaulting to 1-5.
+
+    Args:
+        prompt: User prompt sent to the judge
+
+    Returns:
+        float: Score rounded to one decimal
+    """
+    match = _SCALE_PATTERN.search(prompt)
+    low, high = (float(match.group(1)), float(match.group(2))) if match else (1.0, 5.0)
+    fraction = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8], 16) / 0xFFFFFFFF
+    return round(low + fraction * (high - low), 1)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients can pool connections
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        server = self.server
+
+        with server.lock:
+            server.request_count += 1
+            count = server.request_count
+
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        if server.latency:
+            time.sleep(server.latency)
+        if server.failure_rate or server.server_error_rate or server.malformed_rate:
+            with server.lock:
+                draw = server.rng.random()
+            if draw < server.failure_rate:
+                self._send(429, {"error": {"message": "rate limited"}}, headers={"Retry-After": "0"})
+                return
+            if draw < server.failure_rate + server.server_error_rate:
+                self._send(503, {"error": {"message": "service unavailable"}})
+                return
+            if draw < server.failure_rate + server.server_error_rate + server.malformed_rate:
+                # Alternate between a body that is not JSON and one without choices
+                if count % 2:
+                    self._send(200, None, data=b'{"choices": [')
+                else:
+                    self._send(200, {"id": "stub", "choices": []})
+                return
+
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        content = json.dumps({"score": stub_score(prompt), "reasoning": "stub"})
+        prompt_tokens = len(prompt) // 4
+        self._send(200, {
+            "id": "stub",
+            "object": "chat.completion",
+            "model": body.get('model', 'stub'),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 16, "total_tokens": prompt_tokens + 16}
+        })
+
+    def _send(self, status: int, payload: Optional[dict], headers: Optional[dict] = None,
+              data: Optional[bytes] = None):
+        if data is None:
+            data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # many concurrent clients connect at once
+
+
+class StubJudgeServer:
+    """In-process stub of an OpenAI-compatible chat completions endpoint.
+
+    Usable as a context manager; binds to a free port by default::
+
+        with StubJudgeServer(failure_rate=0.1) as server:
+            runner = JudgeRunner(JudgeRunnerConfig(base_url=server.base_url))
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+        server_error_rate: float = 0.0,
+        malformed_rate: float = 0.0
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind, 0 picks a free port
+            latency: Artificial delay per request in seconds
+            failure_rate: Probability of answering with HTTP 429
+            seed: Seed for the failure injection
+            server_error_rate: Probability of answering with HTTP 503
+            malformed_rate: Probability of answering HTTP 200 with a body that
+                is not valid JSON or has no choices
+        """
+        self._server = _StubHTTPServer((host, port), _StubHandler)
+        self._server.latency = latency
+        self._server.failure_rate = failure_rate
+        self._server.server_error_rate = server_error_rate
+        self._server.malformed_rate = malformed_rate
+        self._server.rng = random.Random(seed)
+        self._server.lock = threading.Lock()
+        self._server.request_count = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def request_count(self) -> int:
+        return self._server.request_count
+
+    def start(self) -> 'StubJudgeServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'StubJudgeServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub LLM judge server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubJudgeServer(args.host, args.port, args.latency, args.failure_rate)
+    print(f"Stub judge listening on {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 """Agreement-based metrics for LLM-as-Judge evaluation."""
 
 import numpy as np
-from sklearn.metrics import cohen_kappa_score
 
 def exact_match_agreement(llm_scores, human_scores):
     """
@@ -28,6 +27,169 @@ def cohen_kappa(llm_scores, human_scores, n_bins=5):
     Returns:
         float: Cohen's Kappa score
     """
+    # Imported here: sklearn.metrics alone takes most of a cold package import
+    from sklearn.metrics import cohen_kappa_score
+
     llm_binned = np.digitize(llm_scores, bins=np.linspace(0, 1, n_bins + 1))
     human_binned = np.digitize(human_scores, bins=np.linspace(0, 1, n_bins + 1))
-    return cohen_kappa_score(llm_binned, human_binned) 
\ No newline at end of file
+    return cohen_kappa_score(llm_binned, human_binned) 
+
+def _sorted_summary(scores):
+    """
+    Sort scores once and derive the sorted array, distinct values and per-row value codes.
+    
+    Args:
+        scores (array-like): Scores to summarize
+        
+    Returns:
+        tuple: (sorted scores, distinct sorted values, code of each row's value)
+    """
+    values = np.asarray(scores, dtype=float)
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    
+    new_value = np.ones(len(values), dtype=bool)
+    new_value[1:] = sorted_values[1:] != sorted_values[:-1]
+    codes = np.empty(len(values), dtype=np.intp)
+    codes[order] = np.cumsum(new_value) - 1
+    return sorted_values, sorted_values[new_value], codes
+
+def _quantile_edges(sorted_values, n_bins):
+    """Linearly interpolated quantile edges (as np.quantile) read off an already sorted array."""
+    positions = np.linspace(0, 1, n_bins + 1) * (len(sorted_values) - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, len(sorted_values) - 1)
+    fraction = positions - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+def _fixed_boundaries(unique_values, n_bins, value_range):
+    """
+    Category boundaries (as positions in unique_values) of np.digitize on equal-width edges.
+    
+    Matches `cohen_kappa`: values below the range and at or above its upper edge
+    get their own outer categories, giving n_bins + 2 categories.
+    """
+    edges = np.linspace(value_range[0], value_range[1], n_bins + 1)
+    inner = np.searchsorted(unique_values, edges, side='left')
+    return np.concatenate(([0], inner, [len(unique_values)]))
+
+def _quantile_boundaries(sorted_values, unique_values, n_bins):
+    """
+    Category boundaries (as positions in unique_values) of pd.qcut with n_bins.
+    
+    Bins are right-closed like pd.qcut; duplicate edges produce empty bins
+    instead of raising.
+    """
+    edges = _quantile_edges(sorted_values, n_bins)
+    inner = np.searchsorted(unique_values, edges[1:-1], side='right')
+    return np.concatenate(([0], inner, [len(unique_values)]))
+
+def _kappa_from_confusion(confusion, weights=None):
+    """
+    Cohen's Kappa from a square confusion matrix.
+    
+    Args:
+        confusion (np.ndarray): k x k matrix of rating counts
+        weights (str, optional): None, 'linear' or 'quadratic'; weighted variants
+            use the distance between bin indices
+            
+    Returns:
+        float: Kappa score, NaN if expected disagreement is zero
+    """
+    total = confusion.sum()
+    if total == 0:
+        return np.nan
+    k = confusion.shape[0]
+    expected = np.outer(confusion.sum(axis=1), confusion.sum(axis=0)) / total
+    
+    idx = np.arange(k)
+    if weights is None:
+        weight_matrix = 1.0 - np.eye(k)
+    elif weights == 'linear':
+        weight_matrix = np.abs(idx[:, None] - idx[None, :]).astype(float)
+    elif weights == 'quadratic':
+        weight_matrix = ((idx[:, None] - idx[None, :]) ** 2).astype(float)
+    else:
+        raise ValueError(f"Unknown weighting: {weights}")
+        
+    expected_disagreement = np.sum(weight_matrix * expected)
+    if expected_disagreement == 0:
+        return np.nan
+    return 1.0 - np.sum(weight_matrix * confusion) / expected_disagreement
+
+def cohen_kappa_sweep(llm_scores, human_scores, n_bins_range=range(2, 11),
+                      binning=('fixed', 'quantile'), weights=(None, 'linear', 'quadratic'),
+                      value_range=(0.0, 1.0), max_dense_cells=4_000_000):
+    """
+    Calculate Cohen's Kappa for a range of bin counts and binning schemes.
+    
+    Each score array is sorted once. The joint counts of distinct (LLM, human)
+    values are accumulated into a 2-D cumulative table, so the confusion matrix
+    of any binning is read off the table at the bin boundaries instead of
+    re-digitizing the raw scores. 'fixed' reproduces `cohen_kappa` (equal-width
+    edges over `value_range`) and 'quantile' reproduces the pd.qcut binning of
+    `EvaluationMetrics.calculate_cohens_kappa`.
+    
+    Args:
+        llm_scores (array-like): Scores generated by the LLM
+        human_scores (array-like): Scores provided by human evaluators
+        n_bins_range (iterable of int): Bin counts to evaluate
+        binning (iterable of str): Binning schemes, 'fixed' and/or 'quantile'
+        weights (iterable): Kappa weightings, any of None, 'linear', 'quadratic'
+        value_range (tuple): Range spanned by the equal-width edges of 'fixed' binning
+        max_dense_cells (int): Largest distinct-value grid stored densely; larger
+            grids fall back to sparse joint counts
+            
+    Returns:
+        pd.DataFrame: One row per (binning, n_bins, weights) with the kappa score
+    """
+    import pandas as pd
+    
+    llm_sorted, llm_unique, llm_codes = _sorted_summary(llm_scores)
+    human_sorted, human_unique, human_codes = _sorted_summary(human_scores)
+    if len(llm_codes) != len(human_codes):
+        raise ValueError("llm_scores and human_scores must have the same length")
+    n_llm, n_human = len(llm_unique), len(human_unique)
+    
+    if n_llm * n_human <= max_dense_cells:
+        joint = np.bincount(llm_codes * n_human + human_codes, minlength=n_llm * n_human)
+        cumulative = np.zeros((n_llm + 1, n_human + 1))
+        cumulative[1:, 1:] = joint.reshape(n_llm, n_human).cumsum(axis=0).cumsum(axis=1)
+        
+        def confusion_for(llm_bounds, human_bounds):
+            corners = cumulative[np.ix_(llm_bounds, human_bounds)]
+            return np.diff(np.diff(corners, axis=0), axis=1)
+    else:
+        pair_codes, pair_counts = np.unique(llm_codes.astype(np.int64) * n_human + human_codes,
+                                            return_counts=True)
+        pair_llm, pair_human = np.divmod(pair_codes, n_human)
+        
+        def confusion_for(llm_bounds, human_bounds):
+            k = len(llm_bounds) - 1
+            llm_bins = np.searchsorted(llm_bounds, pair_llm, side='right') - 1
+            human_bins = np.searchsorted(human_bounds, pair_human, side='right') - 1
+            flat = np.bincount(llm_bins * k + human_bins, weights=pair_counts, minlength=k * k)
+            return flat.reshape(k, k)
+    
+    rows = []
+    for scheme in binning:
+        for n_bins in n_bins_range:
+            if scheme == 'fixed':
+                llm_bounds = _fixed_boundaries(llm_unique, n_bins, value_range)
+                human_bounds = _fixed_boundaries(human_unique, n_bins, value_range)
+            elif scheme == 'quantile':
+                llm_bounds = _quantile_boundaries(llm_sorted, llm_unique, n_bins)
+                human_bounds = _quantile_boundaries(human_sorted, human_unique, n_bins)
+            else:
+                raise ValueError(f"Unknown binning scheme: {scheme}")
+                
+            confusion = confusion_for(llm_bounds, human_bounds)
+            for weighting in weights:
+                rows.append({
+                    'binning': scheme,
+                    'n_bins': n_bins,
+                    'weights': weighting or 'none',
+                    'kappa': _kappa_from_confusion(confusion, weighting)
+                })
+    
+    return pd.DataFrame(rows)
@@ -0,0 +1,472 @@
+"""Time-series analytics and drift alerts over MetricsRecorder histories."""
+
+import bisect
+import json
+import math
+import re
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+TIMESTAMP_COLUMN = 'timestamp'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Judge-human agreement and bias columns watched by default
+DRIFT_METRIC_PATTERN = re.compile(
+    r'(agreement|kappa|correlation|alpha|bias|mae|rmse|calibration_error)', re.IGNORECASE
+)
+
+
+class MetricsHistory:
+    """
+    Numeric view of a metrics_history.csv that is loaded incrementally.
+
+    Only the requested columns (plus the timestamp) are read, and timestamps
+    are parsed once with a fixed format. MetricsRecorder only ever appends
+    rows, so while the header is unchanged refresh() reads just the rows
+    added since the last call; a changed header (new metric keys) triggers a
+    full reload.
+    """
+
+    def __init__(self, path: Union[str, Path], columns: Optional[Sequence[str]] = None,
+                 pattern: Optional[Union[str, re.Pattern]] = None):
+        """
+        Args:
+            path (str or Path): metrics_history.csv written by MetricsRecorder
+            columns (list): Metric columns to load; all columns if None
+            pattern (str or re.Pattern): Alternatively, load columns whose name matches
+        """
+        self.path = Path(path)
+        self.columns = list(columns) if columns is not None else None
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.data = pd.DataFrame()
+        self._header: Optional[List[str]] = None
+        self._signature = None
+
+    def _select(self, header: List[str]) -> List[str]:
+        if self.columns is not None:
+            selected = [c for c in header if c in self.columns]
+        elif self.pattern is not None:
+            selected = [c for c in header if self.pattern.search(c)]
+        else:
+            selected = [c for c in header if c != TIMESTAMP_COLUMN]
+        return selected + ([TIMESTAMP_COLUMN] if TIMESTAMP_COLUMN in header else [])
+
+    def _parse(self, frame: pd.DataFrame) -> pd.DataFrame:
+        if TIMESTAMP_COLUMN in frame.columns:
+            index = pd.to_datetime(frame.pop(TIMESTAMP_COLUMN), format=TIMESTAMP_FORMAT, errors='coerce')
+            frame.index = pd.DatetimeIndex(index, name=TIMESTAMP_COLUMN)
+        # Columns holding dicts or text (distribution summaries) become NaN and are dropped
+        frame = frame.apply(pd.to_numeric, errors='coerce')
+        return frame.dropna(axis=1, how='all')
+
+    def refresh(self) -> pd.DataFrame:
+        """
+        Load rows added since the last call.
+
+        Returns:
+            pd.DataFrame: The new rows (numeric columns, indexed by timestamp)
+        """
+        if not self.path.exists():
+            return self.data.iloc[0:0]
+        stat = self.path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return self.data.iloc[0:0]
+        header = list(pd.read_csv(self.path, nrows=0).columns)
+        n_loaded = len(self.data) if header == self._header else 0
+        new_rows = self._parse(pd.read_csv(
+            self.path, usecols=self._select(header), skiprows=range(1, n_loaded + 1)
+        ))
+        if n_loaded:
+            self.data = pd.concat([self.data, new_rows])
+        else:
+            self.data = new_rows
+        self._header, self._signature = header, signature
+        return new_rows
+
+    def rolling(self, window: int = 5, quantiles: Sequence[float] = (0.1, 0.5, 0.9),
+                min_periods: int = 1) -> pd.DataFrame:
+        """
+        Rolling mean and quantiles of every loaded metric over the last `window` records.
+
+        Args:
+            window (int): Number of records per window
+            quantiles (list): Quantiles to compute, in [0, 1]
+            min_periods (int): Records required before a value is reported
+
+        Returns:
+            pd.DataFrame: Columns (metric, statistic) with statistic 'mean' or 'q<quantile>'
+        """
+        rolling = self.data.rolling(window, min_periods=min_periods)
+        parts = {'mean': rolling.mean()}
+        for q in quantiles:
+            parts[f'q{q:g}'] = rolling.quantile(q)
+        result = pd.concat(parts, axis=1).swaplevel(axis=1)
+        return result.reindex(columns=self.data.columns, level=0)
+
+
+class RollingWindow:
+    """Last `size` values with their running sum and a sorted copy, O(size) worst case per update."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque()
+        self.sorted: List[float] = []
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        if len(self.values) == self.size:
+            old = self.values.popleft()
+            self.total -= old
+            del self.sorted[bisect.bisect_left(self.sorted, old)]
+        self.values.append(value)
+        self.total += value
+        bisect.insort(self.sorted, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / len(self.values) if self.values else float('nan')
+
+    def quantile(self, q: float) -> float:
+        """Linearly interpolated quantile (numpy's default method)."""
+        if not self.sorted:
+            return float('nan')
+        position = q * (len(self.sorted) - 1)
+        lower = int(math.floor(position))
+        upper = min(lower + 1, len(self.sorted) - 1)
+        return self.sorted[lower] + (self.sorted[upper] - self.sorted[lower]) * (position - lower)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'size': self.size, 'values': list(self.values), 'total': self.total}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'RollingWindow':
+        window = cls(state['size'])
+        for value in state['values']:
+            window.add(value)
+        # Keep the running sum as it was, so a restored window continues identically
+        window.total = state['total']
+        return window
+
+
+class PageHinkley:
+    """
+    Two-sided Page-Hinkley test for a shift in the mean of a stream.
+
+    The running mean and the cumulative deviations from it are updated in
+    O(1) per value. An upward (downward) change is signalled when the
+    cumulative deviation rises (falls) more than `threshold` above (below)
+    its running minimum (maximum); the detector then restarts. `delta` and
+    `threshold` are absolute, in the metric's own units, so they have to be
+    chosen for the metric's noise level; Cusum scales itself instead.
+    """
+
+    def __init__(self, delta: float = 0.005, threshold: float = 0.05, min_samples: int = 5):
+        """
+        Args:
+            delta (float): Magnitude of changes tolerated without an alarm
+            threshold (float): Alarm threshold (lambda) on the cumulative deviation
+            min_samples (int): Values required before alarms are raised
+        """
+        self.delta = delta
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.reset()
+
+    def reset(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.up = 0.0
+        self.up_min = 0.0
+        self.down = 0.0
+        self.down_max = 0.0
+
+    @property
+    def statistic(self) -> float:
+        return max(self.up - self.up_min, self.down_max - self.down)
+
+    def update(self, value: float) -> Optional[str]:
+        """
+        Add one value.
+
+        Returns:
+            str or None: 'increase' or 'decrease' when a change is detected
+        """
+        self.n += 1
+        self.mean += (value - self.mean) / self.n
+        self.up += value - self.mean - self.delta
+        self.up_min = min(self.up_min, self.up)
+        self.down += value - self.mean + self.delta
+        self.down_max = max(self.down_max, self.down)
+        if self.n < self.min_samples:
+            return None
+        if self.up - self.up_min > self.threshold:
+            self.reset()
+            return 'increase'
+        if self.down_max - self.down > self.threshold:
+            self.reset()
+            return 'decrease'
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'PageHinkley':
+        detector = cls.__new__(cls)
+        detector.__dict__.update(state)
+        return detector
+
+
+class Cusum:
+    """
+    Two-sided tabular CUSUM on standardized values.
+
+    The in-control mean and standard deviation are estimated (Welford) from the
+    first `warmup` values, so the thresholds adapt to each metric's noise;
+    afterwards S+ = max(0, S+ + z - k) and
+    S- = max(0, S- - z - k) are updated in O(1) and a change is signalled
+    when either exceeds h. The detector then re-estimates from scratch.
+    """
+
+    def __init__(self, k: float = 0.5, h: float = 5.0, warmup: int = 20):
+        """
+        Args:
+            k (float): Allowance, in standard deviations
+            h (float): Decision threshold, in standard deviations
+            warmup (int): Values used to estimate the in-control mean and deviation
+        """
+        self.k = k
+        self.h = h
+        self.warmup = warmup
+        self.reset()
+
+    def reset(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.high = 0.0
+        self.low = 0.0
+
+    @property
+    def statistic(self) -> float:
+        return max(self.high, self.low)
+
+    def update(self, value: float) -> Optional[str]:
+        """
+        Add one value.
+
+        Returns:
+            str or None: 'increase' or 'decrease' when a change is detected
+        """
+        if self.n < self.warmup:
+            self.n += 1
+            delta = value - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (value - self.mean)
+            return None
+        std = math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+        # A constant warm-up period leaves no scale; fall back to an absolute one
+        z = (value - self.mean) / (std if std > 0 else max(abs(self.mean), 1.0) * 1e-3)
+        self.high = max(0.0, self.high + z - self.k)
+        self.low = max(0.0, self.low - z - self.k)
+        if self.high > self.h:
+            self.reset()
+            return 'increase'
+        if self.low > self.h:
+            self.reset()
+            return 'decrease'
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'Cusum':
+        detector = cls.__new__(cls)
+        detector.__dict__.update(state)
+        return detector
+
+
+DETECTORS = {'page_hinkley': PageHinkley, 'cusum': Cusum}
+
+
+@dataclass
+class DriftAlert:
+    """A detected change in one metric of the history."""
+
+    metric: str
+    direction: str
+    value: float
+    rolling_mean: float
+    detector: str
+    record: int
+    timestamp: Optional[str] = None
+
+
+class DriftMonitor:
+    """
+    Online drift detection over metrics history records.
+
+    Each watched metric keeps a rolling window and a change-point detector.
+    update() processes one record in time independent of the history length,
+    and the whole state serializes to JSON so a monitor can continue across
+    runs without rescanning metrics_history.csv.
+    """
+
+    def __init__(self, metrics: Optional[Sequence[str]] = None,
+                 pattern: Union[str, re.Pattern] = DRIFT_METRIC_PATTERN,
+                 detector: str = 'cusum', detector_options: Optional[Dict[str, Any]] = None,
+                 window: int = 10, on_alert: Optional[Callable[[DriftAlert], None]] = None):
+        """
+        Args:
+            metrics (list): Metric names to watch; if None, numeric metrics matching `pattern`
+            pattern (str or re.Pattern): Name pattern of watched metrics (agreement and bias by default)
+            detector (str): 'cusum' or 'page_hinkley'
+            detector_options (dict): Keyword arguments for the detector
+            window (int): Rolling window size
+            on_alert (callable): Called with every DriftAlert, in addition to logging it
+        """
+        if detector not in DETECTORS:
+            raise ValueError(f"Unknown detector: {detector}")
+        self.metrics = list(metrics) if metrics is not None else None
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.detector = detector
+        self.detector_options = dict(detector_options or {})
+        self.window = window
+        self.on_alert = on_alert
+        self.n_records = 0
+        self.windows: Dict[str, RollingWindow] = {}
+        self.detectors: Dict[str, Any] = {}
+
+    def _watched(self, name: str) -> bool:
+        if self.metrics is not None:
+            return name in self.metrics
+        return name != TIMESTAMP_COLUMN and bool(self.pattern.search(name))
+
+    def update(self, record: Dict[str, Any]) -> List[DriftAlert]:
+        """
+        Process one history record.
+
+        Args:
+            record (dict): Metric name to value, as passed to MetricsRecorder.record_metrics
+
+        Returns:
+            list: DriftAlerts raised by this record
+        """
+        alerts = []
+        for name, value in record.items():
+            if not self._watched(name) or isinstance(value, bool):
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            if math.isnan(value):
+                continue
+            if name not in self.detectors:
+                self.windows[name] = RollingWindow(self.window)
+                self.detectors[name] = DETECTORS[self.detector](**self.detector_options)
+            self.windows[name].add(value)
+            direction = self.detectors[name].update(value)
+            if direction is not None:
+                alert = DriftAlert(
+                    metric=name, direction=direction, value=value,
+                    rolling_mean=self.windows[name].mean, detector=self.detector,
+                    record=self.n_records, timestamp=record.get(TIMESTAMP_COLUMN)
+                )
+                logger.warning(f"Metric drift: {name} {direction}d to {value:.4f} "
+                               f"(rolling mean {alert.rolling_mean:.4f}, record {self.n_records})")
+                if self.on_alert is not None:
+                    self.on_alert(alert)
+                alerts.append(alert)
+        self.n_records += 1
+        return alerts
+
+    def update_many(self, records: Iterable[Dict[str, Any]]) -> List[DriftAlert]:
+        """Process records in order and return all alerts."""
+        alerts = []
+        for record in records:
+            alerts.extend(self.update(record))
+        return alerts
+
+    def update_from_history(self, history: MetricsHistory) -> List[DriftAlert]:
+        """
+        Process the records of a MetricsHistory that this monitor has not seen yet.
+
+        Args:
+            history (MetricsHistory): History to read; refreshed first
+
+        Returns:
+            list: DriftAlerts raised by the new records
+        """
+        history.refresh()
+        new_rows = history.data.iloc[self.n_records:]
+        timestamps = new_rows.index.strftime(TIMESTAMP_FORMAT) if isinstance(
+            new_rows.index, pd.DatetimeIndex) else [None] * len(new_rows)
+        records = (
+            {**{k: v for k, v in row.items() if not pd.isna(v)}, TIMESTAMP_COLUMN: ts}
+            for row, ts in zip(new_rows.to_dict('records'), timestamps)
+        )
+        return self.update_many(records)
+
+    def rolling_summary(self, quantiles: Sequence[float] = (0.1, 0.5, 0.9)) -> pd.DataFrame:
+        """
+        Current rolling mean and quantiles of every watched metric.
+
+        Returns:
+            pd.DataFrame: One row per metric
+        """
+        return pd.DataFrame({
+            name: {'mean': window.mean, **{f'q{q:g}': window.quantile(q) for q in quantiles},
+                   'detector_statistic': self.detectors[name].statistic}
+            for name, window in self.windows.items()
+        }).T
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the monitor state as JSON."""
+        state = {
+            'metrics': self.metrics,
+            'pattern': self.pattern.pattern,
+            'pattern_flags': self.pattern.flags,
+            'detector': self.detector,
+            'detector_options': self.detector_options,
+            'window': self.window,
+            'n_records': self.n_records,
+            'windows': {name: window.to_dict() for name, window in self.windows.items()},
+            'detectors': {name: detector.to_dict() for name, detector in self.detectors.items()}
+        }
+        path = Path(path)
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_text(json.dumps(state))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], on_alert: Optional[Callable[[DriftAlert], None]] = None) -> 'DriftMonitor':
+        """Restore a monitor written by save()."""
+        state = json.loads(Path(path).read_text())
+        monitor = cls(
+            metrics=state['metrics'],
+            pattern=re.compile(state['pattern'], state['pattern_flags']),
+            detector=state['detector'],
+            detector_options=state['detector_options'],
+            window=state['window'],
+            on_alert=on_alert
+        )
+        monitor.n_records = state['n_records']
+        detector_class = DETECTORS[monitor.detector]
+        monitor.windows = {name: RollingWindow.from_dict(w) for name, w in state['windows'].items()}
+        monitor.detectors = {name: detector_class.from_dict(d) for name, d in state['detectors'].items()}
+        return monitor
+
+
+def alerts_to_frame(alerts: Sequence[DriftAlert]) -> pd.DataFrame:
+    """Tabulate alerts, one row per alert."""
+    return pd.DataFrame([asdict(alert) for alert in alerts],
+                        columns=[f for f in DriftAlert.__dataclass_fields__])
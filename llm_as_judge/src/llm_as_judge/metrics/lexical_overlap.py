@@ -0,0 +1,184 @@
+"""Reference-based lexical overlap metrics (ROUGE, BLEU, token F1) for answers."""
+
+import itertools
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+OVERLAP_METRICS = ('rouge1_f1', 'rouge2_f1', 'rougeL_f1', 'bleu', 'token_f1')
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+_ARTICLES = ('a', 'an', 'the')
+_HASH_MODULUS = 2 ** 31 - 1
+
+
+def _tokenize(texts):
+    """Lowercase word tokens of every text."""
+    return [_TOKEN_PATTERN.findall(str(text).lower()) if not pd.isna(text) else [] for text in texts]
+
+
+def _ngram_matrices(tokens, max_n):
+    """
+    Sparse document-by-ngram count matrices for n = 1..max_n.
+
+    The tokens of all documents are concatenated into one stream and
+    factorized into ids. N-grams are hashed with a rolling polynomial hash
+    modulo the prime 2^31 - 1 computed on the whole stream at once, so the
+    matrices of all documents share columns. Hash collisions only matter
+    between n-grams of the same answer and reference, which is negligible at
+    this column count.
+
+    Args:
+        tokens (list): Token list of every document
+        max_n (int): Largest n-gram order
+
+    Returns:
+        tuple: (list of CSR count matrices, one per order; unique tokens in
+        order of their unigram ids)
+    """
+    lengths = np.fromiter((len(doc) for doc in tokens), dtype=np.int64, count=len(tokens))
+    stream, vocabulary = pd.factorize(np.fromiter(
+        itertools.chain.from_iterable(tokens), dtype=object, count=int(lengths.sum())
+    ))
+    stream = stream.astype(np.int64)
+    documents = np.repeat(np.arange(len(tokens)), lengths)
+    base = len(vocabulary) + 1
+
+    matrices = []
+    grams = stream
+    valid = np.ones(stream.size, dtype=bool)
+    for n in range(1, max_n + 1):
+        if n > 1:
+            size = max(stream.size - n + 1, 0)
+            grams = (grams[:size] * base + stream[n - 1:] + 1) % _HASH_MODULUS
+            valid = valid[:size] & (documents[n - 1:] == documents[:size])
+        counts = sparse.csr_matrix(
+            (np.ones(int(valid.sum())), (documents[:valid.size][valid], grams[valid])),
+            shape=(len(tokens), _HASH_MODULUS)
+        )
+        counts.sum_duplicates()
+        matrices.append(counts)
+    return matrices, vocabulary
+
+
+def lcs_length(a, b):
+    """
+    Length of the longest common subsequence of two token sequences.
+
+    Bit-parallel algorithm (Hyyro 2004): one bit per position of `b`, updated
+    with a few integer operations per token of `a`.
+
+    Args:
+        a (list): First token sequence
+        b (list): Second token sequence
+
+    Returns:
+        int: LCS length
+    """
+    if not a or not b:
+        return 0
+    matches = {}
+    for position, token in enumerate(b):
+        matches[token] = matches.get(token, 0) | (1 << position)
+    mask = (1 << len(b)) - 1
+    row = mask
+    for token in a:
+        u = row & matches.get(token, 0)
+        row = ((row + u) | (row - u)) & mask
+    return len(b) - bin(row).count('1')
+
+
+def _f1(overlap, predicted, reference):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        precision = np.where(predicted > 0, overlap / predicted, 0.0)
+        recall = np.where(reference > 0, overlap / reference, 0.0)
+        return np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+
+def _row_sums(matrix):
+    return np.asarray(matrix.sum(axis=1)).ravel()
+
+
+def _overlap_chunk(answers, references, max_n):
+    """Overlap metrics for one chunk of (answer, reference) rows."""
+    tokens = _tokenize(answers) + _tokenize(references)
+    n_rows = len(answers)
+    matrices, vocabulary = _ngram_matrices(tokens, max_n)
+
+    overlaps, predicted, reference = [], [], []
+    for counts in matrices:
+        answer_counts, reference_counts = counts[:n_rows], counts[n_rows:]
+        overlaps.append(_row_sums(answer_counts.minimum(reference_counts)))
+        predicted.append(_row_sums(answer_counts))
+        reference.append(_row_sums(reference_counts))
+
+    # Token F1 drops articles from the bag of words, as in SQuAD evaluation
+    unigrams = matrices[0]
+    article_ids = np.flatnonzero(np.isin(vocabulary, _ARTICLES))
+    if article_ids.size:
+        unigrams = unigrams.copy()
+        unigrams.data[np.isin(unigrams.indices, article_ids)] = 0
+        unigrams.eliminate_zeros()
+    answer_words, reference_words = unigrams[:n_rows], unigrams[n_rows:]
+    token_f1 = _f1(_row_sums(answer_words.minimum(reference_words)),
+                   _row_sums(answer_words), _row_sums(reference_words))
+
+    lcs = np.array([lcs_length(a, r) for a, r in zip(tokens[:n_rows], tokens[n_rows:])], dtype=float)
+
+    # Sentence BLEU with add-one smoothing of the n > 1 precisions (Lin and Och 2004). As in
+    # NLTK, an order the answer has no n-grams of counts one n-gram, so its smoothed precision is 1/2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_precision = np.zeros(n_rows)
+        for n in range(max_n):
+            smoothing = 1 if n > 0 else 0
+            log_precision += np.log((overlaps[n] + smoothing) / (np.maximum(predicted[n], 1) + smoothing))
+        length, reference_length = predicted[0], reference[0]
+        brevity = np.where(length < reference_length, 1 - reference_length / length, 0.0)
+        bleu = np.where(overlaps[0] > 0, np.exp(brevity + log_precision / max_n), 0.0)
+
+    return pd.DataFrame({
+        'rouge1_f1': _f1(overlaps[0], predicted[0], reference[0]),
+        'rouge2_f1': _f1(overlaps[1], predicted[1], reference[1]) if max_n > 1 else np.nan,
+        'rougeL_f1': _f1(lcs, predicted[0], reference[0]),
+        'bleu': bleu,
+        'token_f1': token_f1
+    })
+
+
+def lexical_overlap(answers, references, max_n=4, chunk_rows=50_000, n_jobs=1):
+    """
+    ROUGE-1/2/L F1, sentence BLEU and token F1 of every answer against its reference.
+
+    Each chunk of rows is tokenized once into shared token ids, and the n-gram
+    counts of answers and references become CSR matrices over hashed n-gram
+    columns. Clipped n-gram overlaps are then row sums of the element-wise minimum
+    of the two matrices. ROUGE-L uses a bit-parallel LCS per row.
+
+    Args:
+        answers (array-like): Generated answers
+        references (array-like): Reference answers, same order
+        max_n (int): Largest n-gram order for BLEU (ROUGE uses orders 1 and 2)
+        chunk_rows (int): Rows per chunk
+        n_jobs (int): Worker processes; 1 computes chunks in this process
+
+    Returns:
+        pd.DataFrame: One row per answer with the OVERLAP_METRICS columns
+    """
+    answers, references = list(answers), list(references)
+    if len(answers) != len(references):
+        raise ValueError("answers and references must have the same length")
+    if max_n < 1:
+        raise ValueError("max_n must be at least 1")
+    starts = range(0, len(answers), chunk_rows)
+    chunks = [(answers[s:s + chunk_rows], references[s:s + chunk_rows], max_n) for s in starts]
+    if not chunks:
+        return pd.DataFrame(columns=list(OVERLAP_METRICS), dtype=float)
+    if n_jobs == 1 or len(chunks) == 1:
+        results = [_overlap_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_overlap_chunk, *zip(*chunks)))
+    return pd.concat(results, ignore_index=True)
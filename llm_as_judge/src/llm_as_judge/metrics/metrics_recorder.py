@@ -4,7 +4,7 @@ import os
 from datetime import datetime
 import pandas as pd
 from pathlib import Path
-from typing import Dict, Any, Optional, Literal
+from typing import Dict, Any, List, Optional, Literal
 
 class MetricsRecorder:
     """Records evaluation metrics with timestamps."""
@@ -12,7 +12,8 @@ class MetricsRecorder:
     def __init__(
         self, 
         evaluation_type: Literal["answer_advanced", "answer_basic", "question_basic"],
-        output_path: Optional[str] = None
+        output_path: Optional[str] = None,
+        monitor_drift: bool = False
     ):
         """
         Initialize the metrics recorder.
@@ -20,6 +21,8 @@ class MetricsRecorder:
         Args:
             evaluation_type: Type of evaluation being performed
             output_path: Path to save the metrics CSV file. If None, uses default path.
+            monitor_drift: Run online change-point detection on agreement and bias
+                metrics as records arrive (state kept in drift_monitor.json next to the CSV)
         """
         if output_path is None:
             # Default path in the data directory with evaluation type subfolder
@@ -30,13 +33,33 @@ class MetricsRecorder:
             
         # Create directory if it doesn't exist
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.monitor = None
+        if monitor_drift:
+            self.monitor = self._load_monitor()
+
+    def _load_monitor(self):
+        from .history_analytics import DriftMonitor, MetricsHistory
+
+        state_path = self.output_path.with_name('drift_monitor.json')
+        if state_path.exists():
+            return DriftMonitor.load(state_path)
+        # First use on an existing history: replay it once to initialise the detectors
+        monitor = DriftMonitor()
+        if self.output_path.exists():
+            monitor.update_from_history(MetricsHistory(self.output_path, pattern=monitor.pattern))
+            monitor.save(state_path)
+        return monitor
         
-    def record_metrics(self, metrics: Dict[str, Any]) -> None:
+    def record_metrics(self, metrics: Dict[str, Any]) -> List:
         """
         Record metrics with current timestamp.
         
         Args:
             metrics: Dictionary containing metric names and values
+
+        Returns:
+            List of DriftAlert raised by this record (empty unless monitor_drift is set)
         """
         # Add timestamp
         metrics['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -52,4 +75,10 @@ class MetricsRecorder:
             df = df_new
             
         # Save to CSV
-        df.to_csv(self.output_path, index=False) 
\ No newline at end of file
+        df.to_csv(self.output_path, index=False)
+
+        if self.monitor is None:
+            return []
+        alerts = self.monitor.update(metrics)
+        self.monitor.save(self.output_path.with_name('drift_monitor.json'))
+        return alerts
@@ -0,0 +1,219 @@
+"""Multi-rater agreement metrics for LLM-as-Judge evaluation."""
+
+import numpy as np
+from scipy import sparse
+
+LEVELS = ('nominal', 'ordinal', 'interval')
+
+
+def _long_format(ratings):
+    """
+    Flatten an (items x raters) rating matrix into (item index, value) pairs.
+
+    Args:
+        ratings (array-like): 2-D ratings, NaN (or None) where a rater did not rate an item
+
+    Returns:
+        tuple: (item indices, values) of the present ratings
+    """
+    matrix = np.asarray(ratings, dtype=float)
+    if matrix.ndim != 2:
+        raise ValueError("ratings must be a 2-D (items x raters) array")
+    present = ~np.isnan(matrix)
+    items = np.broadcast_to(np.arange(matrix.shape[0])[:, None], matrix.shape)[present]
+    return items, matrix[present]
+
+
+def count_matrix(item_ids, values):
+    """
+    Sparse item-by-value count matrix built in one pass over the ratings.
+
+    Args:
+        item_ids (array-like): Item of each rating
+        values (array-like): Rating values; NaN ratings are ignored
+
+    Returns:
+        tuple: (CSR matrix of counts n_uc with one row per distinct item and one
+        column per distinct value, sorted distinct values)
+    """
+    item_ids = np.asarray(item_ids)
+    values = np.asarray(values, dtype=float)
+    present = ~np.isnan(values)
+    _, item_codes = np.unique(item_ids[present], return_inverse=True)
+    unique_values, value_codes = np.unique(values[present], return_inverse=True)
+    counts = sparse.csr_matrix(
+        (np.ones(value_codes.size), (item_codes, value_codes)),
+        shape=(item_codes.max() + 1 if item_codes.size else 0, unique_values.size)
+    )
+    counts.sum_duplicates()
+    return counts, unique_values
+
+
+def _pairable(counts):
+    """Rows of items with at least two ratings, and their rating counts."""
+    per_item = np.asarray(counts.sum(axis=1)).ravel()
+    keep = per_item >= 2
+    return counts[keep], per_item[keep]
+
+
+def coincidence_matrix(item_ids, values):
+    """
+    Krippendorff coincidence matrix o_ck = sum_u n_uc (n_uk - [c == k]) / (m_u - 1).
+
+    Args:
+        item_ids (array-like): Item of each rating
+        values (array-like): Rating values; NaN ratings are ignored
+
+    Returns:
+        tuple: (sparse coincidence matrix over the distinct values, distinct values)
+    """
+    counts, unique_values = count_matrix(item_ids, values)
+    counts, per_item = _pairable(counts)
+    weighted = sparse.diags(1.0 / (per_item - 1)) @ counts
+    coincidences = (counts.T @ weighted).tocsr()
+    coincidences -= sparse.diags(np.asarray(weighted.sum(axis=0)).ravel())
+    return coincidences, unique_values
+
+
+def krippendorff_alpha_long(item_ids, values, level='interval'):
+    """
+    Krippendorff's alpha from ratings in long format.
+
+    Alpha is 1 - D_o / D_e computed from the coincidences of pairable values.
+    The disagreement sums are evaluated from per-item sufficient statistics of
+    the sparse count matrix rather than by enumerating rater pairs: nominal
+    disagreement needs the per-item sums of squared counts, interval
+    disagreement the per-item sums of values and squared values, and ordinal
+    disagreement equals interval disagreement on the mid-rank of each value
+    within the pairable marginal distribution.
+
+    Args:
+        item_ids (array-like): Item of each rating
+        values (array-like): Rating values; NaN ratings are ignored
+        level (str): 'nominal', 'ordinal' or 'interval'
+
+    Returns:
+        float: Krippendorff's alpha, NaN if there is no expected disagreement
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Unknown measurement level: {level}")
+    counts, unique_values = count_matrix(item_ids, values)
+    counts, per_item = _pairable(counts)
+    marginals = np.asarray(counts.sum(axis=0)).ravel()
+    n = marginals.sum()
+    if n < 2:
+        return np.nan
+
+    if level == 'nominal':
+        # Ordered pairs of different values within each item and overall
+        within = (per_item ** 2 - np.asarray(counts.multiply(counts).sum(axis=1)).ravel()) / (per_item - 1)
+        observed = within.sum()
+        expected = (n ** 2 - (marginals ** 2).sum()) / (n - 1)
+    else:
+        if level == 'ordinal':
+            # Mid-rank of each value: the ordinal metric is the squared mid-rank difference
+            positions = np.cumsum(marginals) - marginals / 2
+        else:
+            positions = unique_values
+        sums = counts @ positions
+        squares = counts @ positions ** 2
+        # sum over ordered pairs (i, j) of (x_i - x_j)^2 = 2 (m S2 - S1^2)
+        observed = (2 * (per_item * squares - sums ** 2) / (per_item - 1)).sum()
+        total, total_squares = marginals @ positions, marginals @ positions ** 2
+        expected = 2 * (n * total_squares - total ** 2) / (n - 1)
+
+    if expected == 0:
+        return np.nan
+    return float(1 - observed / expected)
+
+
+def krippendorff_alpha(ratings, level='interval'):
+    """
+    Krippendorff's alpha for any number of raters with missing ratings.
+
+    Args:
+        ratings (array-like): 2-D (items x raters) ratings, NaN where missing
+        level (str): 'nominal', 'ordinal' or 'interval'
+
+    Returns:
+        float: Krippendorff's alpha
+    """
+    return krippendorff_alpha_long(*_long_format(ratings), level=level)
+
+
+def fleiss_kappa(ratings, n_bins=None):
+    """
+    Fleiss' kappa, allowing a varying number of raters per item.
+
+    Items with fewer than two ratings are ignored. Each item's observed
+    agreement is averaged with equal weight and chance agreement uses the
+    pooled category proportions.
+
+    Args:
+        ratings (array-like): 2-D (items x raters) ratings, NaN where missing
+        n_bins (int, optional): Discretize scores in [0, 1] into this many
+            equal-width bins first, as cohen_kappa does; None treats every
+            distinct value as a category
+
+    Returns:
+        float: Fleiss' kappa
+    """
+    item_ids, values = _long_format(ratings)
+    if n_bins is not None:
+        values = np.digitize(values, bins=np.linspace(0, 1, n_bins + 1))
+    counts, _ = count_matrix(item_ids, values)
+    counts, per_item = _pairable(counts)
+    if per_item.size == 0:
+        return np.nan
+    squared = np.asarray(counts.multiply(counts).sum(axis=1)).ravel()
+    observed = np.mean((squared - per_item) / (per_item * (per_item - 1)))
+    proportions = np.asarray(counts.sum(axis=0)).ravel() / per_item.sum()
+    chance = (proportions ** 2).sum()
+    if chance == 1:
+        return np.nan
+    return float((observed - chance) / (1 - chance))
+
+
+def panel_agreement(llm_scores, human_ratings, level='interval', n_bins=None):
+    """
+    Agreement of an LLM judge with a panel of human raters.
+
+    Args:
+        llm_scores (array-like): LLM score per item
+        human_ratings (array-like): 2-D (items x raters) human ratings, NaN where missing
+        level (str): Measurement level for Krippendorff's alpha
+        n_bins (int, optional): Bins for Fleiss' kappa, see fleiss_kappa
+
+    Returns:
+        dict: Inter-human alpha and Fleiss' kappa, alpha with the LLM added as
+        one more rater, the change in alpha from adding it, alpha between the
+        LLM and the panel consensus (mean for interval, median for ordinal,
+        most frequent value for nominal), and the number of items and ratings
+    """
+    llm = np.asarray(llm_scores, dtype=float)
+    humans = np.asarray(human_ratings, dtype=float)
+    if humans.ndim != 2 or humans.shape[0] != llm.size:
+        raise ValueError("human_ratings must be a 2-D array with one row per LLM score")
+
+    human_alpha = krippendorff_alpha(humans, level)
+    with_llm_alpha = krippendorff_alpha(np.column_stack([humans, llm]), level)
+
+    rated = ~np.isnan(humans).all(axis=1)
+    consensus = np.full(llm.size, np.nan)
+    if level == 'interval':
+        consensus[rated] = np.nanmean(humans[rated], axis=1)
+    elif level == 'ordinal':
+        consensus[rated] = np.nanmedian(humans[rated], axis=1)
+    else:
+        counts, unique_values = count_matrix(*_long_format(humans[rated]))
+        consensus[rated] = unique_values[np.asarray(counts.argmax(axis=1)).ravel()]
+
+    return {
+        'human_alpha': human_alpha,
+        'human_fleiss_kappa': fleiss_kappa(humans, n_bins),
+        'panel_with_llm_alpha': with_llm_alpha,
+        'llm_alpha_change': with_llm_alpha - human_alpha,
+        'llm_consensus_alpha': krippendorff_alpha(np.column_stack([llm, consensus]), level),
+        'n_items': int(rated.sum()),
+        'n_human_ratings': int((~np.isnan(humans)).sum())
+    }
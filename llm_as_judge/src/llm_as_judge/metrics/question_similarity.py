@@ -0,0 +1,334 @@
+"""Semantic and lexical similarity metrics for generated questions."""
+
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SENTENCE_MODEL = 'all-MiniLM-L6-v2'
+ENCODERS = ('sentence-transformers', 'hashing')
+
+# Collections up to this size are searched exactly unless n_lists is given
+EXACT_SEARCH_LIMIT = 50_000
+
+
+class HashingEncoder:
+    """
+    Dense lexical embeddings from signed feature hashing of word n-grams.
+
+    Hashing n-gram counts into `dim` buckets with random signs is a random
+    projection of the count vector, so inner products of the embeddings are
+    unbiased estimates of inner products of the counts. It needs no model
+    download and serves as the fallback when sentence-transformers is not
+    installed.
+    """
+
+    def __init__(self, dim=256, ngram_range=(1, 2)):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.name = 'hashing'
+        self.dim = dim
+        self._vectorizer = HashingVectorizer(
+            n_features=dim, ngram_range=ngram_range, alternate_sign=True, norm=None
+        )
+
+    def encode(self, texts):
+        return self._vectorizer.transform(texts).toarray().astype(np.float32)
+
+
+class SentenceTransformerEncoder:
+    """Semantic embeddings from a sentence-transformers model."""
+
+    def __init__(self, model_name=DEFAULT_SENTENCE_MODEL, device=None, batch_size=256):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "sentence-transformers is required for semantic question similarity; "
+                "install it with `pip install llm_as_judge[embeddings]`"
+            ) from e
+        self.name = f'sentence-transformers/{model_name}'
+        self.batch_size = batch_size
+        self._model = SentenceTransformer(model_name, device=device)
+
+    def encode(self, texts):
+        return self._model.encode(
+            list(texts), batch_size=self.batch_size, convert_to_numpy=True, show_progress_bar=False
+        ).astype(np.float32)
+
+
+def get_encoder(name=None, **kwargs):
+    """
+    Create a question encoder.
+
+    Args:
+        name (str, optional): 'sentence-transformers' or 'hashing'; None picks
+            sentence-transformers when it is installed and hashing otherwise
+        **kwargs: Passed to the encoder
+
+    Returns:
+        Encoder with an `encode(texts)` method and a `name`
+    """
+    if name is None:
+        available = importlib.util.find_spec('sentence_transformers') is not None
+        name = 'sentence-transformers' if available else 'hashing'
+    if name == 'sentence-transformers':
+        return SentenceTransformerEncoder(**kwargs)
+    if name == 'hashing':
+        return HashingEncoder(**kwargs)
+    raise ValueError(f"Unknown encoder: {name}")
+
+
+def encode_normalized(texts, encoder, batch_size=8192):
+    """
+    Encode texts in batches into L2-normalized float16 embeddings.
+
+    Args:
+        texts (array-like): Texts to encode
+        encoder: Object with an `encode(texts)` method returning a 2-D array
+        batch_size (int): Texts per encoder call
+
+    Returns:
+        np.ndarray: (n_texts, dim) float16 matrix with unit-norm rows (zero
+        rows for texts with an all-zero embedding)
+    """
+    texts = ['' if pd.isna(text) else str(text) for text in texts]
+    embeddings = None
+    for start in range(0, len(texts), batch_size):
+        batch = np.asarray(encoder.encode(texts[start:start + batch_size]), dtype=np.float32)
+        norms = np.linalg.norm(batch, axis=1, keepdims=True)
+        batch /= np.where(norms > 0, norms, 1)
+        if embeddings is None:
+            embeddings = np.empty((len(texts), batch.shape[1]), dtype=np.float16)
+        embeddings[start:start + len(batch)] = batch
+    if embeddings is None:
+        return np.empty((0, 0), dtype=np.float16)
+    return embeddings
+
+
+def rowwise_cosine(embeddings_a, embeddings_b, chunk_rows=65536):
+    """
+    Cosine similarity of corresponding rows of two normalized embedding matrices.
+
+    Args:
+        embeddings_a (np.ndarray): (n, dim) unit-norm embeddings
+        embeddings_b (np.ndarray): (n, dim) unit-norm embeddings
+        chunk_rows (int): Rows converted to float32 at a time
+
+    Returns:
+        np.ndarray: (n,) float32 similarities
+    """
+    if embeddings_a.shape != embeddings_b.shape:
+        raise ValueError("Embedding matrices must have the same shape")
+    similarities = np.empty(len(embeddings_a), dtype=np.float32)
+    for start in range(0, len(embeddings_a), chunk_rows):
+        a = embeddings_a[start:start + chunk_rows].astype(np.float32)
+        b = embeddings_b[start:start + chunk_rows].astype(np.float32)
+        similarities[start:start + len(a)] = np.einsum('ij,ij->i', a, b)
+    return similarities
+
+
+def lexical_similarity(texts_a, texts_b, ngram_range=(1, 1)):
+    """
+    Cosine similarity of word n-gram counts of corresponding texts.
+
+    Args:
+        texts_a (array-like): First texts, e.g. ground truth questions
+        texts_b (array-like): Second texts, e.g. generated questions
+        ngram_range (tuple): Word n-gram range
+
+    Returns:
+        np.ndarray: (n,) similarities in [0, 1]
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    vectorizer = HashingVectorizer(n_features=2 ** 20, ngram_range=ngram_range, alternate_sign=False)
+    a = vectorizer.transform(['' if pd.isna(text) else str(text) for text in texts_a])
+    b = vectorizer.transform(['' if pd.isna(text) else str(text) for text in texts_b])
+    if a.shape[0] != b.shape[0]:
+        raise ValueError("texts_a and texts_b must have the same length")
+    return np.asarray(a.multiply(b).sum(axis=1)).ravel()
+
+
+class VectorIndex:
+    """
+    Top-k inner product search over unit-norm float16 embeddings.
+
+    Small collections are searched exactly by blocked matrix multiplication:
+    query and corpus blocks are multiplied in float32 and a running top-k is
+    kept per query, so the full similarity matrix is never materialized.
+    Larger collections use an inverted file (IVF) index: vectors are assigned
+    to the nearest of `n_lists` spherical k-means centroids and a query only
+    scans the lists of its `n_probe` nearest centroids. Queries probing the
+    same list are multiplied against it together.
+    """
+
+    def __init__(self, embeddings, n_lists=None, n_probe=8, block_elements=2 ** 25, random_state=0):
+        """
+        Build the index.
+
+        Args:
+            embeddings (np.ndarray): (n, dim) unit-norm embeddings, kept as float16
+            n_lists (int, optional): Number of IVF lists; None uses exact search
+                up to EXACT_SEARCH_LIMIT vectors and about sqrt(n) lists above it,
+                0 always searches exactly
+            n_probe (int): Lists scanned per query
+            block_elements (int): Size of each similarity block
+            random_state (int): Seed for training the centroids
+        """
+        self.embeddings = np.asarray(embeddings, dtype=np.float16)
+        n = len(self.embeddings)
+        if n_lists is None:
+            n_lists = 0 if n <= EXACT_SEARCH_LIMIT else int(np.sqrt(n))
+        self.n_lists = min(n_lists, n)
+        self.n_probe = min(n_probe, self.n_lists) if self.n_lists else 0
+        self.block_elements = block_elements
+        self.centroids = None
+        if self.n_lists:
+            self._train(random_state)
+
+    def _train(self, random_state):
+        from sklearn.cluster import MiniBatchKMeans
+
+        rng = np.random.default_rng(random_state)
+        n = len(self.embeddings)
+        sample = rng.choice(n, size=min(n, 64 * self.n_lists), replace=False)
+        kmeans = MiniBatchKMeans(
+            n_clusters=self.n_lists, batch_size=4096, n_init=1, random_state=random_state
+        ).fit(self.embeddings[sample].astype(np.float32))
+        centroids = kmeans.cluster_centers_.astype(np.float32)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        self.centroids = centroids
+
+        assignments = self._nearest_centroids(self.embeddings, 1)[:, 0]
+        self._order = np.argsort(assignments, kind='stable')
+        self._offsets = np.searchsorted(assignments[self._order], np.arange(self.n_lists + 1))
+
+    def _nearest_centroids(self, vectors, n_probe):
+        """Indices of the n_probe most similar centroids of every vector."""
+        rows = max(1, self.block_elements // self.n_lists)
+        nearest = np.empty((len(vectors), n_probe), dtype=np.int64)
+        for start in range(0, len(vectors), rows):
+            similarities = vectors[start:start + rows].astype(np.float32) @ self.centroids.T
+            nearest[start:start + rows] = _top_k(similarities, n_probe)[1]
+        return nearest
+
+    def search(self, queries, k=1, exclude=None):
+        """
+        Find the k most similar indexed vectors of every query.
+
+        Args:
+            queries (np.ndarray): (m, dim) unit-norm query embeddings
+            k (int): Neighbours per query
+            exclude (array-like, optional): One index per query that must not be
+                returned, e.g. the query's own position when searching the index
+                with its own vectors
+
+        Returns:
+            tuple: ((m, k) float32 similarities, (m, k) int64 indices), most
+            similar first; missing neighbours have similarity -inf and index -1
+        """
+        queries = np.asarray(queries)
+        exclude = None if exclude is None else np.asarray(exclude, dtype=np.int64)
+        best_similarities = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        best_indices = np.full((len(queries), k), -1, dtype=np.int64)
+
+        if not self.n_lists:
+            rows = max(1, int(np.sqrt(self.block_elements)))
+            columns = max(1, self.block_elements // rows)
+            for start in range(0, len(queries), rows):
+                query_rows = np.arange(start, min(start + rows, len(queries)))
+                block = queries[query_rows].astype(np.float32)
+                for column_start in range(0, len(self.embeddings), columns):
+                    candidates = np.arange(column_start, min(column_start + columns, len(self.embeddings)))
+                    self._merge(block, query_rows, candidates, exclude, k, best_similarities, best_indices)
+        else:
+            probes = self._nearest_centroids(queries, self.n_probe)
+            pair_queries = np.repeat(np.arange(len(queries)), self.n_probe)
+            pair_lists = probes.ravel()
+            order = np.argsort(pair_lists, kind='stable')
+            pair_queries, pair_lists = pair_queries[order], pair_lists[order]
+            bounds = np.searchsorted(pair_lists, np.arange(self.n_lists + 1))
+            for list_id in range(self.n_lists):
+                candidates = self._order[self._offsets[list_id]:self._offsets[list_id + 1]]
+                probing = pair_queries[bounds[list_id]:bounds[list_id + 1]]
+                if candidates.size == 0 or probing.size == 0:
+                    continue
+                rows = max(1, self.block_elements // candidates.size)
+                for start in range(0, probing.size, rows):
+                    query_rows = probing[start:start + rows]
+                    block = queries[query_rows].astype(np.float32)
+                    self._merge(block, query_rows, candidates, exclude, k, best_similarities, best_indices)
+
+        order = np.argsort(-best_similarities, axis=1, kind='stable')
+        return (np.take_along_axis(best_similarities, order, axis=1),
+                np.take_along_axis(best_indices, order, axis=1))
+
+    def _merge(self, block, query_rows, candidates, exclude, k, best_similarities, best_indices):
+        """Fold one query block x candidate block into the running top-k."""
+        similarities = block @ self.embeddings[candidates].astype(np.float32).T
+        if exclude is not None:
+            similarities[candidates[None, :] == exclude[query_rows][:, None]] = -np.inf
+        block_similarities, positions = _top_k(similarities, k)
+        merged_similarities = np.concatenate([best_similarities[query_rows], block_similarities], axis=1)
+        merged_indices = np.concatenate([best_indices[query_rows], candidates[positions]], axis=1)
+        keep_similarities, keep = _top_k(merged_similarities, k)
+        best_similarities[query_rows] = keep_similarities
+        best_indices[query_rows] = np.take_along_axis(merged_indices, keep, axis=1)
+
+
+def _top_k(similarities, k):
+    """Unordered top-k values and column positions of every row."""
+    if similarities.shape[1] <= k:
+        positions = np.broadcast_to(np.arange(similarities.shape[1]), similarities.shape)
+        padding = k - similarities.shape[1]
+        values = np.pad(similarities, ((0, 0), (0, padding)), constant_values=-np.inf)
+        return values, np.pad(positions, ((0, 0), (0, padding)), constant_values=0)
+    positions = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(similarities, positions, axis=1), positions
+
+
+def question_similarity(ground_truth, generated, encoder=None, duplicate_threshold=0.9,
+                        batch_size=8192, **index_kwargs):
+    """
+    Per-question similarity to the ground truth and to other generated questions.
+
+    Both columns are encoded once. Semantic similarity is the cosine of the
+    question embeddings; lexical similarity the cosine of word counts. Every
+    generated question's nearest other generated question is found through a
+    VectorIndex; a question is a near duplicate when that similarity reaches
+    `duplicate_threshold`.
+
+    Args:
+        ground_truth (array-like): Ground truth questions
+        generated (array-like): LLM generated questions, same order
+        encoder: Encoder or encoder name, see get_encoder
+        duplicate_threshold (float): Similarity at which two generated questions
+            count as near duplicates
+        batch_size (int): Texts per encoder call
+        **index_kwargs: Passed to VectorIndex
+
+    Returns:
+        pd.DataFrame: semantic_similarity, lexical_similarity,
+        nearest_generated, nearest_generated_similarity and is_near_duplicate
+        per question
+    """
+    ground_truth, generated = list(ground_truth), list(generated)
+    if len(ground_truth) != len(generated):
+        raise ValueError("ground_truth and generated must have the same length")
+    if encoder is None or isinstance(encoder, str):
+        encoder = get_encoder(encoder)
+
+    truth_embeddings = encode_normalized(ground_truth, encoder, batch_size)
+    generated_embeddings = encode_normalized(generated, encoder, batch_size)
+    index = VectorIndex(generated_embeddings, **index_kwargs)
+    neighbour_similarities, neighbours = index.search(
+        generated_embeddings, k=1, exclude=np.arange(len(generated))
+    )
+    return pd.DataFrame({
+        'semantic_similarity': rowwise_cosine(truth_embeddings, generated_embeddings),
+        'lexical_similarity': lexical_similarity(ground_truth, generated),
+        'nearest_generated': neighbours[:, 0],
+        'nearest_generated_similarity': neighbour_similarities[:, 0],
+        'is_near_duplicate': neighbour_similarities[:, 0] >= duplicate_threshold
+    })
@@ -34,4 +34,60 @@ def score_stability(original_scores, perturbed_scores, threshold=0.1):
         float: Proportion of stable scores
     """
     differences = np.abs(np.array(original_scores) - np.array(perturbed_scores))
-    return np.mean(differences <= threshold) 
\ No newline at end of file
+    return np.mean(differences <= threshold) 
+
+def score_variance_ratio_trials(original_scores, perturbed_scores):
+    """
+    Calculate the variance-ratio robustness score for several perturbation trials at once.
+    
+    Args:
+        original_scores (array-like): Original LLM scores, shape (n_rows,)
+        perturbed_scores (array-like): Perturbed scores, shape (n_trials, n_rows)
+        
+    Returns:
+        np.ndarray: Robustness score (1 - variance ratio) per trial
+    """
+    perturbed_scores = np.atleast_2d(perturbed_scores)
+    original_var = np.var(original_scores)
+    
+    if original_var == 0:
+        return np.zeros(perturbed_scores.shape[0])
+        
+    return 1 - np.var(perturbed_scores, axis=1) / original_var
+
+def score_stability_trials(original_scores, perturbed_scores, threshold=0.1):
+    """
+    Calculate the proportion of stable scores for several perturbation trials at once.
+    
+    Args:
+        original_scores (array-like): Original LLM scores, shape (n_rows,)
+        perturbed_scores (array-like): Perturbed scores, shape (n_trials, n_rows)
+        threshold (float): Maximum allowed difference to consider scores stable
+        
+    Returns:
+        np.ndarray: Proportion of stable scores per trial
+    """
+    perturbed_scores = np.atleast_2d(perturbed_scores)
+    differences = np.abs(perturbed_scores - np.asarray(original_scores)[np.newaxis, :])
+    return np.mean(differences <= threshold, axis=1)
+
+def summarize_trials(variance_ratios, stabilities, quantiles=(0.05, 0.5, 0.95)):
+    """
+    Summarize per-trial robustness scores by their mean, standard deviation and quantiles.
+    
+    Args:
+        variance_ratios (array-like): Variance-ratio robustness score per trial
+        stabilities (array-like): Proportion of stable scores per trial
+        quantiles (tuple): Quantiles to report, in [0, 1]
+        
+    Returns:
+        dict: 'robustness_n_trials', 'variance_ratio', 'stability' (means) and
+            their '_std' and '_qNN' variants
+    """
+    metrics = {'robustness_n_trials': len(variance_ratios)}
+    for name, values in (('variance_ratio', variance_ratios), ('stability', stabilities)):
+        metrics[name] = float(np.mean(values))
+        metrics[f'{name}_std'] = float(np.std(values))
+        for q, value in zip(quantiles, np.quantile(values, quantiles)):
+            metrics[f'{name}_q{round(q * 100):02d}'] = float(value)
+    return metrics
@@ -0,0 +1,250 @@
+"""Calibration of LLM judge scores onto the human score scale."""
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional
+
+import numpy as np
+
+CALIBRATION_METHODS = ('quantile', 'isotonic')
+
+_VERSION_PATTERN = re.compile(r'^(?P<name>.+)_v(?P<version>\d+)\.json$')
+
+
+class ScoreCalibrator:
+    """Monotone mapping from LLM judge scores to the human score scale.
+
+    Two fitting methods are supported:
+
+    * ``'quantile'``: quantile mapping, the i-th LLM score quantile is mapped to
+      the i-th human score quantile so calibrated scores follow the human
+      marginal distribution.
+    * ``'isotonic'``: isotonic regression of human on LLM scores, the
+      non-decreasing mapping with least squared error on the labeled pairs.
+
+    Either fit produces a piecewise-linear mapping given by knots, and
+    transform interpolates on the knots directly: a binary search and one
+    linear interpolation per score, O(log k) for k knots. Scores outside the
+    fitted range are clipped to it. Interpolating on the knots reproduces the
+    fitted mapping exactly, including the steep steps between isotonic
+    plateaus.
+    """
+
+    def __init__(
+        self,
+        method: Literal['quantile', 'isotonic'] = 'isotonic',
+        n_quantiles: int = 101
+    ):
+        """
+        Initialize an unfitted calibrator.
+
+        Args:
+            method: Fitting method ('quantile' or 'isotonic')
+            n_quantiles: Number of quantile knots for quantile mapping
+        """
+        if method not in CALIBRATION_METHODS:
+            raise ValueError(f"Unknown calibration method: {method}")
+        self.method = method
+        self.n_quantiles = n_quantiles
+        self.knots_x: Optional[np.ndarray] = None
+        self.knots_y: Optional[np.ndarray] = None
+        self.n_samples = 0
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.knots_x is not None
+
+    def fit(self, llm_scores: np.ndarray, human_scores: np.ndarray) -> 'ScoreCalibrator':
+        """
+        Fit the mapping on labeled pairs.
+
+        Args:
+            llm_scores: LLM judge scores
+            human_scores: Human scores for the same items
+
+        Returns:
+            ScoreCalibrator: self
+        """
+        llm = np.asarray(llm_scores, dtype=float)
+        human = np.asarray(human_scores, dtype=float)
+        if llm.shape != human.shape:
+            raise ValueError("llm_scores and human_scores must have the same length")
+        valid = np.isfinite(llm) & np.isfinite(human)
+        llm, human = llm[valid], human[valid]
+        if llm.size < 2:
+            raise ValueError("At least two labeled pairs are required to fit a calibrator")
+
+        if self.method == 'quantile':
+            probabilities = np.linspace(0, 1, self.n_quantiles)
+            knots_x = np.quantile(llm, probabilities)
+            knots_y = np.quantile(human, probabilities)
+            # Ties in the LLM scores give repeated knots; keep the mean target per knot
+            knots_x, inverse = np.unique(knots_x, return_inverse=True)
+            knots_y = np.bincount(inverse, weights=knots_y) / np.bincount(inverse)
+        else:
+            from sklearn.isotonic import IsotonicRegression
+
+            isotonic = IsotonicRegression(out_of_bounds='clip').fit(llm, human)
+            knots_x, knots_y = isotonic.X_thresholds_, isotonic.y_thresholds_
+
+        self.n_samples = int(llm.size)
+        self._set_knots(knots_x, knots_y)
+        return self
+
+    def _set_knots(self, knots_x: np.ndarray, knots_y: np.ndarray) -> None:
+        """Store the knots of the piecewise-linear mapping."""
+        self.knots_x = np.asarray(knots_x, dtype=float)
+        self.knots_y = np.asarray(knots_y, dtype=float)
+
+    def transform(self, scores: np.ndarray) -> np.ndarray:
+        """
+        Map LLM scores onto the human scale.
+
+        Args:
+            scores: LLM judge scores; NaN stays NaN
+
+        Returns:
+            np.ndarray: Calibrated scores, float64
+        """
+        if not self.is_fitted:
+            raise RuntimeError("Calibrator has not been fitted")
+        # np.interp clips to the end knots and propagates NaN
+        return np.interp(np.asarray(scores, dtype=float), self.knots_x, self.knots_y)
+
+    def transform_stream(
+        self,
+        chunks: Iterable[np.ndarray],
+        chunk_size: Optional[int] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Calibrate an iterable of score batches lazily.
+
+        Args:
+            chunks: Iterable of score arrays, e.g. batches read from a queue or file
+            chunk_size: If given, re-split each batch into pieces of at most this
+                many scores to bound temporary memory
+
+        Yields:
+            np.ndarray: Calibrated scores for each (piece of a) batch
+        """
+        for chunk in chunks:
+            chunk = np.asarray(chunk)
+            if chunk_size is None:
+                yield self.transform(chunk)
+                continue
+            for start in range(0, len(chunk), chunk_size):
+                yield self.transform(chunk[start:start + chunk_size])
+
+    def __call__(self, scores: np.ndarray) -> np.ndarray:
+        return self.transform(scores)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable representation."""
+        if not self.is_fitted:
+            raise RuntimeError("Calibrator has not been fitted")
+        return {
+            'method': self.method,
+            'n_quantiles': self.n_quantiles,
+            'n_samples': self.n_samples,
+            'knots_x': self.knots_x.tolist(),
+            'knots_y': self.knots_y.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScoreCalibrator':
+        calibrator = cls(data['method'], data.get('n_quantiles', 101))
+        calibrator.n_samples = data.get('n_samples', 0)
+        calibrator._set_knots(data['knots_x'], data['knots_y'])
+        return calibrator
+
+
+class CalibratorStore:
+    """Versioned calibrators persisted next to an evaluation's metrics history.
+
+    Calibrators are stored as JSON files ``calibrators/<name>_v<version>.json``
+    in the evaluation type's metrics directory, so every refit gets a new
+    version and earlier mappings stay available for comparison or rollback.
+    """
+
+    def __init__(
+        self,
+        evaluation_type: Literal["answer_advanced", "answer_basic", "question_basic"],
+        output_dir: Optional[str] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            evaluation_type: Type of evaluation the calibrators belong to
+            output_dir: Directory to store calibrators in. If None, uses the
+                calibrators folder next to the evaluation's metrics_history.csv
+        """
+        if output_dir is None:
+            base_path = Path(__file__).parent.parent.parent.parent / 'data' / 'evaluation_metrics'
+            self.output_dir = base_path / evaluation_type / 'calibrators'
+        else:
+            self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def versions(self, name: str) -> List[int]:
+        """Stored versions of calibrator `name`, ascending."""
+        versions = []
+        for path in self.output_dir.glob(f'{name}_v*.json'):
+            match = _VERSION_PATTERN.match(path.name)
+            if match and match.group('name') == name:
+                versions.append(int(match.group('version')))
+        return sorted(versions)
+
+    def save(
+        self,
+        calibrator: ScoreCalibrator,
+        name: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Persist a fitted calibrator as the next version of `name`.
+
+        Args:
+            calibrator: Fitted calibrator
+            name: Calibrator name, e.g. the score column it calibrates
+            metadata: Extra JSON-serializable information to keep with it
+
+        Returns:
+            int: Version number assigned
+        """
+        existing = self.versions(name)
+        version = existing[-1] + 1 if existing else 1
+        payload = {
+            'name': name,
+            'version': version,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'metadata': metadata or {},
+            'calibrator': calibrator.to_dict()
+        }
+        path = self.output_dir / f'{name}_v{version}.json'
+        tmp_path = path.with_suffix('.json.tmp')
+        tmp_path.write_text(json.dumps(payload, indent=2))
+        tmp_path.replace(path)
+        return version
+
+    def load(self, name: str, version: Optional[int] = None) -> ScoreCalibrator:
+        """
+        Load a stored calibrator.
+
+        Args:
+            name: Calibrator name
+            version: Version to load, latest if None
+
+        Returns:
+            ScoreCalibrator: Fitted calibrator
+        """
+        if version is None:
+            existing = self.versions(name)
+            if not existing:
+                raise FileNotFoundError(f"No calibrator named {name!r} in {self.output_dir}")
+            version = existing[-1]
+        path = self.output_dir / f'{name}_v{version}.json'
+        payload = json.loads(path.read_text())
+        return ScoreCalibrator.from_dict(payload['calibrator'])
@@ -2,9 +2,128 @@ import numpy as np
 import pandas as pd
 from scipy import stats
 import matplotlib.pyplot as plt
-import seaborn as sns
 from typing import Dict, Tuple, List, Optional
 
+from .density import BinnedDensity
+
+# Above this sample size ks_2samp switches from the exact to the asymptotic p-value
+_KS_EXACT_MAX_N = 10000
+
+
+class ScoreSummary:
+    """Sorted copy and summary statistics of one score array.
+    
+    The array is sorted once; order statistics (min, max, median, quartiles)
+    are then read off the sorted copy and the moments come from a single pass
+    over the centered values. Every statistic is computed on first access and
+    cached.
+    """
+    
+    def __init__(self, scores: np.ndarray):
+        """Sort the scores.
+        
+        Args:
+            scores: Array of scores
+        """
+        self.sorted = np.sort(np.asarray(scores, dtype=float))
+        self.n = self.sorted.size
+        self._moments: Optional[Tuple[float, float, float, float]] = None
+        self._quantiles: Dict[float, float] = {}
+    
+    def quantile(self, q: float) -> float:
+        """Quantile with linear interpolation, as np.quantile's default."""
+        if q not in self._quantiles:
+            position = q * (self.n - 1)
+            lower = int(np.floor(position))
+            upper = min(lower + 1, self.n - 1)
+            fraction = position - lower
+            self._quantiles[q] = float(self.sorted[lower] + (self.sorted[upper] - self.sorted[lower]) * fraction)
+        return self._quantiles[q]
+    
+    def _central_moments(self) -> Tuple[float, float, float, float]:
+        """Mean and the second to fourth central moments."""
+        if self._moments is None:
+            mean = float(np.mean(self.sorted))
+            centered = self.sorted - mean
+            squared = centered * centered
+            self._moments = (
+                mean,
+                float(np.mean(squared)),
+                float(np.mean(squared * centered)),
+                float(np.mean(squared * squared))
+            )
+        return self._moments
+    
+    @property
+    def mean(self) -> float:
+        return self._central_moments()[0]
+    
+    @property
+    def std(self) -> float:
+        """Population standard deviation (ddof=0), as np.std."""
+        return float(np.sqrt(self._central_moments()[1]))
+    
+    @property
+    def skewness(self) -> float:
+        """Biased sample skewness, as stats.skew."""
+        mean, m2, m3, _ = self._central_moments()
+        if m2 <= (np.finfo(float).eps * mean) ** 2:
+            return np.nan
+        return m3 / m2 ** 1.5
+    
+    @property
+    def kurtosis(self) -> float:
+        """Biased Fisher kurtosis, as stats.kurtosis."""
+        mean, m2, _, m4 = self._central_moments()
+        if m2 <= (np.finfo(float).eps * mean) ** 2:
+            return np.nan
+        return m4 / m2 ** 2 - 3.0
+    
+    @property
+    def min(self) -> float:
+        return float(self.sorted[0])
+    
+    @property
+    def max(self) -> float:
+        return float(self.sorted[-1])
+    
+    @property
+    def median(self) -> float:
+        return self.quantile(0.5)
+    
+    @property
+    def iqr(self) -> float:
+        return self.quantile(0.75) - self.quantile(0.25)
+
+
+def ks_2samp_sorted(sorted1: np.ndarray, sorted2: np.ndarray) -> Tuple[float, float]:
+    """Two-sided two-sample KS test on arrays that are already sorted.
+    
+    Small samples defer to stats.ks_2samp for its exact p-value (re-sorting a
+    sorted array is cheap). Larger samples compute the statistic directly from
+    the empirical CDFs and use the same asymptotic p-value as scipy.
+    
+    Args:
+        sorted1: First sample, sorted ascending
+        sorted2: Second sample, sorted ascending
+        
+    Returns:
+        Tuple of (statistic, pvalue)
+    """
+    n1, n2 = sorted1.size, sorted2.size
+    if max(n1, n2) <= _KS_EXACT_MAX_N:
+        result = stats.ks_2samp(sorted1, sorted2)
+        return float(result.statistic), float(result.pvalue)
+    
+    data_all = np.concatenate([sorted1, sorted2])
+    cdf_diff = (np.searchsorted(sorted1, data_all, side='right') / n1
+                - np.searchsorted(sorted2, data_all, side='right') / n2)
+    statistic = float(max(cdf_diff.max(), np.clip(-cdf_diff.min(), 0, 1)))
+    m, n = sorted([float(n1), float(n2)], reverse=True)
+    pvalue = float(np.clip(stats.kstwo.sf(statistic, np.round(m * n / (m + n))), 0, 1))
+    return statistic, pvalue
+
+
 class ScoreDistributionAnalyzer:
     """Analyzer for comparing and normalizing LLM and human score distributions."""
     
@@ -17,6 +136,15 @@ class ScoreDistributionAnalyzer:
         """
         self.llm_scores = llm_scores
         self.human_scores = human_scores
+        self._densities: Dict[str, BinnedDensity] = {}
+        self._summaries: Dict[str, ScoreSummary] = {}
+    
+    def _summary(self, which: str) -> ScoreSummary:
+        """Summary of the raw 'llm' or 'human' scores, built on first use."""
+        if which not in self._summaries:
+            scores = self.llm_scores if which == 'llm' else self.human_scores
+            self._summaries[which] = ScoreSummary(scores)
+        return self._summaries[which]
         
     def analyze_distributions(self) -> Dict:
         """Analyze the statistical properties of both score distributions.
@@ -25,24 +153,16 @@ class ScoreDistributionAnalyzer:
             Dict containing distribution analysis results
         """
         # Basic statistics
-        llm_stats = {
-            'mean': np.mean(self.llm_scores),
-            'std': np.std(self.llm_scores),
-            'median': np.median(self.llm_scores),
-            'skewness': stats.skew(self.llm_scores),
-            'kurtosis': stats.kurtosis(self.llm_scores)
-        }
-        
-        human_stats = {
-            'mean': np.mean(self.human_scores),
-            'std': np.std(self.human_scores),
-            'median': np.median(self.human_scores),
-            'skewness': stats.skew(self.human_scores),
-            'kurtosis': stats.kurtosis(self.human_scores)
-        }
+        llm_stats, human_stats = ({
+            'mean': summary.mean,
+            'std': summary.std,
+            'median': summary.median,
+            'skewness': summary.skewness,
+            'kurtosis': summary.kurtosis
+        } for summary in (self._summary('llm'), self._summary('human')))
         
         # Distribution tests
-        ks_statistic, ks_pvalue = stats.ks_2samp(self.llm_scores, self.human_scores)
+        ks_statistic, ks_pvalue = ks_2samp_sorted(self._summary('llm').sorted, self._summary('human').sorted)
         
         return {
             'llm_stats': llm_stats,
@@ -53,29 +173,47 @@ class ScoreDistributionAnalyzer:
             }
         }
     
-    def normalize_scores(self, method: str = 'zscore') -> Tuple[np.ndarray, np.ndarray]:
-        """Normalize both score distributions using specified method.
+    def _normalization_params(self, which: str, method: str) -> Tuple[float, float]:
+        """Shift and scale such that the normalized scores are (scores - shift) / scale.
         
         Args:
+            which: 'llm' or 'human'
             method: Normalization method ('zscore', 'minmax', or 'robust')
             
         Returns:
-            Tuple of normalized (llm_scores, human_scores)
+            Tuple of (shift, scale)
         """
+        summary = self._summary(which)
         if method == 'zscore':
-            llm_norm = stats.zscore(self.llm_scores)
-            human_norm = stats.zscore(self.human_scores)
+            return summary.mean, summary.std
         elif method == 'minmax':
-            llm_norm = (self.llm_scores - np.min(self.llm_scores)) / (np.max(self.llm_scores) - np.min(self.llm_scores))
-            human_norm = (self.human_scores - np.min(self.human_scores)) / (np.max(self.human_scores) - np.min(self.human_scores))
+            return summary.min, summary.max - summary.min
         elif method == 'robust':
-            llm_norm = (self.llm_scores - np.median(self.llm_scores)) / stats.iqr(self.llm_scores)
-            human_norm = (self.human_scores - np.median(self.human_scores)) / stats.iqr(self.human_scores)
-        else:
-            raise ValueError(f"Unknown normalization method: {method}")
+            return summary.median, summary.iqr
+        raise ValueError(f"Unknown normalization method: {method}")
+    
+    def normalize_scores(self, method: str = 'zscore') -> Tuple[np.ndarray, np.ndarray]:
+        """Normalize both score distributions using specified method.
+        
+        Args:
+            method: Normalization method ('zscore', 'minmax', or 'robust')
             
+        Returns:
+            Tuple of normalized (llm_scores, human_scores)
+        """
+        llm_shift, llm_scale = self._normalization_params('llm', method)
+        human_shift, human_scale = self._normalization_params('human', method)
+        llm_norm = (np.asarray(self.llm_scores) - llm_shift) / llm_scale
+        human_norm = (np.asarray(self.human_scores) - human_shift) / human_scale
         return llm_norm, human_norm
     
+    def _density(self, which: str) -> BinnedDensity:
+        """Binned density of the raw 'llm' or 'human' scores, built on first use."""
+        if which not in self._densities:
+            scores = self.llm_scores if which == 'llm' else self.human_scores
+            self._densities[which] = BinnedDensity(scores)
+        return self._densities[which]
+    
     def plot_distributions(self, 
                          output_path: str,
                          normalized: bool = False,
@@ -83,22 +221,27 @@ class ScoreDistributionAnalyzer:
                          title: Optional[str] = None) -> None:
         """Plot the score distributions.
         
+        Densities are computed once per score array from a binned histogram and
+        reused for every normalization method.
+        
         Args:
             output_path: Path to save the plot
             normalized: Whether to plot normalized scores
             method: Normalization method if normalized=True
             title: Optional plot title
         """
-        if normalized:
-            llm_scores, human_scores = self.normalize_scores(method)
-            score_label = f'Normalized Score ({method})'
-        else:
-            llm_scores, human_scores = self.llm_scores, self.human_scores
-            score_label = 'Raw Score'
+        curves = {}
+        for which, label in (('llm', 'LLM Scores'), ('human', 'Human Scores')):
+            density = self._density(which)
+            if normalized:
+                curves[label] = density.transformed(*self._normalization_params(which, method))
+            else:
+                curves[label] = density.kde()
+        score_label = f'Normalized Score ({method})' if normalized else 'Raw Score'
             
         plt.figure(figsize=(10, 6))
-        sns.kdeplot(data=llm_scores, label='LLM Scores')
-        sns.kdeplot(data=human_scores, label='Human Scores')
+        for label, (grid, values) in curves.items():
+            plt.plot(grid, values, label=label)
         plt.xlabel(score_label)
         plt.ylabel('Density')
         plt.title(title or ('Normalized Score Distribution' if normalized else 'Raw Score Distribution'))
@@ -109,18 +252,33 @@ class ScoreDistributionAnalyzer:
     def get_normalization_differences(self, method: str = 'zscore') -> Dict:
         """Calculate differences between normalized distributions.
         
+        Normalization is an increasing affine map, so the normalized statistics
+        follow from the cached raw ones and the normalized sorted arrays are the
+        raw sorted arrays mapped the same way.
+        
         Args:
             method: Normalization method to use
             
         Returns:
             Dict containing difference metrics
         """
-        llm_norm, human_norm = self.normalize_scores(method)
+        normalized = {}
+        for which in ('llm', 'human'):
+            summary = self._summary(which)
+            shift, scale = self._normalization_params(which, method)
+            normalized[which] = {
+                'mean': (summary.mean - shift) / scale,
+                'std': summary.std / scale,
+                'median': (summary.median - shift) / scale,
+                'range': (summary.max - summary.min) / scale,
+                'sorted': (summary.sorted - shift) / scale
+            }
+        llm_norm, human_norm = normalized['llm'], normalized['human']
         
         return {
-            'mean_diff': np.mean(llm_norm) - np.mean(human_norm),
-            'std_diff': np.std(llm_norm) - np.std(human_norm),
-            'median_diff': np.median(llm_norm) - np.median(human_norm),
-            'range_diff': (np.max(llm_norm) - np.min(llm_norm)) - (np.max(human_norm) - np.min(human_norm)),
-            'ks_statistic': stats.ks_2samp(llm_norm, human_norm).statistic
-        } 
\ No newline at end of file
+            'mean_diff': llm_norm['mean'] - human_norm['mean'],
+            'std_diff': llm_norm['std'] - human_norm['std'],
+            'median_diff': llm_norm['median'] - human_norm['median'],
+            'range_diff': llm_norm['range'] - human_norm['range'],
+            'ks_statistic': ks_2samp_sorted(llm_norm['sorted'], human_norm['sorted'])[0]
+        }
@@ -0,0 +1,53 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from llm_as_judge.answer_evaluation import ANSWER_METRICS, AnswerEvaluationAnalyzer
+
+SAMPLE = Path(__file__).parent.parent / "data" / "llm_judge_answer_evaluation_sample.csv"
+
+def reference_quality(data, min_score):
+    """Per-metric high-quality counts as computed before the fused pass"""
+    result = {}
+    for metric in ANSWER_METRICS:
+        llm_ok = data[f"LLM {metric}"] >= min_score
+        human_ok = data[f"Human {metric}"] >= min_score
+        both = data[llm_ok & human_ok]
+        result[metric] = {
+            "llm_count": int(llm_ok.sum()),
+            "human_count": int(human_ok.sum()),
+            "agreement_count": len(both),
+            "example_answers": both["Answer"].tolist()[:3]
+        }
+    return result
+
+class TestAnswerEvaluationAnalyzer:
+    @pytest.fixture(scope="class")
+    def data(self):
+        return pd.read_csv(SAMPLE)
+
+    @pytest.fixture(scope="class")
+    def analyzer(self):
+        return AnswerEvaluationAnalyzer(SAMPLE, chunk_rows=7)
+
+    def test_quality_counts_match_reference_at_observed_thresholds(self, data, analyzer):
+        scores = data[[f"{e} {m}" for m in ANSWER_METRICS for e in ("LLM", "Human")]].to_numpy().ravel()
+        thresholds = sorted(set(np.round(scores, 6)) | {3.3, 4.0})
+        for min_score in thresholds:
+            assert analyzer.analyze_answer_quality(min_score) == reference_quality(data, min_score), min_score
+
+    def test_exact_threshold_keeps_tied_rows(self, data, analyzer):
+        quality = analyzer.analyze_answer_quality(3.3)
+        assert quality["Readiness"]["llm_count"] == int((data["LLM Readiness"] >= 3.3).sum())
+        assert (data["LLM Readiness"] == 3.3).any()
+
+    def test_statistics_and_agreement_match_pandas(self, data, analyzer):
+        stats = analyzer.get_score_statistics()
+        agreement = analyzer.calculate_agreement().set_index("Metric")
+        for metric in ANSWER_METRICS:
+            for evaluator in ("LLM", "Human"):
+                column = f"{evaluator} {metric}"
+                np.testing.assert_allclose(stats[column], data[column].describe(), rtol=1e-6)
+            llm, human = data[f"LLM {metric}"], data[f"Human {metric}"]
+            assert agreement.loc[metric, "Correlation"] == pytest.approx(llm.corr(human), rel=1e-5)
+            assert agreement.loc[metric, "MAE"] == pytest.approx((llm - human).abs().mean(), rel=1e-5)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from sklearn.isotonic import IsotonicRegression
+from llm_as_judge.score_analysis.calibration import CalibratorStore, ScoreCalibrator
+
+def make_scores(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    llm = np.round(rng.uniform(0, 1, n), 3)
+    human = np.clip(llm ** 2 + rng.normal(0, 0.1, n), 0, 1)
+    return llm, human
+
+class TestScoreCalibrator:
+    def test_isotonic_transform_matches_sklearn(self):
+        llm, human = make_scores()
+        calibrator = ScoreCalibrator('isotonic').fit(llm, human)
+        isotonic = IsotonicRegression(out_of_bounds='clip').fit(llm, human)
+        grid = np.concatenate([np.linspace(-0.5, 1.5, 20001), llm])
+        np.testing.assert_allclose(calibrator.transform(grid), isotonic.predict(grid), rtol=0, atol=1e-12)
+
+    def test_quantile_mapping_and_missing_scores(self):
+        llm, human = make_scores(seed=1)
+        calibrator = ScoreCalibrator('quantile', n_quantiles=11).fit(llm, human)
+        calibrated = calibrator.transform(np.array([np.nan, llm.min(), llm.max()]))
+        assert np.isnan(calibrated[0])
+        assert calibrated[1:] == pytest.approx([human.min(), human.max()])
+
+    def test_stored_calibrator_round_trips(self, tmp_path):
+        llm, human = make_scores(seed=2)
+        calibrator = ScoreCalibrator('isotonic').fit(llm, human)
+        store = CalibratorStore('question_basic', output_dir=str(tmp_path))
+        assert store.save(calibrator, 'score') == 1
+        loaded = store.load('score')
+        np.testing.assert_array_equal(loaded.transform(llm), calibrator.transform(llm))
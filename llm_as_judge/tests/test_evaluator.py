@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+from loguru import logger
+from llm_as_judge.core.evaluator import LLMJudgeEvaluator
+
+def make_frame(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    human = rng.uniform(0, 1, n)
+    return pd.DataFrame({
+        'Ground Truth Question': [f"question {i}" for i in range(n)],
+        'LLM Generated Question': [" ".join(["word"] * int(k)) for k in rng.integers(3, 20, n)],
+        'Human Evaluation Score': human,
+        'LLM Generated Score': np.clip(human + rng.normal(0, 0.1, n), 0, 1)
+    })
+
+class TestEvaluateApproximate:
+    def test_bootstrap_estimates_match_full_sample(self):
+        evaluator = LLMJudgeEvaluator(make_frame())
+        approx = evaluator.evaluate_approximate(sample_size=400, n_bootstrap=50, random_state=0)
+        exact = evaluator._point_metrics()
+        for name, value in exact.items():
+            assert approx[name]['estimate'] == value
+            assert approx[name]['ci_lower'] <= approx[name]['ci_upper']
+
+    def test_keeps_caller_logging_state(self):
+        records = []
+        sink = logger.add(records.append, level="DEBUG")
+        try:
+            evaluator = LLMJudgeEvaluator(make_frame())
+            logger.disable("llm_as_judge")
+            try:
+                records.clear()
+                evaluator.evaluate_approximate(sample_size=100, n_bootstrap=5, random_state=0)
+                LLMJudgeEvaluator(make_frame())
+                assert records == []
+            finally:
+                logger.enable("llm_as_judge")
+            evaluator.evaluate_approximate(sample_size=100, n_bootstrap=5, random_state=0)
+            assert len(records) == 1
+        finally:
+            logger.remove(sink)
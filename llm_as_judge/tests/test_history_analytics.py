@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from llm_as_judge.metrics.history_analytics import DriftMonitor, MetricsHistory
+from llm_as_judge.metrics.metrics_recorder import MetricsRecorder
+
+def kappa_records(values):
+    return [{"cohen_kappa": float(v)} for v in values]
+
+class TestDriftMonitor:
+    def test_false_alarm_rate_on_stationary_metrics(self):
+        alarms = 0
+        for seed in range(10):
+            rng = np.random.default_rng(seed)
+            alarms += len(DriftMonitor().update_many(kappa_records(rng.normal(0.8, 0.05, 2000))))
+        assert alarms / 20000 < 0.005
+
+    def test_detection_delay_after_a_shift(self):
+        delays = []
+        for seed in range(10):
+            rng = np.random.default_rng(100 + seed)
+            values = np.concatenate([rng.normal(0.8, 0.02, 100), rng.normal(0.6, 0.02, 100)])
+            alerts = [a for a in DriftMonitor().update_many(kappa_records(values)) if a.record >= 100]
+            delays.append(alerts[0].record - 100 if alerts and alerts[0].direction == 'decrease' else None)
+        assert sum(delay is not None and delay <= 2 for delay in delays) >= 9
+
+    def test_saved_monitor_continues_like_the_original(self, tmp_path):
+        rng = np.random.default_rng(7)
+        records = kappa_records(np.concatenate([rng.normal(0.8, 0.02, 60), rng.normal(0.6, 0.02, 60)]))
+        original = DriftMonitor(window=5)
+        original.update_many(records[:50])
+        original.save(tmp_path / "monitor.json")
+        restored = DriftMonitor.load(tmp_path / "monitor.json")
+        assert restored.update_many(records[50:]) == original.update_many(records[50:])
+        pd.testing.assert_frame_equal(restored.rolling_summary(), original.rolling_summary())
+
+class TestMetricsHistory:
+    def test_refresh_reads_only_new_rows(self, tmp_path):
+        recorder = MetricsRecorder("answer_basic", output_path=str(tmp_path / "metrics_history.csv"))
+        for i in range(3):
+            recorder.record_metrics({"cohen_kappa": 0.5 + i / 10, "notes": "run"})
+        history = MetricsHistory(recorder.output_path)
+        assert len(history.refresh()) == 3
+        assert list(history.data.columns) == ["cohen_kappa"]
+
+        for i in range(2):
+            recorder.record_metrics({"cohen_kappa": 0.9 + i / 100, "notes": "run"})
+        new_rows = history.refresh()
+        assert new_rows["cohen_kappa"].tolist() == pytest.approx([0.9, 0.91])
+        assert len(history.data) == 5
+        assert history.refresh().empty
+
+        recorder.record_metrics({"cohen_kappa": 0.7, "exact_match": 0.4})
+        assert len(history.refresh()) == 6
+        assert history.data["exact_match"].count() == 1
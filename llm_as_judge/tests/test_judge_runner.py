@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+from llm_as_judge.judge.cache import JudgeCache
+from llm_as_judge.judge.prompts import ANSWER_TEMPLATES, QUESTION_TEMPLATE
+from llm_as_judge.judge.runner import JudgeRunner, JudgeRunnerConfig
+from llm_as_judge.judge.stub_server import StubJudgeServer, stub_score
+
+def make_answers(n_distinct=6, repeats=3):
+    rows = [{"Chunk": f"context {i}", "Question": f"question {i}", "Answer": f"answer {i}"} for i in range(n_distinct)]
+    return pd.DataFrame(rows * repeats)
+
+def make_config(server, **options):
+    return JudgeRunnerConfig(base_url=server.base_url, max_concurrency=4, backoff_base=0.001,
+                             backoff_max=0.01, max_retries=20, **options)
+
+def expected_scores(df, template):
+    return [stub_score(template.render(dict(zip(template.input_columns, row))))
+            for row in df[list(template.input_columns)].itertuples(index=False)]
+
+class TestJudgeRunner:
+    @pytest.mark.parametrize("failures", [{"failure_rate": 0.3}, {"server_error_rate": 0.3}])
+    def test_retries_rate_limits_and_server_errors(self, failures):
+        df = make_answers()
+        with StubJudgeServer(seed=1, **failures) as server:
+            runner = JudgeRunner(make_config(server))
+            scored = runner.score_answers(df, metrics=["Relevance"])
+            assert server.request_count > len(df.drop_duplicates())
+        assert runner.failed_requests == 0
+        assert scored["LLM Relevance"].tolist() == pytest.approx(expected_scores(df, ANSWER_TEMPLATES["Relevance"]))
+
+    def test_malformed_responses_do_not_abort_the_run(self):
+        df = make_answers(n_distinct=20, repeats=1)
+        with StubJudgeServer(seed=2, malformed_rate=0.4) as server:
+            runner = JudgeRunner(make_config(server))
+            scored = runner.score_answers(df, metrics=["Relevance"])
+        scores = scored["LLM Relevance"]
+        expected = pd.Series(expected_scores(df, ANSWER_TEMPLATES["Relevance"]))
+        assert 0 < runner.failed_requests == scores.isna().sum() < len(df)
+        assert scores.dropna().tolist() == pytest.approx(expected[scores.notna()].tolist())
+
+    def test_one_output_column_per_template(self):
+        df = make_answers(repeats=1)
+        with StubJudgeServer() as server:
+            scored = JudgeRunner(make_config(server)).score_answers(df)
+        for metric, template in ANSWER_TEMPLATES.items():
+            assert scored[f"LLM {metric}"].tolist() == pytest.approx(expected_scores(df, template))
+        assert list(scored.columns[:3]) == list(df.columns)
+
+    def test_duplicate_prompts_are_scored_once(self):
+        df = make_answers(n_distinct=5, repeats=4)
+        with StubJudgeServer() as server:
+            scored = JudgeRunner(make_config(server)).score_answers(df, metrics=["Readiness", "Completeness"])
+            assert server.request_count == 5 * 2
+        for column in ["LLM Readiness", "LLM Completeness"]:
+            assert scored.groupby("Answer")[column].nunique().eq(1).all()
+            assert scored[column].notna().all()
+
+    def test_warm_cache_sends_no_requests(self, tmp_path):
+        df = pd.DataFrame({"Ground Truth Question": [f"q{i}" for i in range(8)],
+                           "LLM Generated Question": [f"g{i}" for i in range(8)]})
+        with JudgeCache(tmp_path / "cache.sqlite") as cache:
+            with StubJudgeServer() as server:
+                first = JudgeRunner(make_config(server), cache=cache).score_questions(df)
+                assert server.request_count == len(df)
+            with StubJudgeServer() as server:
+                second = JudgeRunner(make_config(server), cache=cache).score_questions(df)
+                assert server.request_count == 0
+        assert second["LLM Generated Score"].tolist() == first["LLM Generated Score"].tolist()
+        assert first["LLM Generated Score"].tolist() == pytest.approx(expected_scores(df, QUESTION_TEMPLATE))
+
+    def test_completed_batches_are_cached_before_a_crash(self, tmp_path):
+        df = make_answers(n_distinct=10, repeats=1)
+        with JudgeCache(tmp_path / "cache.sqlite") as cache:
+            with StubJudgeServer() as server:
+                runner = JudgeRunner(make_config(server, batch_size=4), cache=cache)
+                request_score = runner._request_score
+                calls = []
+
+                async def crash_in_third_batch(*args):
+                    calls.append(1)
+                    if len(calls) > 8:
+                        raise RuntimeError("interrupted")
+                    return await request_score(*args)
+
+                runner._request_score = crash_in_third_batch
+                with pytest.raises(RuntimeError):
+                    runner.score_answers(df, metrics=["Relevance"])
+            assert len(cache) == 8
+
+            with StubJudgeServer() as server:
+                scored = JudgeRunner(make_config(server, batch_size=4), cache=cache).score_answers(df, metrics=["Relevance"])
+                assert server.request_count == 2
+        assert scored["LLM Relevance"].tolist() == pytest.approx(expected_scores(df, ANSWER_TEMPLATES["Relevance"]))
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from llm_as_judge.metrics.lexical_overlap import lexical_overlap
+
+nltk_bleu = pytest.importorskip("nltk.translate.bleu_score")
+
+def make_pairs(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    words = [f"w{i}" for i in range(8)]
+    answers = [" ".join(rng.choice(words, rng.integers(1, 9))) for _ in range(n)]
+    references = [" ".join(rng.choice(words, rng.integers(1, 9))) for _ in range(n)]
+    return answers, references
+
+class TestLexicalOverlap:
+    def test_bleu_matches_nltk_method2(self):
+        answers, references = make_pairs()
+        smoothing = nltk_bleu.SmoothingFunction().method2
+        expected = [nltk_bleu.sentence_bleu([r.split()], a.split(), smoothing_function=smoothing)
+                    for a, r in zip(answers, references)]
+        np.testing.assert_allclose(lexical_overlap(answers, references)['bleu'], expected, rtol=1e-9, atol=1e-12)
+
+    def test_one_token_exact_match(self):
+        bleu = lexical_overlap(["paris"], ["paris"])['bleu'].iloc[0]
+        assert bleu == pytest.approx(0.5 ** 0.75)
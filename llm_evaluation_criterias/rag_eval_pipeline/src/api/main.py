@@ -1,13 +1,22 @@
+import os
+import re
+from pathlib import Path
 from fastapi import FastAPI, HTTPException
-from typing import List
+from typing import List, Optional
 from ..utils.data_types import (
     SearchQuery,
     RetrievalResult,
     EvaluationResult,
     BatchEvaluationResult,
+    ComparisonResult,
+    GenerationSample,
     MetricResult
 )
+from ..jobs.checkpoint import CheckpointedEvaluationJob
+from ..jobs.queue import ShardQueue
+from ..metrics.generation_metrics import GenerationMetrics
 from ..metrics.retrieval_metrics import RetrievalMetrics
+from ..models.registry import ModelRegistry
 
 app = FastAPI(
     title="RAG Evaluation Pipeline",
@@ -15,18 +24,47 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Initialize metrics
-metrics = RetrievalMetrics()
+# Encoders are loaded on demand and shared across worker threads
+registry = ModelRegistry.from_env()
+
+# Batch requests that carry a job_id are checkpointed here and resume when retried
+CHECKPOINT_ROOT = Path(os.getenv("RAG_EVAL_CHECKPOINT_DIR", "checkpoints"))
+JOB_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+# Shard queue shared with `python -m src.jobs.worker` processes
+QUEUE_PATH = os.getenv("RAG_EVAL_QUEUE_PATH", "evaluation_queue.db")
+_queue: Optional[ShardQueue] = None
+
+def get_queue() -> ShardQueue:
+    global _queue
+    if _queue is None:
+        _queue = ShardQueue(QUEUE_PATH)
+    return _queue
+
+def load_model(model_name: Optional[str] = None):
+    """Shared encoder for model_name; unknown, disallowed or unloadable models are a 400"""
+    try:
+        return registry.get(model_name)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Model '{model_name}' could not be loaded: {e}")
+
+def get_metrics(model_name: Optional[str] = None) -> RetrievalMetrics:
+    """Build a RetrievalMetrics bound to the registry's shared encoder"""
+    model = load_model(model_name)
+    return RetrievalMetrics(model_name=model_name or registry.default_model, model=model)
 
 @app.get("/")
 async def root():
     return {"message": "RAG Evaluation Pipeline API"}
 
 @app.post("/evaluate/single", response_model=EvaluationResult)
-async def evaluate_single_query(query: SearchQuery, result: RetrievalResult):
+def evaluate_single_query(query: SearchQuery, result: RetrievalResult, model_name: Optional[str] = None):
     """
     Evaluate a single query-result pair using multiple retrieval metrics
     """
+    metrics = get_metrics(model_name)
     try:
         evaluation_metrics = metrics.evaluate_retrieval(query, result)
         average_score = sum(m.score for m in evaluation_metrics) / len(evaluation_metrics)
@@ -40,9 +78,13 @@ async def evaluate_single_query(query: SearchQuery, result: RetrievalResult):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/evaluate/batch", response_model=BatchEvaluationResult)
-async def evaluate_batch(queries: List[SearchQuery], results: List[RetrievalResult]):
+def evaluate_batch(queries: List[SearchQuery], results: List[RetrievalResult], model_name: Optional[str] = None,
+                   job_id: Optional[str] = None, chunk_size: int = 1000):
     """
     Evaluate multiple query-result pairs and provide aggregated metrics
+    
+    With a job_id, results are checkpointed per chunk under RAG_EVAL_CHECKPOINT_DIR
+    and a retried request resumes from the last completed chunk.
     """
     if len(queries) != len(results):
         raise HTTPException(
@@ -50,6 +92,18 @@ async def evaluate_batch(queries: List[SearchQuery], results: List[RetrievalResu
             detail="Number of queries must match number of results"
         )
     
+    metrics = get_metrics(model_name)
+    if job_id is not None:
+        if not JOB_ID_PATTERN.match(job_id) or job_id.strip(".") == "":
+            raise HTTPException(status_code=400, detail="job_id may only contain letters, digits, '_', '-' and '.'")
+        try:
+            job = CheckpointedEvaluationJob(CHECKPOINT_ROOT / job_id, metrics, chunk_size=chunk_size)
+            job.run(queries, results)
+            return job.batch_result()
+        except ValueError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
     try:
         evaluation_results = []
         metric_sums = {}
@@ -92,6 +146,97 @@ async def evaluate_batch(queries: List[SearchQuery], results: List[RetrievalResu
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/evaluate/compare", response_model=ComparisonResult)
+def compare_systems(
+    queries: List[SearchQuery],
+    results_a: List[RetrievalResult],
+    results_b: List[RetrievalResult],
+    model_name: Optional[str] = None,
+    n_permutations: int = 10000,
+    n_bootstrap: int = 2000,
+    random_state: Optional[int] = None
+):
+    """
+    Compare two retrieval systems on the same queries with paired significance tests
+    """
+    metrics = get_metrics(model_name)
+    try:
+        return metrics.compare_retrieval(
+            queries, results_a, results_b,
+            n_permutations=n_permutations,
+            n_bootstrap=n_bootstrap,
+            random_state=random_state
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/evaluate/generation", response_model=List[EvaluationResult])
+def evaluate_generation(samples: List[GenerationSample], model_name: Optional[str] = None,
+                        support_threshold: float = 0.6):
+    """
+    Score generated answers for faithfulness, context utilization and answer relevance
+    """
+    model = load_model(model_name)
+    try:
+        return GenerationMetrics(model=model, support_threshold=support_threshold).evaluate_batch(samples)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/jobs")
+def submit_job(
+    job_id: str,
+    queries: List[SearchQuery],
+    results: List[RetrievalResult],
+    model_name: Optional[str] = None,
+    shard_size: int = 1000,
+    k: int = 5
+):
+    """
+    Queue a batch evaluation as shards for distributed workers
+    """
+    if not registry.is_allowed(model_name):
+        raise HTTPException(status_code=400, detail=f"Model '{model_name}' is not in the allowed model list")
+    try:
+        n_shards = get_queue().submit(job_id, queries, results, shard_size, k, model_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"job_id": job_id, "n_shards": n_shards}
+
+@app.get("/jobs/{job_id}")
+def get_job_progress(job_id: str):
+    """
+    Shard counts per status for a queued job
+    """
+    try:
+        return {"job_id": job_id, "shards": get_queue().progress(job_id)}
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/jobs/{job_id}/result", response_model=BatchEvaluationResult)
+def get_job_result(job_id: str):
+    """
+    Merged results of a job whose shards are all done
+    """
+    try:
+        return get_queue().collect(job_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@app.get("/models")
+async def get_loaded_models():
+    """
+    List the encoders currently resident in the model registry
+    """
+    return {
+        "default_model": registry.default_model,
+        "memory_budget_mb": registry.memory_budget_bytes / (1024 * 1024),
+        "loaded_models": registry.loaded_models()
+    }
+
 @app.get("/metrics/available")
 async def get_available_metrics():
     """
@@ -122,6 +267,18 @@ async def get_available_metrics():
             {
                 "name": "keyword_coverage",
                 "description": "Proportion of query keywords found in retrieved documents"
+            },
+            {
+                "name": "faithfulness",
+                "description": "Mean support of answer sentences by their closest retrieved context sentence"
+            },
+            {
+                "name": "context_utilization",
+                "description": "Proportion of retrieved context sentences that support the answer"
+            },
+            {
+                "name": "answer_relevance",
+                "description": "Average semantic similarity between the answer sentences and the query"
             }
         ]
     }
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from ..utils.data_types import BatchEvaluationResult, EvaluationResult, RetrievalResult, SearchQuery
+
+MANIFEST_FILE = 'manifest.json'
+STATE_FILE = 'state.json'
+CHUNKS_DIR = 'chunks'
+
+
+def atomic_write(path: Path, text: str) -> None:
+    """Write a file so readers see either the old or the new content, never a partial one"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if hasattr(os, 'O_DIRECTORY'):
+        # Persist the rename itself
+        fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class MetricAggregator:
+    """Running per-metric count, sum, min and max of EvaluationResults
+
+    Serializes to plain JSON (floats round-trip exactly), so a restored
+    aggregator continues with bit-identical sums.
+    """
+
+    def __init__(self):
+        self.n_results = 0
+        self.average_score_sum = 0.0
+        self.counts: Dict[str, int] = {}
+        self.sums: Dict[str, float] = {}
+        self.minimums: Dict[str, float] = {}
+        self.maximums: Dict[str, float] = {}
+
+    def add(self, result: EvaluationResult) -> None:
+        self.n_results += 1
+        self.average_score_sum += result.average_score
+        for metric in result.metrics:
+            name, score = metric.metric_name, metric.score
+            if name not in self.counts:
+                self.counts[name], self.sums[name] = 0, 0.0
+                self.minimums[name], self.maximums[name] = score, score
+            self.counts[name] += 1
+            self.sums[name] += score
+            self.minimums[name] = min(self.minimums[name], score)
+            self.maximums[name] = max(self.maximums[name], score)
+
+    def merge(self, other: "MetricAggregator") -> "MetricAggregator":
+        """Fold another aggregator (e.g. from another shard) into this one"""
+        self.n_results += other.n_results
+        self.average_score_sum += other.average_score_sum
+        for name, count in other.counts.items():
+            if name not in self.counts:
+                self.counts[name], self.sums[name] = 0, 0.0
+                self.minimums[name], self.maximums[name] = other.minimums[name], other.maximums[name]
+            self.counts[name] += count
+            self.sums[name] += other.sums[name]
+            self.minimums[name] = min(self.minimums[name], other.minimums[name])
+            self.maximums[name] = max(self.maximums[name], other.maximums[name])
+        return self
+
+    def metric_averages(self) -> Dict[str, float]:
+        return {name: self.sums[name] / self.counts[name] for name in self.counts}
+
+    def overall_average(self) -> float:
+        return self.average_score_sum / self.n_results if self.n_results else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "n_results": self.n_results,
+            "average_score_sum": self.average_score_sum,
+            "counts": self.counts,
+            "sums": self.sums,
+            "minimums": self.minimums,
+            "maximums": self.maximums
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "MetricAggregator":
+        aggregator = cls()
+        aggregator.n_results = data["n_results"]
+        aggregator.average_score_sum = data["average_score_sum"]
+        aggregator.counts = dict(data["counts"])
+        aggregator.sums = dict(data["sums"])
+        aggregator.minimums = dict(data["minimums"])
+        aggregator.maximums = dict(data["maximums"])
+        return aggregator
+
+
+def evaluate_pair(metrics, query: SearchQuery, result: RetrievalResult, k: int = 5) -> EvaluationResult:
+    """Score one query-result pair as the /evaluate endpoints do"""
+    metric_results = metrics.evaluate_retrieval(query, result, k)
+    return EvaluationResult(
+        query_id=query.query_id,
+        metrics=metric_results,
+        average_score=sum(m.score for m in metric_results) / len(metric_results)
+    )
+
+
+class CheckpointedEvaluationJob:
+    """Chunked evaluation that survives restarts
+
+    Test cases are evaluated chunk by chunk. After every chunk, its
+    EvaluationResults are written to chunks/chunk_<n>.jsonl and the running
+    MetricAggregator plus the number of completed chunks to state.json, both
+    atomically (write to a temporary file, fsync, rename). Running the job
+    again with the same checkpoint directory and inputs skips the completed
+    chunks and produces the same final output as an uninterrupted run. A
+    manifest fingerprints the serialized test cases, their retrieved
+    results, the metrics' model_name and the settings, so a checkpoint is
+    never resumed against different inputs or a different encoder.
+    """
+
+    def __init__(self, checkpoint_dir: Union[str, Path], metrics, chunk_size: int = 1000, k: int = 5):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.chunks_dir = self.checkpoint_dir / CHUNKS_DIR
+        self.metrics = metrics
+        self.chunk_size = chunk_size
+        self.k = k
+
+    def _chunk_path(self, chunk: int) -> Path:
+        return self.chunks_dir / f"chunk_{chunk:06d}.jsonl"
+
+    def _manifest(self, queries: Sequence[SearchQuery], results: Sequence[RetrievalResult]) -> Dict:
+        digest = hashlib.sha256()
+        for query, result in zip(queries, results):
+            digest.update(query.model_dump_json().encode())
+            digest.update(b'\0')
+            digest.update(result.model_dump_json().encode())
+            digest.update(b'\0')
+        return {
+            "n_cases": len(queries),
+            "chunk_size": self.chunk_size,
+            "k": self.k,
+            "model_name": getattr(self.metrics, "model_name", None),
+            "inputs_sha256": digest.hexdigest()
+        }
+
+    def _load_state(self, manifest: Dict) -> Dict:
+        manifest_path = self.checkpoint_dir / MANIFEST_FILE
+        if manifest_path.exists():
+            with open(manifest_path) as f:
+                saved = json.load(f)
+            if saved != manifest:
+                raise ValueError(f"Checkpoint in {self.checkpoint_dir} was created for different inputs")
+        else:
+            self.chunks_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write(manifest_path, json.dumps(manifest, indent=2))
+        state_path = self.checkpoint_dir / STATE_FILE
+        if state_path.exists():
+            with open(state_path) as f:
+                return json.load(f)
+        return {"completed_chunks": 0, "aggregate": MetricAggregator().to_dict()}
+
+    def run(self, queries: Sequence[SearchQuery], results: Sequence[RetrievalResult],
+            on_chunk: Optional[Callable[[int, int], None]] = None) -> MetricAggregator:
+        """Evaluate every pair not yet checkpointed and return the final aggregate
+
+        on_chunk(completed_chunks, n_chunks) is called after each chunk is persisted.
+        """
+        if len(queries) != len(results):
+            raise ValueError("Number of queries must match number of results")
+        state = self._load_state(self._manifest(queries, results))
+        aggregator = MetricAggregator.from_dict(state["aggregate"])
+        n_chunks = -(-len(queries) // self.chunk_size)
+
+        for chunk in range(state["completed_chunks"], n_chunks):
+            start = chunk * self.chunk_size
+            end = min(start + self.chunk_size, len(queries))
+            chunk_results = [evaluate_pair(self.metrics, queries[i], results[i], self.k) for i in range(start, end)]
+            for evaluation in chunk_results:
+                aggregator.add(evaluation)
+            # The chunk file goes first: a crash in between only means it is recomputed
+            atomic_write(self._chunk_path(chunk), "".join(r.model_dump_json() + "\n" for r in chunk_results))
+            atomic_write(self.checkpoint_dir / STATE_FILE, json.dumps({
+                "completed_chunks": chunk + 1,
+                "aggregate": aggregator.to_dict()
+            }))
+            if on_chunk is not None:
+                on_chunk(chunk + 1, n_chunks)
+        return aggregator
+
+    def iter_results(self) -> Iterator[EvaluationResult]:
+        """Stream the checkpointed EvaluationResults in input order"""
+        with open(self.checkpoint_dir / STATE_FILE) as f:
+            completed = json.load(f)["completed_chunks"]
+        for chunk in range(completed):
+            with open(self._chunk_path(chunk)) as f:
+                for line in f:
+                    yield EvaluationResult.model_validate_json(line)
+
+    def batch_result(self) -> BatchEvaluationResult:
+        """All checkpointed results with their aggregates, as returned by /evaluate/batch"""
+        with open(self.checkpoint_dir / STATE_FILE) as f:
+            aggregator = MetricAggregator.from_dict(json.load(f)["aggregate"])
+        results: List[EvaluationResult] = list(self.iter_results())
+        return BatchEvaluationResult(
+            results=results,
+            overall_average=aggregator.overall_average(),
+            metric_averages=aggregator.metric_averages()
+        )
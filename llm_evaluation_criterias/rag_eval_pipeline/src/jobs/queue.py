@@ -0,0 +1,222 @@
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+
+from ..utils.data_types import BatchEvaluationResult, EvaluationResult, RetrievalResult, SearchQuery
+from .checkpoint import MetricAggregator
+
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    n_shards INTEGER NOT NULL,
+    k INTEGER NOT NULL,
+    model_name TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shards (
+    job_id TEXT NOT NULL,
+    shard INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker_id TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    result TEXT,
+    PRIMARY KEY (job_id, shard)
+);
+CREATE INDEX IF NOT EXISTS shards_by_status ON shards (status, lease_expires);
+"""
+
+
+class Shard(NamedTuple):
+    job_id: str
+    shard: int
+    queries: List[SearchQuery]
+    results: List[RetrievalResult]
+    k: int
+    model_name: Optional[str]
+
+
+class ShardQueue:
+    """Work queue of evaluation shards in a SQLite database
+
+    A coordinator submits a job, which splits query/result pairs into
+    shards. Workers in any process, or on any host that can open the database
+    file, lease one shard at a time. A lease expires after `lease_seconds`
+    unless the worker heartbeats, after which the shard is handed to the next
+    worker that asks; a shard whose lease expired `max_attempts` times is
+    marked failed. Workers store each shard's EvaluationResults and partial
+    MetricAggregator, which collect() merges into a BatchEvaluationResult.
+    Every state change is a single transaction, so a crashed worker never
+    leaves a shard half-updated.
+    """
+
+    def __init__(self, path: Union[str, Path], lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA busy_timeout=30000")
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front"""
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def submit(self, job_id: str, queries: Sequence[SearchQuery], results: Sequence[RetrievalResult],
+               shard_size: int = 1000, k: int = 5, model_name: Optional[str] = None) -> int:
+        """Split the pairs into shards and enqueue them; returns the number of shards"""
+        if len(queries) != len(results):
+            raise ValueError("Number of queries must match number of results")
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        shards = [
+            (job_id, shard, json.dumps({
+                "queries": [q.model_dump() for q in queries[start:start + shard_size]],
+                "results": [r.model_dump() for r in results[start:start + shard_size]]
+            }))
+            for shard, start in enumerate(range(0, len(queries), shard_size))
+        ]
+        with self._transaction() as connection:
+            if connection.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone():
+                raise ValueError(f"Job '{job_id}' already exists")
+            connection.execute("INSERT INTO jobs VALUES (?, ?, ?, ?, ?)",
+                               (job_id, len(shards), k, model_name, time.time()))
+            connection.executemany("INSERT INTO shards (job_id, shard, payload) VALUES (?, ?, ?)", shards)
+        return len(shards)
+
+    def lease(self, worker_id: str, job_id: Optional[str] = None) -> Optional[Shard]:
+        """Lease the next pending (or expired) shard, oldest job first; None if nothing is available"""
+        now = time.time()
+        job_filter, params = ("AND s.job_id = ?", (job_id,)) if job_id is not None else ("", ())
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE shards SET status = 'failed', error = COALESCE(error, 'lease expired') "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            )
+            row = connection.execute(
+                "SELECT s.job_id, s.shard, s.payload, j.k, j.model_name FROM shards s "
+                "JOIN jobs j ON j.job_id = s.job_id "
+                "WHERE (s.status = 'pending' OR (s.status = 'leased' AND s.lease_expires < ?)) "
+                f"{job_filter} ORDER BY j.created_at, s.job_id, s.shard LIMIT 1",
+                (now, *params)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE shards SET status = 'leased', worker_id = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE job_id = ? AND shard = ?",
+                (worker_id, now + self.lease_seconds, row[0], row[1])
+            )
+        payload = json.loads(row[2])
+        return Shard(
+            job_id=row[0], shard=row[1],
+            queries=[SearchQuery(**q) for q in payload["queries"]],
+            results=[RetrievalResult(**r) for r in payload["results"]],
+            k=row[3], model_name=row[4]
+        )
+
+    def heartbeat(self, shard: Shard, worker_id: str) -> bool:
+        """Extend the lease; False if the shard was reassigned and the work should stop"""
+        with self._transaction() as connection:
+            updated = connection.execute(
+                "UPDATE shards SET lease_expires = ? "
+                "WHERE job_id = ? AND shard = ? AND status = 'leased' AND worker_id = ?",
+                (time.time() + self.lease_seconds, shard.job_id, shard.shard, worker_id)
+            ).rowcount
+        return updated == 1
+
+    def complete(self, shard: Shard, worker_id: str, results: List[EvaluationResult],
+                 aggregate: MetricAggregator) -> bool:
+        """Store a shard's results; False if another worker already completed it
+
+        Results are deterministic, so a late worker whose lease expired may
+        still complete a shard nobody else has finished.
+        """
+        result = json.dumps({"results": [r.model_dump() for r in results], "aggregate": aggregate.to_dict()})
+        with self._transaction() as connection:
+            updated = connection.execute(
+                "UPDATE shards SET status = 'done', worker_id = ?, result = ?, error = NULL "
+                "WHERE job_id = ? AND shard = ? AND status != 'done'",
+                (worker_id, result, shard.job_id, shard.shard)
+            ).rowcount
+        return updated == 1
+
+    def release(self, shard: Shard, worker_id: str, error: str) -> None:
+        """Give a shard back after a worker error; it fails once max_attempts is reached"""
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE shards SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker_id = NULL, lease_expires = NULL, error = ? "
+                "WHERE job_id = ? AND shard = ? AND status = 'leased' AND worker_id = ?",
+                (self.max_attempts, error, shard.job_id, shard.shard, worker_id)
+            )
+
+    def progress(self, job_id: str) -> Dict[str, int]:
+        """Number of shards per status"""
+        with self._connect() as connection:
+            if not connection.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone():
+                raise KeyError(f"Unknown job '{job_id}'")
+            counts = dict(connection.execute(
+                "SELECT status, COUNT(*) FROM shards WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        return {status: counts.get(status, 0) for status in ("pending", "leased", "done", "failed")}
+
+    def is_finished(self, job_id: str) -> bool:
+        progress = self.progress(job_id)
+        return progress["pending"] == 0 and progress["leased"] == 0
+
+    def wait(self, job_id: str, poll_interval: float = 1.0, timeout: Optional[float] = None) -> Dict[str, int]:
+        """Block until no shard is pending or leased; returns the final progress"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_finished(job_id):
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Job '{job_id}' did not finish within {timeout} seconds")
+            time.sleep(poll_interval)
+        return self.progress(job_id)
+
+    def collect(self, job_id: str) -> BatchEvaluationResult:
+        """Merge the shard results of a finished job, in submission order"""
+        progress = self.progress(job_id)
+        if progress["done"] != sum(progress.values()):
+            raise ValueError(f"Job '{job_id}' is not complete: {progress}")
+        aggregator = MetricAggregator()
+        evaluation_results: List[EvaluationResult] = []
+        with self._connect() as connection:
+            for (result,) in connection.execute(
+                "SELECT result FROM shards WHERE job_id = ? ORDER BY shard", (job_id,)
+            ):
+                shard_result = json.loads(result)
+                aggregator.merge(MetricAggregator.from_dict(shard_result["aggregate"]))
+                evaluation_results.extend(EvaluationResult(**r) for r in shard_result["results"])
+        return BatchEvaluationResult(
+            results=evaluation_results,
+            overall_average=aggregator.overall_average(),
+            metric_averages=aggregator.metric_averages()
+        )
@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+from typing import Callable, List, Optional
+
+from ..models.embedding_store import EmbeddingStore
+from ..utils.data_types import EvaluationResult, RetrievalResult, SearchQuery
+from .checkpoint import MetricAggregator, evaluate_pair
+from .queue import DEFAULT_LEASE_SECONDS, Shard, ShardQueue
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def registry_metrics_factory(embedding_store=None) -> Callable[[Optional[str]], object]:
+    """RetrievalMetrics per model name, sharing encoders through a ModelRegistry
+
+    With an EmbeddingStore the encoder is only loaded if a text is missing
+    from the store. Shards of a model other than the one the store was built
+    with are encoded with that model instead of reading the store.
+    """
+    from ..metrics.retrieval_metrics import RetrievalMetrics
+    from ..models.registry import ModelRegistry
+
+    registry = ModelRegistry.from_env()
+    metrics_by_model = {}
+
+    def get_metrics(model_name: Optional[str]):
+        model_name = model_name or registry.default_model
+        if model_name not in metrics_by_model:
+            if embedding_store is not None and embedding_store.model_name == model_name:
+                metrics_by_model[model_name] = RetrievalMetrics(model_name=model_name,
+                                                                embedding_store=embedding_store)
+            else:
+                metrics_by_model[model_name] = RetrievalMetrics(model_name=model_name,
+                                                                model=registry.get(model_name))
+        return metrics_by_model[model_name]
+    return get_metrics
+
+
+def process_shard(queue: ShardQueue, shard: Shard, metrics, worker_id: str) -> bool:
+    """Evaluate one leased shard and store its results; False if the lease was lost"""
+    heartbeat_every = queue.lease_seconds / 3
+    last_heartbeat = time.monotonic()
+    aggregator = MetricAggregator()
+    results: List[EvaluationResult] = []
+    for query, result in zip(shard.queries, shard.results):
+        evaluation = evaluate_pair(metrics, query, result, shard.k)
+        aggregator.add(evaluation)
+        results.append(evaluation)
+        if time.monotonic() - last_heartbeat > heartbeat_every:
+            if not queue.heartbeat(shard, worker_id):
+                return False
+            last_heartbeat = time.monotonic()
+    return queue.complete(shard, worker_id, results, aggregator)
+
+
+def run_worker(queue: ShardQueue, get_metrics: Callable[[Optional[str]], object],
+               worker_id: Optional[str] = None, job_id: Optional[str] = None,
+               poll_interval: float = 1.0, idle_timeout: Optional[float] = None,
+               max_shards: Optional[int] = None) -> int:
+    """Lease and evaluate shards until idle for idle_timeout seconds; returns the shards completed
+
+    get_metrics(model_name) returns the RetrievalMetrics for a job's model.
+    A shard whose evaluation raises is released for another attempt.
+    """
+    worker_id = worker_id or default_worker_id()
+    completed = 0
+    idle_since = time.monotonic()
+    while max_shards is None or completed < max_shards:
+        shard = queue.lease(worker_id, job_id)
+        if shard is None:
+            if idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                break
+            time.sleep(poll_interval)
+            continue
+        try:
+            if process_shard(queue, shard, get_metrics(shard.model_name), worker_id):
+                completed += 1
+        except Exception as e:
+            queue.release(shard, worker_id, f"{type(e).__name__}: {e}")
+        idle_since = time.monotonic()
+    return completed
+
+
+def _load_test_cases(path: str):
+    with open(path) as f:
+        cases = json.load(f)["test_cases"]
+    return ([SearchQuery(**case["query"]) for case in cases],
+            [RetrievalResult(**case["simulated_result"]) for case in cases])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Distribute retrieval evaluation over a shared SQLite shard queue")
+    parser.add_argument("--queue", required=True, help="Path of the queue database (on a shared filesystem)")
+    parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit = commands.add_parser("submit", help="Split a test case file into shards")
+    submit.add_argument("--job-id", required=True)
+    submit.add_argument("--test-cases", required=True, help="JSON file in the tests/test_data/test_queries.json format")
+    submit.add_argument("--shard-size", type=int, default=1000)
+    submit.add_argument("--k", type=int, default=5)
+    submit.add_argument("--model-name")
+
+    work = commands.add_parser("work", help="Run a worker")
+    work.add_argument("--worker-id")
+    work.add_argument("--job-id")
+    work.add_argument("--poll-interval", type=float, default=1.0)
+    work.add_argument("--idle-timeout", type=float, help="Exit after this many idle seconds")
+    work.add_argument("--embeddings", help="EmbeddingStore directory to read query/document embeddings from")
+
+    embed = commands.add_parser("embed", help="Encode the queries and documents of a test case file once")
+    embed.add_argument("--test-cases", required=True)
+    embed.add_argument("--output", required=True, help="EmbeddingStore directory to create")
+    embed.add_argument("--model-name")
+
+    status = commands.add_parser("status", help="Show shard counts per status")
+    status.add_argument("--job-id", required=True)
+
+    collect = commands.add_parser("collect", help="Merge the shard results of a finished job")
+    collect.add_argument("--job-id", required=True)
+    collect.add_argument("--wait", action="store_true", help="Wait for the workers to finish first")
+    collect.add_argument("--output", help="Write the BatchEvaluationResult JSON here instead of stdout")
+
+    args = parser.parse_args(argv)
+    queue = ShardQueue(args.queue, lease_seconds=args.lease_seconds)
+    if args.command == "submit":
+        queries, results = _load_test_cases(args.test_cases)
+        n_shards = queue.submit(args.job_id, queries, results, args.shard_size, args.k, args.model_name)
+        print(f"Submitted {len(queries)} pairs as {n_shards} shards")
+    elif args.command == "work":
+        store = EmbeddingStore(args.embeddings) if args.embeddings else None
+        completed = run_worker(queue, registry_metrics_factory(store), args.worker_id, args.job_id,
+                               args.poll_interval, args.idle_timeout)
+        print(f"Completed {completed} shards")
+    elif args.command == "embed":
+        from ..models.registry import ModelRegistry
+
+        queries, results = _load_test_cases(args.test_cases)
+        registry = ModelRegistry.from_env()
+        model_name = args.model_name or registry.default_model
+        store = EmbeddingStore.for_evaluation(queries, results, registry.get(model_name), args.output,
+                                              model_name=model_name)
+        print(f"Stored {len(store)} embeddings in {args.output}")
+    elif args.command == "status":
+        print(json.dumps(queue.progress(args.job_id)))
+    elif args.command == "collect":
+        if args.wait:
+            queue.wait(args.job_id)
+        output = queue.collect(args.job_id).model_dump_json(indent=2)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(output)
+        else:
+            print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
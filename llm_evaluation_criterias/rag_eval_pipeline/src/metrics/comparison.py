@@ -0,0 +1,188 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple, Union
+from ..utils.data_types import MetricComparison
+
+RandomState = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+# Elements of the per-chunk resampling matrix; small enough to stay in cache
+DEFAULT_CHUNK_ELEMENTS = 2_000_000
+
+# Every byte value 0..255 as its 8 bits, most significant first (matches np.unpackbits)
+_BYTE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).astype(np.float64)
+
+
+def _generator(random_state: RandomState) -> np.random.Generator:
+    if isinstance(random_state, np.random.Generator):
+        return random_state
+    return np.random.default_rng(random_state)
+
+
+def _chunks(total: int, row_elements: int, chunk_elements: int):
+    """Split `total` resamples into chunks of roughly chunk_elements matrix entries"""
+    rows = max(1, chunk_elements // max(row_elements, 1))
+    for start in range(0, total, rows):
+        yield min(rows, total - start)
+
+
+def sign_flip_null(differences: np.ndarray, n_permutations: int = 10000,
+                   random_state: RandomState = None,
+                   chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> np.ndarray:
+    """Null distribution of sum(s_i * d_i) under random sign flips s_i = +/-1
+
+    Zero differences do not affect the statistic and are dropped. When the
+    magnitudes take few distinct values (rank metrics at small k) the signs of
+    equal magnitudes are summed directly: the sum of c random signs is
+    2 * Binomial(c, 1/2) - c, so each permutation costs one draw per distinct
+    value. Otherwise the sign-flip matrix is applied to the difference vector
+    8 queries at a time through a table of the 256 possible partial sums per
+    byte of random bits.
+    """
+    rng = _generator(random_state)
+    d = np.asarray(differences, dtype=np.float64)
+    d = d[d != 0]
+    null = np.empty(n_permutations, dtype=np.float64)
+    if d.size == 0:
+        null.fill(0.0)
+        return null
+
+    magnitudes, counts = np.unique(np.abs(d), return_counts=True)
+    position = 0
+    if magnitudes.size * 32 <= d.size:
+        for rows in _chunks(n_permutations, magnitudes.size, chunk_elements):
+            positives = rng.binomial(counts, 0.5, size=(rows, magnitudes.size))
+            null[position:position + rows] = (2 * positives - counts) @ magnitudes
+            position += rows
+        return null
+
+    # Partial sums over each group of 8 queries for every bit pattern of a byte
+    n_groups = -(-d.size // 8)
+    padded = np.zeros(n_groups * 8)
+    padded[:d.size] = d
+    table = (padded.reshape(n_groups, 8) @ _BYTE_BITS.T).astype(np.float32).ravel()
+    offsets = (np.arange(n_groups) * 256).astype(np.int32)
+    total = d.sum()
+    for rows in _chunks(n_permutations, n_groups, chunk_elements):
+        index = rng.integers(0, 256, size=(rows, n_groups), dtype=np.uint8).astype(np.int32)
+        index += offsets
+        # Bits select +d_i: sum(s_i d_i) = 2 * sum(b_i d_i) - sum(d_i)
+        null[position:position + rows] = 2 * np.take(table, index).sum(axis=1, dtype=np.float64) - total
+        position += rows
+    return null
+
+
+def paired_permutation_test(differences: np.ndarray, n_permutations: int = 10000,
+                            random_state: RandomState = None,
+                            chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> float:
+    """Two-sided randomization p-value for a zero mean paired difference"""
+    d = np.asarray(differences, dtype=np.float64)
+    observed = abs(d.sum())
+    if observed == 0:
+        return 1.0
+    null = np.abs(sign_flip_null(d, n_permutations, random_state, chunk_elements))
+    # Tolerance absorbs float32 rounding in the lookup table
+    tolerance = 1e-6 * np.abs(d).sum()
+    exceed = np.count_nonzero(null >= observed - tolerance)
+    return float((exceed + 1) / (n_permutations + 1))
+
+
+def bootstrap_means(differences: np.ndarray, n_resamples: int = 2000,
+                    random_state: RandomState = None,
+                    chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> np.ndarray:
+    """Means of bootstrap resamples of the differences
+
+    With few distinct values each resample is drawn as multinomial counts over
+    the distinct values; otherwise resample indices are drawn in chunks.
+    """
+    rng = _generator(random_state)
+    d = np.asarray(differences, dtype=np.float64)
+    n = d.size
+    means = np.empty(n_resamples, dtype=np.float64)
+    values, counts = np.unique(d, return_counts=True)
+    position = 0
+    if values.size * 16 <= n:
+        probabilities = counts / n
+        for rows in _chunks(n_resamples, values.size, chunk_elements):
+            draws = rng.multinomial(n, probabilities, size=rows)
+            means[position:position + rows] = draws @ values / n
+            position += rows
+        return means
+
+    d32 = d.astype(np.float32)
+    for rows in _chunks(n_resamples, n, chunk_elements):
+        index = rng.integers(0, n, size=(rows, n), dtype=np.int32)
+        means[position:position + rows] = np.take(d32, index).sum(axis=1, dtype=np.float64) / n
+        position += rows
+    return means
+
+
+def paired_bootstrap_test(differences: np.ndarray, n_resamples: int = 2000,
+                          confidence: float = 0.95, random_state: RandomState = None,
+                          chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> Tuple[float, float, float]:
+    """Percentile confidence interval and two-sided p-value for the mean difference
+
+    Returns:
+        Tuple of (ci_lower, ci_upper, p_value)
+    """
+    d = np.asarray(differences, dtype=np.float64)
+    observed = d.mean()
+    means = bootstrap_means(d, n_resamples, random_state, chunk_elements)
+    alpha = 1 - confidence
+    ci_lower, ci_upper = np.quantile(means, [alpha / 2, 1 - alpha / 2])
+    if observed == 0:
+        return float(ci_lower), float(ci_upper), 1.0
+    # Shift the bootstrap distribution to the null of zero mean difference
+    exceed = np.count_nonzero(np.abs(means - observed) >= abs(observed))
+    return float(ci_lower), float(ci_upper), float((exceed + 1) / (n_resamples + 1))
+
+
+def compare_metric(metric_name: str, scores_a: Sequence[float], scores_b: Sequence[float],
+                   n_permutations: int = 10000, n_bootstrap: int = 2000,
+                   confidence: float = 0.95, random_state: RandomState = None) -> MetricComparison:
+    """Paired comparison of one metric; differences are system B minus system A"""
+    a = np.asarray(scores_a, dtype=np.float64)
+    b = np.asarray(scores_b, dtype=np.float64)
+    if a.shape != b.shape or a.ndim != 1:
+        raise ValueError(f"Scores for {metric_name} must be 1-D and paired by query")
+    if a.size == 0:
+        raise ValueError(f"No scores to compare for {metric_name}")
+
+    permutation_rng, bootstrap_rng = _generator(random_state).spawn(2)
+    differences = b - a
+    ci_lower, ci_upper, bootstrap_p = paired_bootstrap_test(
+        differences, n_bootstrap, confidence, bootstrap_rng
+    )
+    return MetricComparison(
+        metric_name=metric_name,
+        mean_a=float(a.mean()),
+        mean_b=float(b.mean()),
+        mean_difference=float(differences.mean()),
+        ci_lower=ci_lower,
+        ci_upper=ci_upper,
+        permutation_p_value=paired_permutation_test(differences, n_permutations, permutation_rng),
+        bootstrap_p_value=bootstrap_p,
+        wins=int(np.count_nonzero(differences > 0)),
+        losses=int(np.count_nonzero(differences < 0)),
+        ties=int(np.count_nonzero(differences == 0))
+    )
+
+
+def compare_systems(scores_a: Dict[str, Sequence[float]], scores_b: Dict[str, Sequence[float]],
+                    n_permutations: int = 10000, n_bootstrap: int = 2000,
+                    confidence: float = 0.95, random_state: Optional[int] = None,
+                    max_workers: Optional[int] = None) -> Dict[str, MetricComparison]:
+    """Compare every metric shared by two systems, one metric per worker thread
+
+    Each metric draws from its own child seed, so results do not depend on
+    thread scheduling. The numpy kernels release the GIL, so metrics run in
+    parallel on multi-core machines.
+    """
+    metric_names = [name for name in scores_a if name in scores_b]
+    seeds = np.random.SeedSequence(random_state).spawn(len(metric_names))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            name: pool.submit(compare_metric, name, scores_a[name], scores_b[name],
+                              n_permutations, n_bootstrap, confidence, seed)
+            for name, seed in zip(metric_names, seeds)
+        }
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,161 @@
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from ..utils.data_types import EvaluationResult, GenerationSample, MetricResult
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Cosine similarity at which a context sentence counts as supporting an answer sentence
+DEFAULT_SUPPORT_THRESHOLD = 0.6
+
+# Similarity block size in elements (float32), bounds temporary memory per matmul
+DEFAULT_BLOCK_ELEMENTS = 2 ** 22
+
+# Sentence ends: terminal punctuation followed by whitespace, or a line break
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\s*\n+\s*')
+
+
+def split_sentences(text: str) -> List[str]:
+    """Non-empty sentences of a text; decimals such as 3.5% are not split"""
+    return [sentence for sentence in (s.strip() for s in _SENTENCE_BOUNDARY.split(text or '')) if sentence]
+
+
+class _SentenceTable:
+    """Distinct sentences of a batch, each assigned one row of the embedding matrix"""
+
+    def __init__(self):
+        self.rows: Dict[str, int] = {}
+
+    def add(self, sentences: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.rows.setdefault(s, len(self.rows)) for s in sentences),
+                           dtype=np.int64, count=len(sentences))
+
+
+def _max_similarities(rows: np.ndarray, columns: np.ndarray, block_elements: int):
+    """Row-wise and column-wise maxima of rows @ columns.T, computed in row blocks"""
+    row_max = np.empty(len(rows), dtype=np.float32)
+    column_max = np.full(len(columns), -np.inf, dtype=np.float32)
+    step = max(1, block_elements // max(len(columns), 1))
+    for start in range(0, len(rows), step):
+        block = rows[start:start + step] @ columns.T
+        row_max[start:start + step] = block.max(axis=1)
+        np.maximum(column_max, block.max(axis=0), out=column_max)
+    return row_max, column_max
+
+
+class GenerationMetrics:
+    """Embedding-based groundedness metrics of generated answers
+
+    Answers and their retrieved contexts are split into sentences, and every
+    distinct sentence of a batch is encoded once. An answer sentence's
+    support is its highest cosine similarity to any sentence of that answer's
+    contexts, from blocked products of the normalized embeddings.
+
+    - faithfulness: mean support of the answer sentences
+    - context_utilization: share of context sentences that support some
+      answer sentence at or above support_threshold
+    - answer_relevance: mean similarity of the answer sentences to the query
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, model=None,
+                 support_threshold: float = DEFAULT_SUPPORT_THRESHOLD, batch_size: int = 256,
+                 block_elements: int = DEFAULT_BLOCK_ELEMENTS):
+        # A pre-loaded encoder (e.g. from the ModelRegistry) is shared rather than reloaded
+        self.model_name = model_name
+        self._model = model
+        self.support_threshold = support_threshold
+        self.batch_size = batch_size
+        self.block_elements = block_elements
+
+    @property
+    def model(self):
+        """Encoder, loaded on first use"""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def _encode(self, sentences: List[str]) -> np.ndarray:
+        """L2-normalized float32 embeddings, encoded in batches of batch_size"""
+        batches = [np.asarray(self.model.encode(sentences[start:start + self.batch_size]), dtype=np.float32)
+                   for start in range(0, len(sentences), self.batch_size)]
+        if not batches:
+            return np.empty((0, 0), dtype=np.float32)
+        embeddings = np.concatenate(batches)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.where(norms > 0, norms, 1)
+
+    def score_batch(self, answers: Sequence[str], contexts: Sequence[Sequence[str]],
+                    queries: Optional[Sequence[str]] = None) -> List[List[MetricResult]]:
+        """Generation metrics of every answer against its own retrieved contexts
+
+        Args:
+            answers: Generated answers
+            contexts: Retrieved context passages of each answer, same order
+            queries: Optional questions, same order; adds answer_relevance
+
+        Returns:
+            One list of MetricResult per answer
+        """
+        if len(contexts) != len(answers) or (queries is not None and len(queries) != len(answers)):
+            raise ValueError("answers, contexts and queries must have the same length")
+        table = _SentenceTable()
+        answer_rows, context_rows, query_rows = [], [], []
+        for i, answer in enumerate(answers):
+            answer_rows.append(table.add(split_sentences(answer)))
+            context_rows.append(table.add([s for passage in contexts[i] for s in split_sentences(passage)]))
+            if queries is not None:
+                query_rows.append(table.add([queries[i].strip()]) if queries[i].strip() else None)
+        embeddings = self._encode(list(table.rows))
+
+        results = []
+        for i in range(len(answers)):
+            rows, columns = answer_rows[i], context_rows[i]
+            if len(rows) and len(columns):
+                support, used = _max_similarities(embeddings[rows], embeddings[columns], self.block_elements)
+                supported = support >= self.support_threshold
+                utilized = used >= self.support_threshold
+                faithfulness, utilization = float(support.mean()), float(utilized.mean())
+                faithfulness_details = {
+                    "n_sentences": float(len(rows)),
+                    "supported_fraction": float(supported.mean()),
+                    "min_support": float(support.min()),
+                    "threshold": self.support_threshold
+                }
+                utilization_details = {
+                    "n_context_sentences": float(len(columns)),
+                    "used_sentences": float(utilized.sum())
+                }
+            else:
+                faithfulness, utilization = 0.0, 0.0
+                faithfulness_details = {"n_sentences": float(len(rows)), "threshold": self.support_threshold}
+                utilization_details = {"n_context_sentences": float(len(columns)), "used_sentences": 0.0}
+            metrics = [
+                MetricResult(metric_name="faithfulness", score=faithfulness, details=faithfulness_details),
+                MetricResult(metric_name="context_utilization", score=utilization, details=utilization_details)
+            ]
+            if queries is not None:
+                relevance = 0.0
+                if len(rows) and query_rows[i] is not None:
+                    relevance = float((embeddings[rows] @ embeddings[query_rows[i][0]]).mean())
+                metrics.append(MetricResult(metric_name="answer_relevance", score=relevance))
+            results.append(metrics)
+        return results
+
+    def evaluate_generation(self, sample: GenerationSample) -> List[MetricResult]:
+        """Generation metrics of a single answer"""
+        return self.score_batch([sample.answer], [sample.contexts], [sample.query])[0]
+
+    def evaluate_batch(self, samples: Sequence[GenerationSample]) -> List[EvaluationResult]:
+        """Generation metrics of many answers, encoding their sentences in one pass"""
+        scored = self.score_batch([s.answer for s in samples], [s.contexts for s in samples],
+                                  [s.query for s in samples])
+        return [
+            EvaluationResult(
+                query_id=sample.query_id,
+                metrics=metrics,
+                average_score=sum(m.score for m in metrics) / len(metrics)
+            )
+            for sample, metrics in zip(samples, scored)
+        ]
@@ -1,12 +1,35 @@
 import numpy as np
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
-from ..utils.data_types import SearchQuery, RetrievalResult, MetricResult
+from ..utils.data_types import SearchQuery, RetrievalResult, MetricResult, ComparisonResult
+from ..models.embedding_store import EmbeddingStore
+from .comparison import compare_systems
 
 class RetrievalMetrics:
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
-        self.model = SentenceTransformer(model_name)
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', model: Optional[SentenceTransformer] = None,
+                 embedding_store: Optional[EmbeddingStore] = None):
+        # A pre-loaded encoder (e.g. from the ModelRegistry) is shared rather than reloaded
+        self.model_name = model_name
+        self._model = model
+        # Precomputed embeddings are read from the store instead of re-encoding,
+        # so they must come from the same encoder
+        if embedding_store is not None:
+            if embedding_store.model_name != model_name:
+                raise ValueError(f"Embedding store {embedding_store.path} was built with model "
+                                 f"{embedding_store.model_name!r}, not {model_name!r}")
+            encoder_dim = getattr(model, 'get_sentence_embedding_dimension', lambda: None)()
+            if encoder_dim is not None and encoder_dim != embedding_store.dim:
+                raise ValueError(f"Embedding store {embedding_store.path} holds {embedding_store.dim}-dimensional "
+                                 f"embeddings, but the encoder produces {encoder_dim}")
+        self.embedding_store = embedding_store
+
+    @property
+    def model(self) -> SentenceTransformer:
+        """Encoder, loaded on first use so store-backed workers never load it"""
+        if self._model is None:
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
     
     def precision_at_k(self, retrieved_docs: List[str], relevant_docs: Set[str], k: int) -> float:
         """Calculate Precision@k metric"""
@@ -62,12 +85,20 @@ class RetrievalMetrics:
         if not retrieved_docs:
             return 0.0
         
-        # Get embeddings for query and documents
-        query_embedding = self.model.encode([query])[0]
-        doc_embeddings = self.model.encode(retrieved_docs)
-        
-        # Calculate cosine similarities
-        similarities = cosine_similarity([query_embedding], doc_embeddings)[0]
+        # Rows are looked up by text, so any text missing from the store is encoded
+        stored = None
+        if self.embedding_store is not None:
+            stored = self.embedding_store.get([query] + list(retrieved_docs))
+        if stored is not None:
+            # Stored rows are normalized, so cosine similarity is a dot product
+            similarities = stored[1:] @ stored[0]
+        else:
+            # Get embeddings for query and documents
+            query_embedding = self.model.encode([query])[0]
+            doc_embeddings = self.model.encode(retrieved_docs)
+            
+            # Calculate cosine similarities
+            similarities = cosine_similarity([query_embedding], doc_embeddings)[0]
         
         # Weight similarities by position (earlier documents count more)
         weights = np.array([1.0 / (i + 1) for i in range(len(similarities))])
@@ -146,3 +177,36 @@ class RetrievalMetrics:
         ))
         
         return metrics
+
+    def compare_retrieval(self, queries: List[SearchQuery], results_a: List[RetrievalResult],
+                          results_b: List[RetrievalResult], k: int = 5,
+                          n_permutations: int = 10000, n_bootstrap: int = 2000,
+                          confidence: float = 0.95, random_state: Optional[int] = None) -> ComparisonResult:
+        """Paired significance tests of system B against system A on the same queries
+
+        Results are matched to queries by query_id. For every metric the
+        per-query differences (B - A) are tested with a sign-flip randomization
+        test and a bootstrap, with metrics processed in parallel.
+        """
+        by_id_a = {result.query_id: result for result in results_a}
+        by_id_b = {result.query_id: result for result in results_b}
+        missing = [q.query_id for q in queries if q.query_id not in by_id_a or q.query_id not in by_id_b]
+        if missing:
+            raise ValueError(f"Missing results for queries: {missing}")
+
+        scores_a: Dict[str, List[float]] = {}
+        scores_b: Dict[str, List[float]] = {}
+        for query in queries:
+            for scores, by_id in ((scores_a, by_id_a), (scores_b, by_id_b)):
+                for metric in self.evaluate_retrieval(query, by_id[query.query_id], k):
+                    scores.setdefault(metric.metric_name, []).append(metric.score)
+
+        comparisons = compare_systems(scores_a, scores_b, n_permutations, n_bootstrap,
+                                      confidence, random_state)
+        return ComparisonResult(
+            n_queries=len(queries),
+            n_permutations=n_permutations,
+            n_bootstrap=n_bootstrap,
+            confidence=confidence,
+            comparisons=list(comparisons.values())
+        )
@@ -0,0 +1,168 @@
+import numpy as np
+from statistics import NormalDist
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+from ..utils.data_types import SearchQuery, MetricEstimate, ApproximateEvaluationResult
+
+RandomState = Union[None, int, np.random.Generator]
+
+# Default regression margin: a metric passes once it is confidently above baseline - tolerance
+DEFAULT_TOLERANCE = 0.01
+
+
+def length_strata(queries: Sequence[SearchQuery], n_buckets: int = 4) -> np.ndarray:
+    """Bucket queries by word count into roughly equal-sized strata"""
+    lengths = np.array([len(query.query.split()) for query in queries])
+    if lengths.size == 0:
+        return lengths
+    edges = np.unique(np.quantile(lengths, np.linspace(0, 1, n_buckets + 1)[1:-1]))
+    return np.searchsorted(edges, lengths, side='right')
+
+
+def allocate_sample(stratum_sizes: np.ndarray, sample_size: int, min_per_stratum: int = 2) -> np.ndarray:
+    """Proportional allocation with a per-stratum minimum (largest remainder rounding)"""
+    stratum_sizes = np.asarray(stratum_sizes)
+    sample_size = min(sample_size, int(stratum_sizes.sum()))
+    floor = np.minimum(stratum_sizes, min_per_stratum)
+    remaining = sample_size - floor.sum()
+    if remaining <= 0:
+        return floor
+    capacity = stratum_sizes - floor
+    quota = remaining * capacity / max(capacity.sum(), 1)
+    allocation = np.minimum(np.floor(quota).astype(int), capacity)
+    # Hand out what rounding left over to the largest remainders with room
+    leftover = remaining - allocation.sum()
+    order = np.argsort(-(quota - allocation), kind='stable')
+    for stratum in order:
+        if leftover == 0:
+            break
+        if allocation[stratum] < capacity[stratum]:
+            allocation[stratum] += 1
+            leftover -= 1
+    return floor + allocation
+
+
+def stratified_estimate(values: np.ndarray, sample_strata: np.ndarray,
+                        stratum_sizes: Dict) -> Tuple[float, float]:
+    """Stratified mean and its standard error with finite population correction
+
+    Args:
+        values: Metric values of the sampled items
+        sample_strata: Stratum label of each sampled item
+        stratum_sizes: Population size of every stratum, keyed by label
+
+    Returns:
+        Tuple of (estimate, standard_error)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    total = sum(stratum_sizes.values())
+    estimate, variance = 0.0, 0.0
+    for label, population in stratum_sizes.items():
+        stratum_values = values[sample_strata == label]
+        n = stratum_values.size
+        if n == 0:
+            continue
+        weight = population / total
+        estimate += weight * stratum_values.mean()
+        if n > 1:
+            variance += weight ** 2 * (1 - n / population) * stratum_values.var(ddof=1) / n
+    return float(estimate), float(np.sqrt(variance))
+
+
+class StratifiedSampler:
+    """Draws a stratified sample that can be grown without re-evaluating items
+
+    Each stratum is shuffled once; a sample of any size takes a prefix of every
+    stratum's order, so growing the sample only adds new items.
+    """
+
+    def __init__(self, strata: Sequence, random_state: RandomState = None):
+        rng = np.random.default_rng(random_state)
+        self.strata = np.asarray(strata)
+        self.labels, inverse, counts = np.unique(self.strata, return_inverse=True, return_counts=True)
+        self.stratum_sizes = dict(zip(self.labels.tolist(), counts.tolist()))
+        self._orders = [rng.permutation(np.flatnonzero(inverse == i)) for i in range(self.labels.size)]
+        self._counts = counts
+
+    def sample(self, sample_size: int, min_per_stratum: int = 2) -> np.ndarray:
+        """Sorted indices of a stratified sample of about `sample_size` items"""
+        allocation = allocate_sample(self._counts, sample_size, min_per_stratum)
+        return np.sort(np.concatenate([order[:n] for order, n in zip(self._orders, allocation)]))
+
+
+def approximate_evaluation(evaluate_item: Callable[[int], Dict[str, float]], strata: Sequence,
+                           sample_size: int = 200, confidence: float = 0.95,
+                           baseline: Optional[Dict[str, float]] = None, tolerance: float = DEFAULT_TOLERANCE,
+                           target_half_width: Optional[float] = None, growth: float = 2.0,
+                           max_sample_size: Optional[int] = None,
+                           random_state: RandomState = None) -> ApproximateEvaluationResult:
+    """Estimate metric means from a stratified sample, growing it until conclusive
+
+    A metric passes when its lower confidence bound is at least
+    baseline - tolerance, fails when its upper bound is below that, and is
+    undecided otherwise. The tolerance must be positive: a system whose mean
+    equals the baseline passes as soon as the interval is narrower than it,
+    whereas with no margin it would stay undecided until every item was
+    evaluated. Without a baseline, `target_half_width` bounds the
+    interval half-width instead. While any metric is undecided (or too wide)
+    the sample grows by `growth` up to `max_sample_size`; items already
+    evaluated are reused.
+
+    Args:
+        evaluate_item: Maps an item index to its metric values
+        strata: Stratum label of every item, e.g. domain or length bucket
+    """
+    if baseline is not None and tolerance <= 0:
+        raise ValueError("tolerance must be positive when comparing against a baseline")
+    sampler = StratifiedSampler(strata, random_state)
+    n_total = len(sampler.strata)
+    max_sample_size = min(max_sample_size or n_total, n_total)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    evaluated: Dict[int, Dict[str, float]] = {}
+    size = min(sample_size, max_sample_size)
+    rounds = 0
+
+    while True:
+        rounds += 1
+        indices = sampler.sample(size)
+        for index in indices.tolist():
+            if index not in evaluated:
+                evaluated[index] = evaluate_item(index)
+
+        metric_names = list(evaluated[int(indices[0])])
+        estimates = []
+        for name in metric_names:
+            values = np.array([evaluated[i][name] for i in indices.tolist()])
+            estimate, standard_error = stratified_estimate(values, sampler.strata[indices],
+                                                           sampler.stratum_sizes)
+            lower, upper = estimate - z * standard_error, estimate + z * standard_error
+            decision = None
+            if baseline is not None and name in baseline:
+                threshold = baseline[name] - tolerance
+                decision = 'pass' if lower >= threshold else 'fail' if upper < threshold else 'undecided'
+            estimates.append(MetricEstimate(
+                metric_name=name,
+                estimate=estimate,
+                ci_lower=lower,
+                ci_upper=upper,
+                standard_error=standard_error,
+                baseline=baseline.get(name) if baseline else None,
+                decision=decision
+            ))
+
+        undecided = any(e.decision == 'undecided' for e in estimates)
+        too_wide = target_half_width is not None and any(
+            (e.ci_upper - e.ci_lower) / 2 > target_half_width for e in estimates
+        )
+        if not (undecided or too_wide) or len(indices) >= max_sample_size:
+            break
+        size = min(max(int(np.ceil(len(indices) * growth)), len(indices) + 1), max_sample_size)
+
+    decisions = [e.decision for e in estimates if e.decision is not None]
+    return ApproximateEvaluationResult(
+        n_sampled=len(indices),
+        n_total=n_total,
+        confidence=confidence,
+        rounds=rounds,
+        estimates=estimates,
+        passed=None if not decisions or 'undecided' in decisions else 'fail' not in decisions
+    )
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+from ..utils.data_types import RetrievalResult, SearchQuery
+
+EMBEDDINGS_FILE = 'embeddings.npy'
+TEXT_KEYS_FILE = 'text_keys.json'
+METADATA_FILE = 'metadata.json'
+
+# RAM-backed filesystem, so a temporary store is shared memory rather than disk
+_SHARED_MEMORY_DIR = '/dev/shm'
+
+
+def text_key(text: str) -> str:
+    """Row key of a text: the SHA-256 of its UTF-8 encoding"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingStore:
+    """Precomputed, L2-normalized text embeddings with a text hash -> row index
+
+    The matrix is a .npy file opened with mmap_mode='r' (the layout written
+    by DenseRetriever.build), so every process that opens the same store maps
+    the same page-cache pages: rows are read without copying the matrix and
+    without loading an encoder. Pickling a store only sends its path, so
+    process-pool workers re-map it on arrival. Temporary stores live in
+    /dev/shm when available and are removed by cleanup().
+
+    Rows are keyed by the hash of the text itself, not by query or document
+    ids, so a store built from one test file is never read for a different
+    text that happens to reuse an id; such texts are simply missing.
+
+    The encoder's model_name and the embedding dimension are kept in
+    metadata.json, so consumers can refuse embeddings from another model.
+    Stores written without it report model_name None.
+    """
+
+    def __init__(self, path: Union[str, Path], owns_path: bool = False):
+        self.path = Path(path)
+        self.owns_path = owns_path
+        self._open()
+
+    def _open(self) -> None:
+        self.embeddings = np.load(self.path / EMBEDDINGS_FILE, mmap_mode='r')
+        with open(self.path / TEXT_KEYS_FILE) as f:
+            self.index: Dict[str, int] = {key: row for row, key in enumerate(json.load(f))}
+        metadata = {}
+        if (self.path / METADATA_FILE).exists():
+            with open(self.path / METADATA_FILE) as f:
+                metadata = json.load(f)
+        self.model_name: Optional[str] = metadata.get('model_name')
+        self.dim: int = metadata.get('dim', self.embeddings.shape[1])
+
+    @classmethod
+    def build(cls, texts: Iterable[str], model, path: Optional[Union[str, Path]] = None,
+              dtype=np.float32, batch_size: int = 256, *, model_name: str) -> "EmbeddingStore":
+        """Encode every distinct text once into a store at path (a temporary shared-memory directory if None)
+
+        model_name names the encoder and is recorded with the embeddings.
+        """
+        owns_path = path is None
+        if owns_path:
+            parent = _SHARED_MEMORY_DIR if os.path.isdir(_SHARED_MEMORY_DIR) else None
+            path = tempfile.mkdtemp(prefix='rag_eval_embeddings_', dir=parent)
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        distinct = {text_key(text): text for text in texts}
+        keys, values = list(distinct), list(distinct.values())
+        embeddings = None
+        for start in range(0, len(values), batch_size):
+            batch = np.asarray(model.encode(values[start:start + batch_size]), dtype=np.float32)
+            norms = np.linalg.norm(batch, axis=1, keepdims=True)
+            batch = batch / np.where(norms > 0, norms, 1)
+            if embeddings is None:
+                embeddings = np.lib.format.open_memmap(path / EMBEDDINGS_FILE, mode='w+', dtype=dtype,
+                                                       shape=(len(values), batch.shape[1]))
+            embeddings[start:start + len(batch)] = batch
+        if embeddings is None:
+            dim = 0
+            np.save(path / EMBEDDINGS_FILE, np.empty((0, 0), dtype=dtype))
+        else:
+            dim = int(embeddings.shape[1])
+            embeddings.flush()
+            del embeddings
+        with open(path / TEXT_KEYS_FILE, 'w') as f:
+            json.dump(keys, f)
+        with open(path / METADATA_FILE, 'w') as f:
+            json.dump({'model_name': model_name, 'dim': dim}, f)
+        return cls(path, owns_path=owns_path)
+
+    @classmethod
+    def for_evaluation(cls, queries: Sequence[SearchQuery], results: Iterable[RetrievalResult], model,
+                       path: Optional[Union[str, Path]] = None, **build_options) -> "EmbeddingStore":
+        """Store of every distinct retrieved document content and query text
+
+        build_options are passed to build and must include model_name.
+        """
+        texts = [query.query for query in queries]
+        for result in results:
+            for document in result.retrieved_documents:
+                texts.extend(document.values())
+        return cls.build(texts, model, path, **build_options)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, text: str) -> bool:
+        return text_key(text) in self.index
+
+    def rows(self, texts: Sequence[str]) -> Optional[np.ndarray]:
+        """Row numbers of the texts, or None if any text is missing"""
+        try:
+            return np.fromiter((self.index[text_key(text)] for text in texts), dtype=np.int64, count=len(texts))
+        except KeyError:
+            return None
+
+    def get(self, texts: Sequence[str]) -> Optional[np.ndarray]:
+        """float32 embeddings of the texts, or None if any text is missing"""
+        rows = self.rows(texts)
+        if rows is None:
+            return None
+        return np.asarray(self.embeddings[rows], dtype=np.float32)
+
+    def cleanup(self) -> None:
+        """Delete a temporary store; stores built at an explicit path are kept"""
+        self.embeddings = None
+        if self.owns_path:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def __getstate__(self):
+        return {'path': self.path, 'owns_path': False}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self.owns_path = state['owns_path']
+        self._open()
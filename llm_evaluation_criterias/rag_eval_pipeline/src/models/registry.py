@@ -0,0 +1,119 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from sentence_transformers import SentenceTransformer
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+DEFAULT_MEMORY_BUDGET_MB = 2048.0
+
+# Allow-list entry that permits every model name
+ANY_MODEL = '*'
+
+
+def estimate_model_memory(model) -> int:
+    """Estimate the resident size of a torch module in bytes (parameters + buffers)"""
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelRegistry:
+    """Thread-safe LRU cache of sentence encoders bounded by a memory budget.
+
+    Models are loaded on first request and shared by every caller, so worker
+    threads reuse the same weights instead of loading a copy per request. When
+    the summed size of the loaded models exceeds the budget, the least recently
+    used models are evicted. A model larger than the whole budget is still
+    served, but everything else is evicted to make room for it.
+
+    Only allowed models are loaded. Without an explicit allow-list that is
+    just the default model, so callers cannot make the process download and
+    load arbitrary models by name; allowed_models=['*'] opens it to any name.
+    """
+
+    def __init__(self,
+                 memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+                 default_model: str = DEFAULT_MODEL_NAME,
+                 allowed_models: Optional[List[str]] = None,
+                 loader: Optional[Callable[[str], object]] = None):
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.default_model = default_model
+        allowed = set(allowed_models or [])
+        self.allowed_models = None if ANY_MODEL in allowed else allowed | {default_model}
+        self._loader = loader or SentenceTransformer
+        self._models: "OrderedDict[str, object]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    @classmethod
+    def from_env(cls) -> "ModelRegistry":
+        """Build a registry from RAG_EVAL_* environment variables"""
+        allowed = os.getenv("RAG_EVAL_ALLOWED_MODELS")
+        return cls(
+            memory_budget_mb=float(os.getenv("RAG_EVAL_MODEL_MEMORY_BUDGET_MB", DEFAULT_MEMORY_BUDGET_MB)),
+            default_model=os.getenv("RAG_EVAL_DEFAULT_MODEL", DEFAULT_MODEL_NAME),
+            allowed_models=[m.strip() for m in allowed.split(",") if m.strip()] if allowed else None
+        )
+
+    def is_allowed(self, model_name: Optional[str] = None) -> bool:
+        return self.allowed_models is None or (model_name or self.default_model) in self.allowed_models
+
+    def get(self, model_name: Optional[str] = None):
+        """Return the encoder for model_name, loading it if it is not resident"""
+        model_name = model_name or self.default_model
+        if not self.is_allowed(model_name):
+            raise KeyError(f"Model '{model_name}' is not in the allowed model list")
+
+        with self._lock:
+            if model_name in self._models:
+                self._models.move_to_end(model_name)
+                return self._models[model_name]
+            load_lock = self._load_locks.setdefault(model_name, threading.Lock())
+
+        # Load outside the registry lock so requests for resident models are not
+        # blocked; the per-model lock stops concurrent loads of the same weights.
+        with load_lock:
+            with self._lock:
+                if model_name in self._models:
+                    self._models.move_to_end(model_name)
+                    return self._models[model_name]
+
+            model = self._loader(model_name)
+            size = estimate_model_memory(model)
+
+            with self._lock:
+                self._models[model_name] = model
+                self._sizes[model_name] = size
+                self._evict(keep=model_name)
+                self._load_locks.pop(model_name, None)
+            return model
+
+    def _evict(self, keep: str):
+        """Drop least recently used models until the budget is respected"""
+        while self.memory_usage() > self.memory_budget_bytes and len(self._models) > 1:
+            oldest = next(iter(self._models))
+            if oldest == keep:
+                self._models.move_to_end(oldest)
+                continue
+            del self._models[oldest]
+            del self._sizes[oldest]
+
+    def memory_usage(self) -> int:
+        """Total estimated bytes held by resident models"""
+        return sum(self._sizes.values())
+
+    def loaded_models(self) -> List[Dict[str, float]]:
+        """Resident models from least to most recently used with their sizes in MB"""
+        with self._lock:
+            return [
+                {"name": name, "memory_mb": self._sizes[name] / (1024 * 1024)}
+                for name in self._models
+            ]
+
+    def __contains__(self, model_name: str) -> bool:
+        with self._lock:
+            return model_name in self._models
@@ -1,20 +1,30 @@
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime
 import csv
 import os
+from ..jobs.checkpoint import CheckpointedEvaluationJob
 from ..metrics.retrieval_metrics import RetrievalMetrics
-from ..utils.data_types import SearchQuery, RetrievalResult
+from ..metrics.sampling import DEFAULT_TOLERANCE, approximate_evaluation, length_strata
+from ..utils.data_types import (SearchQuery, RetrievalResult, ComparisonResult, ApproximateEvaluationResult,
+                                VersionDiffResult)
+from .result_store import ResultStore
+from .streaming import HISTOGRAM_BINS, StreamingReportWriter
 
 class RAGEvaluationReporter:
-    def __init__(self, output_dir: str = "example_reports", version: str = None):
+    def __init__(self, output_dir: str = "example_reports", version: str = None,
+                 result_store: Optional[ResultStore] = None, domain: Optional[str] = None):
         self.metrics = RetrievalMetrics()
         self.base_output_dir = Path(output_dir)
         self.version = version or datetime.now().strftime("%Y%m%d_%H%M%S")
         
+        # Per-query results are also kept in the Parquet store, keyed by domain and version
+        self.result_store = result_store
+        self.domain = domain or self.base_output_dir.name
+        
         # Create versioned output directory
         self.output_dir = self.base_output_dir / f"v{self.version}"
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -27,20 +37,38 @@ class RAGEvaluationReporter:
         for dir_path in [self.csv_dir, self.plots_dir, self.markdown_dir]:
             dir_path.mkdir(exist_ok=True)
         
-    def generate_report(self, test_cases: Dict, corpus: Dict) -> str:
-        """Generate a comprehensive evaluation report with versioning"""
+    def generate_report(self, test_cases: Dict, corpus: Dict, checkpoint_dir: Optional[str] = None,
+                        chunk_size: int = 1000, streaming: bool = False, top_n: int = 10,
+                        page_size: int = 1000) -> str:
+        """Generate a comprehensive evaluation report with versioning
+        
+        With a checkpoint_dir the test cases are evaluated by a
+        CheckpointedEvaluationJob, so an interrupted run resumes from its last
+        completed chunk when called again with the same directory.
+        
+        streaming=True writes the report through a StreamingReportWriter:
+        rows go to disk as they are evaluated, the markdown report keeps
+        only summaries, per-slice averages and the top_n worst/best queries
+        per metric, and per-query detail is paginated into markdown/queries/.
+        """
         
         # Collect results
         all_results = []
         metric_summaries = {}
         
-        for test_case in test_cases["test_cases"]:
-            query = SearchQuery(**test_case["query"])
-            result = RetrievalResult(**test_case["simulated_result"])
-            
-            # Get evaluation metrics
-            evaluation_results = self.metrics.evaluate_retrieval(query, result)
-            
+        queries = [SearchQuery(**test_case["query"]) for test_case in test_cases["test_cases"]]
+        results = [RetrievalResult(**test_case["simulated_result"]) for test_case in test_cases["test_cases"]]
+        if checkpoint_dir is not None:
+            job = CheckpointedEvaluationJob(checkpoint_dir, self.metrics, chunk_size=chunk_size)
+            job.run(queries, results)
+            evaluations = (evaluation.metrics for evaluation in job.iter_results())
+        else:
+            evaluations = (self.metrics.evaluate_retrieval(query, result) for query, result in zip(queries, results))
+        
+        if streaming:
+            return self._generate_streaming_report(test_cases, corpus, queries, evaluations, top_n, page_size)
+        
+        for query, evaluation_results in zip(queries, evaluations):
             # Organize results
             result_dict = {
                 "query_id": query.query_id,
@@ -60,6 +88,8 @@ class RAGEvaluationReporter:
         
         # Generate different report formats
         self._save_csv_reports(all_results, metric_summaries)
+        if self.result_store is not None:
+            self.result_store.write(self.domain, self.version, all_results)
         self._generate_markdown_report(all_results, metric_summaries, test_cases, corpus)
         self._generate_visualizations(metric_summaries)
         
@@ -68,6 +98,167 @@ class RAGEvaluationReporter:
         
         return str(self.output_dir)
     
+    def generate_comparison_report(self, test_cases: Dict, alternative_results: List[Dict],
+                                   labels: Tuple[str, str] = ("A", "B"), **test_options) -> ComparisonResult:
+        """Compare the test cases' simulated results (system A) against alternative results (system B)
+        
+        Writes csv/comparison.csv and markdown/comparison_report.md. Extra keyword
+        arguments (n_permutations, n_bootstrap, confidence, random_state) are
+        passed to RetrievalMetrics.compare_retrieval.
+        """
+        queries = [SearchQuery(**test_case["query"]) for test_case in test_cases["test_cases"]]
+        results_a = [RetrievalResult(**test_case["simulated_result"]) for test_case in test_cases["test_cases"]]
+        results_b = [result if isinstance(result, RetrievalResult) else RetrievalResult(**result)
+                     for result in alternative_results]
+        
+        comparison = self.metrics.compare_retrieval(queries, results_a, results_b, **test_options)
+        
+        comparison_df = pd.DataFrame([c.model_dump() for c in comparison.comparisons])
+        comparison_df.to_csv(self.csv_dir / "comparison.csv", index=False)
+        
+        label_a, label_b = labels
+        with open(self.markdown_dir / "comparison_report.md", "w") as f:
+            f.write(f"# RAG System Comparison Report (v{self.version})\n\n")
+            f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write(f"- System A: {label_a}\n- System B: {label_b}\n")
+            f.write(f"- Queries: {comparison.n_queries}\n")
+            f.write(f"- Permutations: {comparison.n_permutations}, bootstrap resamples: {comparison.n_bootstrap}\n\n")
+            f.write("## Paired Differences (B - A)\n\n")
+            f.write(comparison_df.to_markdown(index=False, floatfmt=".4f"))
+            f.write("\n\n")
+            
+            alpha = 1 - comparison.confidence
+            f.write("## Significant Differences\n\n")
+            significant = [c for c in comparison.comparisons if c.permutation_p_value < alpha]
+            for c in significant:
+                better = label_b if c.mean_difference > 0 else label_a
+                f.write(f"- **{c.metric_name}**: {better} is better by {abs(c.mean_difference):.4f} "
+                        f"(p = {c.permutation_p_value:.4f})\n")
+            if not significant:
+                f.write(f"- No metric differs at the {alpha:.2f} level\n")
+        
+        return comparison
+    
+    def generate_version_diff_report(self, baseline_version: str, top_n: int = 10,
+                                     **test_options) -> VersionDiffResult:
+        """Compare this version's stored results against an earlier version in the result store
+        
+        Writes csv/version_diff.csv and markdown/version_diff_report.md. Extra
+        keyword arguments (n_permutations, n_bootstrap, confidence,
+        random_state) are passed to ResultStore.diff.
+        """
+        if self.result_store is None:
+            raise ValueError("Version diffs need a result_store")
+        diff = self.result_store.diff(self.domain, baseline_version, self.version, top_n=top_n, **test_options)
+        
+        comparison_df = pd.DataFrame([c.model_dump() for c in diff.comparisons])
+        comparison_df.to_csv(self.csv_dir / "version_diff.csv", index=False)
+        
+        with open(self.markdown_dir / "version_diff_report.md", "w") as f:
+            f.write(f"# Version Diff Report: v{baseline_version} -> v{self.version} ({self.domain})\n\n")
+            f.write(f"- Queries in both versions: {diff.n_queries}\n")
+            f.write(f"- Only in v{baseline_version}: {len(diff.only_in_a)}, only in v{self.version}: {len(diff.only_in_b)}\n\n")
+            f.write("## Metric Deltas (new - baseline)\n\n")
+            f.write(comparison_df.to_markdown(index=False, floatfmt=".4f"))
+            f.write("\n\n## Worst Regressions\n\n")
+            if diff.worst_regressions:
+                regressions_df = pd.DataFrame([r.model_dump() for r in diff.worst_regressions])
+                f.write(regressions_df.to_markdown(index=False, floatfmt=".4f"))
+                f.write("\n")
+            else:
+                f.write("- No query regressed on any metric\n")
+        
+        return diff
+    
+    @staticmethod
+    def load_baseline(report_dir: str) -> Dict[str, float]:
+        """Metric means of an earlier report, read from its csv/metric_summaries.csv"""
+        summaries = pd.read_csv(Path(report_dir) / "csv" / "metric_summaries.csv", index_col=0)
+        return summaries["mean"].to_dict()
+    
+    def generate_approximate_report(self, test_cases: Dict, sample_size: int = 200,
+                                    strata_by: str = "length", baseline: Optional[Dict[str, float]] = None,
+                                    tolerance: float = DEFAULT_TOLERANCE, confidence: float = 0.95,
+                                    target_half_width: Optional[float] = None,
+                                    max_sample_size: Optional[int] = None,
+                                    random_state: Optional[int] = None) -> ApproximateEvaluationResult:
+        """Estimate metric averages from a stratified sample of the test cases
+        
+        Test cases are stratified by query length bucket (strata_by="length") or
+        by their "domain" field (strata_by="domain"). With a baseline, e.g. from
+        load_baseline, the sample grows until every metric passes or fails;
+        the estimates are written to csv/approximate_estimates.csv.
+        """
+        cases = test_cases["test_cases"]
+        queries = [SearchQuery(**case["query"]) for case in cases]
+        if strata_by == "length":
+            strata = length_strata(queries)
+        elif strata_by == "domain":
+            strata = [case.get("domain", "unknown") for case in cases]
+        else:
+            raise ValueError(f"Unknown stratification: {strata_by}")
+        
+        def evaluate_item(index: int) -> Dict[str, float]:
+            result = RetrievalResult(**cases[index]["simulated_result"])
+            return {m.metric_name: m.score for m in self.metrics.evaluate_retrieval(queries[index], result)}
+        
+        approximation = approximate_evaluation(
+            evaluate_item, strata, sample_size=sample_size, confidence=confidence,
+            baseline=baseline, tolerance=tolerance, target_half_width=target_half_width,
+            max_sample_size=max_sample_size, random_state=random_state
+        )
+        pd.DataFrame([e.model_dump() for e in approximation.estimates]).to_csv(
+            self.csv_dir / "approximate_estimates.csv", index=False
+        )
+        return approximation
+    
+    def _generate_streaming_report(self, test_cases: Dict, corpus: Dict, queries: List[SearchQuery],
+                                   evaluations, top_n: int, page_size: int) -> str:
+        """Stream evaluations into the report files without keeping per-query results"""
+        cases = test_cases["test_cases"]
+        if any("domain" in case for case in cases):
+            slices = [f"domain {case.get('domain', 'unknown')}" for case in cases]
+        else:
+            slices = [f"length bucket {bucket}" for bucket in length_strata(queries)]
+        
+        # The context manager closes the per-query files if an evaluation raises
+        with StreamingReportWriter(self.output_dir, self.version, top_n=top_n, page_size=page_size) as writer:
+            for query, evaluation_results, slice_label in zip(queries, evaluations, slices):
+                row = {
+                    "query_id": query.query_id,
+                    "query": query.query,
+                    "expected_content": query.expected_relevant_content
+                }
+                row.update({metric.metric_name: metric.score for metric in evaluation_results})
+                writer.add(row, slice_label)
+            
+            writer.close(len(cases), len(corpus["documents"]), recommendations=self._add_recommendations)
+        self._generate_histogram_plots(writer)
+        if self.result_store is not None:
+            self.result_store.write(self.domain, self.version, pd.read_csv(self.csv_dir / "detailed_results.csv"))
+        self._save_version_info(test_cases, corpus)
+        return str(self.output_dir)
+    
+    def _generate_histogram_plots(self, writer: StreamingReportWriter):
+        """Plots of a streamed report, drawn from its running averages and fixed-bin histograms"""
+        averages = writer.averages()
+        plt.figure(figsize=(8, 4))
+        plt.bar(averages.keys(), averages.values())
+        plt.title("Average Metric Values")
+        plt.xticks(rotation=45)
+        plt.tight_layout()
+        plt.savefig(self.plots_dir / "metric_visualizations.png")
+        plt.close()
+        
+        for metric_name, counts in writer.histograms.items():
+            plt.figure(figsize=(8, 4))
+            plt.stairs(counts, HISTOGRAM_BINS, fill=True, alpha=0.7)
+            plt.title(f"{metric_name} Distribution")
+            plt.xlabel("Score")
+            plt.ylabel("Frequency")
+            plt.savefig(self.plots_dir / f"{metric_name}_distribution.png")
+            plt.close()
+    
     def _save_csv_reports(self, results: List[Dict], metric_summaries: Dict):
         """Save results in CSV format"""
         # Save detailed results
@@ -134,7 +325,8 @@ class RAGEvaluationReporter:
             
             # Recommendations
             f.write("## Recommendations\n\n")
-            self._add_recommendations(f, metric_summaries)
+            self._add_recommendations(f, {metric: sum(values) / len(values)
+                                          for metric, values in metric_summaries.items()})
     
     def _generate_visualizations(self, metric_summaries: Dict):
         """Generate visualization plots"""
@@ -185,10 +377,8 @@ class RAGEvaluationReporter:
         with open(self.output_dir / "version_info.json", "w") as f:
             json.dump(version_info, f, indent=2)
     
-    def _add_recommendations(self, f, metric_summaries: Dict):
-        """Add recommendations based on metric performance"""
-        averages = {metric: sum(values)/len(values) for metric, values in metric_summaries.items()}
-        
+    def _add_recommendations(self, f, averages: Dict[str, float]):
+        """Add recommendations based on metric averages"""
         if averages.get('precision_at_k', 0) < 0.7:
             f.write("- Consider improving the retrieval precision by:\n")
             f.write("  - Refining the document ranking algorithm\n")
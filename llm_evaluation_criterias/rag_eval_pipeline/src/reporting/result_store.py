@@ -0,0 +1,170 @@
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from ..metrics.comparison import compare_systems
+from ..utils.data_types import MetricRegression, VersionDiffResult
+
+RESULTS_FILE = 'results.parquet'
+
+# Join key of every results frame
+KEY_COLUMN = 'query_id'
+
+_PARTITION_NAME = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+
+def _partition_value(name: str, value: str) -> str:
+    if not _PARTITION_NAME.match(value):
+        raise ValueError(f"Invalid {name} '{value}': use letters, digits, '_', '-' and '.'")
+    return value
+
+
+def metric_columns(frame: pd.DataFrame) -> List[str]:
+    """Numeric (metric score) columns of a results frame"""
+    return [column for column in frame.columns
+            if column != KEY_COLUMN and pd.api.types.is_numeric_dtype(frame[column])]
+
+
+class ResultStore:
+    """Per-query evaluation results in Parquet, partitioned by domain and version
+
+    Layout: <root>/domain=<domain>/version=<version>/results.parquet, one
+    row per query_id with one column per metric (the detailed_results.csv
+    schema). Reading a version only touches its own file and the requested
+    columns, so comparisons stay fast however many versions are kept.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def _path(self, domain: str, version: str) -> Path:
+        return (self.root / f"domain={_partition_value('domain', domain)}"
+                / f"version={_partition_value('version', version)}" / RESULTS_FILE)
+
+    def write(self, domain: str, version: str, results: Union[pd.DataFrame, List[Dict]]) -> Path:
+        """Store one version's per-query results, replacing any earlier copy"""
+        frame = pd.DataFrame(results)
+        if KEY_COLUMN not in frame.columns:
+            raise ValueError(f"Results need a '{KEY_COLUMN}' column")
+        if frame[KEY_COLUMN].duplicated().any():
+            raise ValueError(f"Duplicate query ids in {domain} version {version}")
+        path = self._path(domain, version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return path
+
+    def read(self, domain: str, version: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        path = self._path(domain, version)
+        if not path.exists():
+            raise KeyError(f"No results for {domain} version {version}")
+        return pd.read_parquet(path, columns=list(columns) if columns is not None else None)
+
+    def stored_metric_columns(self, domain: str, version: str) -> List[str]:
+        """Metric columns of a version, from the Parquet schema without reading any rows"""
+        path = self._path(domain, version)
+        if not path.exists():
+            raise KeyError(f"No results for {domain} version {version}")
+        return metric_columns(pq.read_schema(path).empty_table().to_pandas())
+
+    def domains(self) -> List[str]:
+        return sorted(p.name.split('=', 1)[1] for p in self.root.glob('domain=*') if p.is_dir())
+
+    def versions(self, domain: str) -> List[str]:
+        """Stored versions of a domain, oldest first (timestamp versions sort chronologically)"""
+        domain_dir = self.root / f"domain={_partition_value('domain', domain)}"
+        return sorted(p.parent.name.split('=', 1)[1] for p in domain_dir.glob(f'version=*/{RESULTS_FILE}'))
+
+    def ingest_reports(self, report_root: Union[str, Path], domain: Optional[str] = None) -> List[str]:
+        """Import the v<version>/csv/detailed_results.csv files of a report directory
+
+        The domain defaults to the directory name (example_reports/<domain>).
+        Versions already in the store are skipped; returns the versions added.
+        """
+        report_root = Path(report_root)
+        domain = domain or report_root.name
+        stored = set(self.versions(domain))
+        added = []
+        for csv_path in sorted(report_root.glob('v*/csv/detailed_results.csv')):
+            version = csv_path.parent.parent.name[1:]
+            if version not in stored:
+                self.write(domain, version, pd.read_csv(csv_path))
+                added.append(version)
+        return added
+
+    def diff(self, domain: str, version_a: str, version_b: str, top_n: int = 10,
+             metrics: Optional[Sequence[str]] = None, n_permutations: int = 10000,
+             n_bootstrap: int = 2000, confidence: float = 0.95,
+             random_state: Optional[int] = None) -> VersionDiffResult:
+        """Compare version B against version A query by query
+
+        The versions are joined on query_id. For every shared metric the
+        per-query deltas (B - A) get the paired permutation and bootstrap tests
+        of compare_systems, and the top_n most negative deltas over all
+        metrics are reported as the worst regressions. Only query_id and the
+        compared metric columns are read from either version.
+        """
+        columns_a = self.stored_metric_columns(domain, version_a)
+        shared_columns = set(columns_a) & set(self.stored_metric_columns(domain, version_b))
+        names = [m for m in (metrics or columns_a) if m in shared_columns]
+        frame_a = self.read(domain, version_a, columns=[KEY_COLUMN, *names])
+        frame_b = self.read(domain, version_b, columns=[KEY_COLUMN, *names])
+        ids_a = frame_a[KEY_COLUMN].astype(str).to_numpy()
+        ids_b = frame_b[KEY_COLUMN].astype(str).to_numpy()
+        shared, rows_a, rows_b = np.intersect1d(ids_a, ids_b, assume_unique=True, return_indices=True)
+
+        scores_a = frame_a[names].to_numpy(dtype=np.float64)[rows_a]
+        scores_b = frame_b[names].to_numpy(dtype=np.float64)[rows_b]
+        deltas = scores_b - scores_a
+
+        # Queries missing a score in either version are left out of that metric's tests
+        valid = ~np.isnan(deltas)
+        comparisons = compare_systems(
+            {name: scores_a[valid[:, j], j] for j, name in enumerate(names) if valid[:, j].any()},
+            {name: scores_b[valid[:, j], j] for j, name in enumerate(names) if valid[:, j].any()},
+            n_permutations, n_bootstrap, confidence, random_state
+        )
+
+        return VersionDiffResult(
+            domain=domain,
+            version_a=version_a,
+            version_b=version_b,
+            n_queries=int(shared.size),
+            only_in_a=sorted(set(ids_a) - set(shared)),
+            only_in_b=sorted(set(ids_b) - set(shared)),
+            comparisons=list(comparisons.values()),
+            worst_regressions=worst_regressions(shared, names, scores_a, scores_b, top_n)
+        )
+
+
+def worst_regressions(query_ids: np.ndarray, metric_names: Sequence[str], scores_a: np.ndarray,
+                      scores_b: np.ndarray, top_n: int = 10) -> List[MetricRegression]:
+    """The top_n most negative (query, metric) deltas, worst first
+
+    Selection is an argpartition over the flattened query x metric delta
+    matrix, so it is linear in the number of scores rather than a full sort.
+    """
+    deltas = (scores_b - scores_a).ravel()
+    deltas = np.where(np.isnan(deltas), np.inf, deltas)
+    n_negative = int(np.count_nonzero(deltas < 0))
+    n = min(top_n, n_negative)
+    if n == 0:
+        return []
+    worst = np.argpartition(deltas, n - 1)[:n]
+    worst = worst[np.argsort(deltas[worst], kind='stable')]
+    rows, columns = np.divmod(worst, len(metric_names))
+    return [
+        MetricRegression(
+            query_id=str(query_ids[row]),
+            metric_name=metric_names[column],
+            score_a=float(scores_a[row, column]),
+            score_b=float(scores_b[row, column]),
+            delta=float(deltas[index])
+        )
+        for row, column, index in zip(rows.tolist(), columns.tolist(), worst.tolist())
+    ]
@@ -0,0 +1,236 @@
+import csv
+import heapq
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+# Columns of a reporter result row that are not metric scores
+INFO_COLUMNS = ('query_id', 'query', 'expected_content')
+
+# Fixed histogram bins over [0, 1]; scores outside are clipped into the end bins
+HISTOGRAM_BINS = np.linspace(0.0, 1.0, 11)
+_N_BINS = len(HISTOGRAM_BINS) - 1
+
+
+class RunningStats:
+    """Count, mean, variance (Welford), min and max of a stream of values"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, as pandas)"""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else float('nan')
+
+
+def _markdown_row(values) -> str:
+    return "| " + " | ".join(str(v).replace("|", "\\|").replace("\n", " ") for v in values) + " |\n"
+
+
+def _format_score(value) -> str:
+    return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+
+class StreamingReportWriter:
+    """Writes an evaluation report one query at a time in bounded memory
+
+    Every row is appended to csv/detailed_results.csv, csv/metric_values.csv
+    and a page of markdown/queries/page_<n>.md (page_size queries per page)
+    as it arrives. Per metric (and per slice) only running statistics, a
+    fixed-bin histogram and bounded heaps of the top_n worst and best queries
+    are kept, so memory does not grow with the number of queries.
+    close() writes csv/metric_summaries.csv and markdown/evaluation_report.md
+    from those aggregates. Used as a context manager, the open files are
+    also closed (without writing the summaries) if the evaluation fails.
+    """
+
+    def __init__(self, output_dir: Path, version: str, top_n: int = 10, page_size: int = 1000):
+        self.output_dir = Path(output_dir)
+        self.version = version
+        self.top_n = top_n
+        self.page_size = page_size
+        self.csv_dir = self.output_dir / "csv"
+        self.markdown_dir = self.output_dir / "markdown"
+        self.pages_dir = self.markdown_dir / "queries"
+        for dir_path in [self.csv_dir, self.pages_dir]:
+            dir_path.mkdir(parents=True, exist_ok=True)
+
+        self.metric_names: Optional[List[str]] = None
+        self.stats: Dict[str, RunningStats] = {}
+        self.slice_stats: Dict[str, Dict[str, RunningStats]] = {}
+        self.histograms: Dict[str, np.ndarray] = {}
+        # worst: max-heap of the lowest scores (negated); best: min-heap of the highest
+        self._worst: Dict[str, List[Tuple[float, int, str, str]]] = {}
+        self._best: Dict[str, List[Tuple[float, int, str, str]]] = {}
+        self.n_rows = 0
+        self.n_pages = 0
+
+        self._details_file: Optional[TextIO] = None
+        self._values_file: Optional[TextIO] = None
+        self._page_file: Optional[TextIO] = None
+
+    def _start(self, row: Dict) -> None:
+        self.metric_names = [key for key in row if key not in INFO_COLUMNS]
+        for name in self.metric_names:
+            self.stats[name] = RunningStats()
+            self.histograms[name] = np.zeros(len(HISTOGRAM_BINS) - 1, dtype=np.int64)
+            self._worst[name], self._best[name] = [], []
+        self._details_file = open(self.csv_dir / "detailed_results.csv", "w", newline="")
+        self._details = csv.writer(self._details_file)
+        self._details.writerow(list(INFO_COLUMNS) + self.metric_names)
+        self._values_file = open(self.csv_dir / "metric_values.csv", "w", newline="")
+        self._values = csv.writer(self._values_file)
+        self._values.writerow(self.metric_names)
+
+    def _page(self) -> TextIO:
+        if self._page_file is None or self.n_rows % self.page_size == 0:
+            if self._page_file is not None:
+                self._page_file.close()
+            self.n_pages += 1
+            self._page_file = open(self.pages_dir / f"page_{self.n_pages:04d}.md", "w")
+            first = self.n_rows + 1
+            self._page_file.write(f"# Query Results, page {self.n_pages} (from query #{first})\n\n")
+            self._page_file.write(_markdown_row(list(INFO_COLUMNS) + self.metric_names))
+            self._page_file.write(_markdown_row(["---"] * (len(INFO_COLUMNS) + len(self.metric_names))))
+        return self._page_file
+
+    def add(self, row: Dict, slice_label: Optional[str] = None) -> None:
+        """Add one result row (query_id, query, expected_content and one score per metric)"""
+        if self.metric_names is None:
+            self._start(row)
+        scores = [float(row.get(name, float('nan'))) for name in self.metric_names]
+        self._details.writerow([row.get(column, "") for column in INFO_COLUMNS] + scores)
+        self._values.writerow(scores)
+        self._page().write(_markdown_row(
+            [row.get(column, "") for column in INFO_COLUMNS] + [_format_score(s) for s in scores]
+        ))
+
+        per_slice = None
+        if slice_label is not None:
+            per_slice = self.slice_stats.setdefault(slice_label, {name: RunningStats() for name in self.metric_names})
+        for name, score in zip(self.metric_names, scores):
+            if math.isnan(score):
+                continue
+            self.stats[name].add(score)
+            if per_slice is not None:
+                per_slice[name].add(score)
+            bucket = min(max(int(score * _N_BINS), 0), _N_BINS - 1)
+            self.histograms[name][bucket] += 1
+            # The sequence number breaks ties in favour of earlier queries
+            worst_item = (-score, -self.n_rows, row["query_id"], row.get("query", ""))
+            best_item = (score, -self.n_rows, row["query_id"], row.get("query", ""))
+            if len(self._worst[name]) < self.top_n:
+                heapq.heappush(self._worst[name], worst_item)
+                heapq.heappush(self._best[name], best_item)
+            else:
+                heapq.heappushpop(self._worst[name], worst_item)
+                heapq.heappushpop(self._best[name], best_item)
+        self.n_rows += 1
+
+    def worst(self, metric_name: str) -> List[Tuple[str, str, float]]:
+        """(query_id, query, score) of the lowest-scoring queries, worst first"""
+        return [(query_id, query, -neg_score)
+                for neg_score, _, query_id, query in sorted(self._worst[metric_name], reverse=True)]
+
+    def best(self, metric_name: str) -> List[Tuple[str, str, float]]:
+        """(query_id, query, score) of the highest-scoring queries, best first"""
+        return [(query_id, query, score)
+                for score, _, query_id, query in sorted(self._best[metric_name], reverse=True)]
+
+    def averages(self) -> Dict[str, float]:
+        return {name: stats.mean for name, stats in self.stats.items() if stats.count}
+
+    def _close_files(self) -> None:
+        for f in (self._details_file, self._values_file, self._page_file):
+            if f is not None:
+                f.close()
+        self._details_file = self._values_file = self._page_file = None
+
+    def __enter__(self) -> "StreamingReportWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._close_files()
+
+    def close(self, n_test_cases: int, corpus_size: int, recommendations=None) -> Path:
+        """Finish the per-query files and write the summaries; returns the report path
+
+        recommendations(f, averages) may append a recommendations section.
+        """
+        self._close_files()
+        metric_names = self.metric_names or []
+
+        with open(self.csv_dir / "metric_summaries.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["", "mean", "min", "max", "std"])
+            for name in metric_names:
+                stats = self.stats[name]
+                writer.writerow([name, stats.mean, stats.minimum, stats.maximum, stats.std])
+
+        report_path = self.markdown_dir / "evaluation_report.md"
+        with open(report_path, "w") as f:
+            f.write(f"# RAG System Evaluation Report (v{self.version})\n\n")
+            f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+            f.write("## Overall Performance Summary\n\n")
+            for name in metric_names:
+                stats = self.stats[name]
+                f.write(f"- **{name}**: {stats.mean:.3f} (average, std {stats.std:.3f}, "
+                        f"min {stats.minimum:.3f}, max {stats.maximum:.3f})\n")
+            f.write("\n")
+
+            if self.slice_stats:
+                f.write("## Performance by Slice\n\n")
+                f.write(_markdown_row(["slice", "queries"] + metric_names))
+                f.write(_markdown_row(["---"] * (len(metric_names) + 2)))
+                for label in sorted(self.slice_stats):
+                    slice_stats = self.slice_stats[label]
+                    count = max(s.count for s in slice_stats.values())
+                    f.write(_markdown_row([label, count] + [f"{slice_stats[n].mean:.3f}" for n in metric_names]))
+                f.write("\n")
+
+            f.write(f"## Worst and Best Queries (top {self.top_n} per metric)\n\n")
+            for name in metric_names:
+                f.write(f"### {name}\n\n")
+                f.write(_markdown_row(["rank", "worst query", "score", "best query", "score"]))
+                f.write(_markdown_row(["---"] * 5))
+                worst, best = self.worst(name), self.best(name)
+                for rank in range(max(len(worst), len(best))):
+                    w = worst[rank] if rank < len(worst) else ("", "", "")
+                    b = best[rank] if rank < len(best) else ("", "", "")
+                    f.write(_markdown_row([rank + 1, f"{w[0]}: {w[1]}", _format_score(w[2]),
+                                           f"{b[0]}: {b[1]}", _format_score(b[2])]))
+                f.write("\n")
+
+            f.write("## Per-Query Results\n\n")
+            f.write(f"{self.n_rows} queries in {self.n_pages} pages of up to {self.page_size}; "
+                    "all scores are also in csv/detailed_results.csv.\n\n")
+            for page in range(1, self.n_pages + 1):
+                f.write(f"- [Page {page}](queries/page_{page:04d}.md)\n")
+            f.write("\n")
+
+            f.write("## Test Dataset Statistics\n\n")
+            f.write(f"- Number of test queries: {n_test_cases}\n")
+            f.write(f"- Number of documents in corpus: {corpus_size}\n")
+            f.write("\n")
+
+            if recommendations is not None:
+                f.write("## Recommendations\n\n")
+                recommendations(f, self.averages())
+        return report_path
@@ -0,0 +1,183 @@
+import itertools
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from ..utils.data_types import RetrievalResult, SearchQuery
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+# Index used by pool workers, installed once per process by _init_worker
+_WORKER_INDEX: Optional["BM25Index"] = None
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def load_corpus(path: Union[str, Path], include_title: bool = True) -> Dict[str, str]:
+    """Read a test_data corpus file ({"documents": {doc_id: {title, content, ...}}}) as doc_id -> text"""
+    with open(path) as f:
+        documents = json.load(f)["documents"]
+    return {
+        doc_id: f"{doc['title']}. {doc['content']}" if include_title and doc.get('title') else doc['content']
+        for doc_id, doc in documents.items()
+    }
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index with array-backed postings
+
+    Postings are stored column-wise (CSC): for term t, doc ids
+    postings_docs[term_offsets[t]:term_offsets[t + 1]] (int32, ascending) and
+    their term frequencies in postings_tf (uint16). A query gathers the
+    postings of its terms, scatters the BM25 contributions into a reusable
+    per-document accumulator and selects the top k with argpartition over
+    the touched documents only, so query cost is proportional to the
+    postings read rather than to the corpus size.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids: List[str] = []
+        self.contents: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        self.term_offsets = np.zeros(1, dtype=np.int64)
+        self.postings_docs = np.empty(0, dtype=np.int32)
+        self.postings_tf = np.empty(0, dtype=np.uint16)
+        self.idf = np.empty(0, dtype=np.float32)
+        self._length_norm = np.empty(0, dtype=np.float32)
+        self._accumulator: Optional[np.ndarray] = None
+
+    @property
+    def n_documents(self) -> int:
+        return len(self.doc_ids)
+
+    def fit(self, documents: Union[Dict[str, str], Iterable[Tuple[str, str]]]) -> "BM25Index":
+        """Index documents given as {doc_id: text} or (doc_id, text) pairs, replacing any earlier index"""
+        items = documents.items() if isinstance(documents, dict) else documents
+        self.doc_ids, self.contents, tokens = [], [], []
+        self._accumulator = None
+        for doc_id, text in items:
+            self.doc_ids.append(doc_id)
+            self.contents.append(text)
+            tokens.append(tokenize(text))
+
+        lengths = np.fromiter((len(doc) for doc in tokens), dtype=np.int64, count=len(tokens))
+        terms, vocabulary = pd.factorize(np.fromiter(
+            itertools.chain.from_iterable(tokens), dtype=object, count=int(lengths.sum())
+        ))
+        self.vocabulary = {token: term_id for term_id, token in enumerate(vocabulary)}
+        n_docs, n_terms = len(self.doc_ids), len(self.vocabulary)
+        counts = sparse.csc_matrix(
+            (np.ones(terms.size, dtype=np.int32), (np.repeat(np.arange(n_docs), lengths), terms)),
+            shape=(n_docs, n_terms)
+        )
+        counts.sum_duplicates()
+        self.term_offsets = counts.indptr.astype(np.int64)
+        self.postings_docs = counts.indices.astype(np.int32)
+        self.postings_tf = np.minimum(counts.data, np.iinfo(np.uint16).max).astype(np.uint16)
+
+        document_frequency = np.diff(self.term_offsets)
+        self.idf = np.log1p((n_docs - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+        lengths = np.asarray(lengths, dtype=np.float64)
+        average_length = lengths.mean() if n_docs and lengths.sum() > 0 else 1.0
+        self._length_norm = (self.k1 * (1 - self.b + self.b * lengths / average_length)).astype(np.float32)
+        return self
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """Top k (document row, score) pairs for a query, best first"""
+        term_ids, query_counts = np.unique(
+            [self.vocabulary[token] for token in tokenize(query) if token in self.vocabulary],
+            return_counts=True
+        )
+        if term_ids.size == 0:
+            return []
+        if self._accumulator is None:
+            self._accumulator = np.zeros(self.n_documents, dtype=np.float32)
+        scores = self._accumulator
+
+        touched = []
+        for term_id, query_count in zip(term_ids.tolist(), query_counts.tolist()):
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            docs = self.postings_docs[start:end]
+            tf = self.postings_tf[start:end].astype(np.float32)
+            # Doc ids within one posting list are unique, so fancy-index += is safe
+            scores[docs] += (query_count * self.idf[term_id] * (self.k1 + 1)) * tf / (tf + self._length_norm[docs])
+            touched.append(docs)
+
+        n_postings = sum(docs.size for docs in touched)
+        if n_postings * 8 >= self.n_documents:
+            # Dense enough that scanning every document beats deduplicating postings
+            candidates = None
+            candidate_scores = scores
+        else:
+            candidates = np.unique(np.concatenate(touched)) if len(touched) > 1 else touched[0]
+            candidate_scores = scores[candidates]
+        if candidate_scores.size > k:
+            top = np.argpartition(-candidate_scores, k - 1)[:k]
+        else:
+            top = np.arange(candidate_scores.size)
+        top = top[np.argsort(-candidate_scores[top], kind='stable')]
+        top = top[candidate_scores[top] > 0]
+        rows = top if candidates is None else candidates[top]
+        results = [(int(row), float(candidate_scores[i])) for row, i in zip(rows, top)]
+        if candidates is None:
+            scores.fill(0)
+        else:
+            scores[candidates] = 0
+        return results
+
+    def retrieve(self, query: Union[SearchQuery, str], k: int = 10, query_id: Optional[str] = None,
+                 include_content: bool = True) -> RetrievalResult:
+        """Search and package the ranking as a RetrievalResult"""
+        if isinstance(query, SearchQuery):
+            query_id, query = query_id or query.query_id, query.query
+        hits = self.search(query, k)
+        return RetrievalResult(
+            query_id=query_id or "",
+            retrieved_documents=[
+                {self.doc_ids[row]: self.contents[row] if include_content else ""} for row, _ in hits
+            ],
+            scores=[score for _, score in hits]
+        )
+
+    def retrieve_batch(self, queries: Sequence[Union[SearchQuery, str]], k: int = 10,
+                       n_jobs: int = 1, chunk_size: int = 256,
+                       include_content: bool = True) -> List[RetrievalResult]:
+        """Retrieve for many queries, optionally across a process pool
+
+        Each worker receives the index once at start-up and then answers
+        chunks of queries. Plain string queries get ids "Q<position>".
+        """
+        items = [
+            (query.query_id, query.query) if isinstance(query, SearchQuery) else (f"Q{i}", query)
+            for i, query in enumerate(queries)
+        ]
+        if n_jobs == 1 or len(items) <= chunk_size:
+            return [self.retrieve(text, k, query_id, include_content) for query_id, text in items]
+        chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(self,)) as pool:
+            batches = pool.map(_retrieve_chunk, chunks, [k] * len(chunks), [include_content] * len(chunks))
+            return [result for batch in batches for result in batch]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_accumulator'] = None
+        return state
+
+
+def _init_worker(index: BM25Index) -> None:
+    global _WORKER_INDEX
+    _WORKER_INDEX = index
+
+
+def _retrieve_chunk(items: List[Tuple[str, str]], k: int, include_content: bool) -> List[RetrievalResult]:
+    return [_WORKER_INDEX.retrieve(text, k, query_id, include_content) for query_id, text in items]
@@ -0,0 +1,258 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from ..utils.data_types import RetrievalResult, SearchQuery
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Similarity block size in elements (float32), bounds temporary memory per matmul
+DEFAULT_BLOCK_ELEMENTS = 2 ** 24
+
+EMBEDDINGS_FILE = 'embeddings.npy'
+DOC_IDS_FILE = 'doc_ids.json'
+IVF_FILE = 'ivf.npz'
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+def _top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Unordered top-k values and column positions of every row, padded with -inf"""
+    if scores.shape[1] <= k:
+        padding = ((0, 0), (0, k - scores.shape[1]))
+        positions = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        return (np.pad(scores, padding, constant_values=-np.inf),
+                np.pad(positions, padding, constant_values=0))
+    positions = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(scores, positions, axis=1), positions
+
+
+class _TopK:
+    """Running top-k similarities and row indices for a set of queries"""
+
+    def __init__(self, n_queries: int, k: int):
+        self.k = k
+        self.scores = np.full((n_queries, k), -np.inf, dtype=np.float32)
+        self.rows = np.full((n_queries, k), -1, dtype=np.int64)
+
+    def update(self, query_rows: np.ndarray, block_scores: np.ndarray, candidate_rows: np.ndarray) -> None:
+        scores, positions = _top_k(block_scores, self.k)
+        merged_scores = np.concatenate([self.scores[query_rows], scores], axis=1)
+        merged_rows = np.concatenate([self.rows[query_rows], candidate_rows[positions]], axis=1)
+        keep_scores, keep = _top_k(merged_scores, self.k)
+        self.scores[query_rows] = keep_scores
+        self.rows[query_rows] = np.take_along_axis(merged_rows, keep, axis=1)
+
+    def sorted(self) -> Tuple[np.ndarray, np.ndarray]:
+        order = np.argsort(-self.scores, axis=1, kind='stable')
+        return np.take_along_axis(self.scores, order, axis=1), np.take_along_axis(self.rows, order, axis=1)
+
+
+class DenseRetriever:
+    """Dense retrieval over L2-normalized corpus embeddings
+
+    The corpus is embedded once into a float16 (or float32) matrix that can
+    live in a memory-mapped .npy file, so corpora larger than RAM are streamed
+    from the page cache. Exact search multiplies query blocks against corpus
+    blocks and keeps a running argpartition top-k, so the full query x corpus
+    similarity matrix is never materialized. An optional IVF index (spherical
+    k-means coarse quantizer) restricts each query to the vectors of its
+    `n_probe` nearest lists; queries probing the same list are multiplied
+    against it together.
+    """
+
+    def __init__(self, embeddings: np.ndarray, doc_ids: Sequence[str],
+                 contents: Optional[Sequence[str]] = None, model=None,
+                 model_name: str = DEFAULT_MODEL_NAME,
+                 block_elements: int = DEFAULT_BLOCK_ELEMENTS):
+        if len(embeddings) != len(doc_ids):
+            raise ValueError("embeddings and doc_ids must have the same length")
+        self.embeddings = embeddings
+        self.doc_ids = list(doc_ids)
+        self.contents = list(contents) if contents is not None else None
+        self.model_name = model_name
+        self._model = model
+        self.block_elements = block_elements
+        self.centroids: Optional[np.ndarray] = None
+        self.list_order: Optional[np.ndarray] = None
+        self.list_offsets: Optional[np.ndarray] = None
+
+    @property
+    def model(self):
+        """Query encoder, loaded on first use"""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    @classmethod
+    def build(cls, documents: Dict[str, str], model=None, model_name: str = DEFAULT_MODEL_NAME,
+              path: Optional[Union[str, Path]] = None, dtype=np.float16,
+              batch_size: int = 256, store_contents: bool = True) -> "DenseRetriever":
+        """Embed a {doc_id: text} corpus once, into a memory-mapped file if `path` is given"""
+        retriever = cls(np.empty((0, 0), dtype=dtype), [], model=model, model_name=model_name)
+        doc_ids, texts = list(documents), list(documents.values())
+        embeddings = None
+        for start in range(0, len(texts), batch_size):
+            batch = _normalize(retriever.model.encode(texts[start:start + batch_size]))
+            if embeddings is None:
+                shape = (len(texts), batch.shape[1])
+                if path is not None:
+                    Path(path).mkdir(parents=True, exist_ok=True)
+                    embeddings = np.lib.format.open_memmap(Path(path) / EMBEDDINGS_FILE, mode='w+',
+                                                           dtype=dtype, shape=shape)
+                else:
+                    embeddings = np.empty(shape, dtype=dtype)
+            embeddings[start:start + len(batch)] = batch
+        if embeddings is None:
+            embeddings = np.empty((0, 0), dtype=dtype)
+        if path is not None:
+            if isinstance(embeddings, np.memmap):
+                embeddings.flush()
+            with open(Path(path) / DOC_IDS_FILE, 'w') as f:
+                json.dump(doc_ids, f)
+        retriever.embeddings = embeddings
+        retriever.doc_ids = doc_ids
+        retriever.contents = texts if store_contents else None
+        return retriever
+
+    @classmethod
+    def load(cls, path: Union[str, Path], documents: Optional[Dict[str, str]] = None,
+             model=None, model_name: str = DEFAULT_MODEL_NAME) -> "DenseRetriever":
+        """Open an index saved by build(path=...) with the embeddings memory-mapped read-only"""
+        path = Path(path)
+        embeddings = np.load(path / EMBEDDINGS_FILE, mmap_mode='r')
+        with open(path / DOC_IDS_FILE) as f:
+            doc_ids = json.load(f)
+        contents = [documents[doc_id] for doc_id in doc_ids] if documents is not None else None
+        retriever = cls(embeddings, doc_ids, contents, model=model, model_name=model_name)
+        if (path / IVF_FILE).exists():
+            with np.load(path / IVF_FILE) as ivf:
+                retriever.centroids = ivf['centroids']
+                retriever.list_order = ivf['list_order']
+                retriever.list_offsets = ivf['list_offsets']
+        return retriever
+
+    def encode_queries(self, queries: Sequence[str], batch_size: int = 256) -> np.ndarray:
+        """Normalized float32 query embeddings"""
+        return np.concatenate([
+            _normalize(self.model.encode(list(queries[start:start + batch_size])))
+            for start in range(0, len(queries), batch_size)
+        ]) if len(queries) else np.empty((0, self.embeddings.shape[1]), dtype=np.float32)
+
+    def search_exact(self, query_embeddings: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact top-k by blocked matrix multiply; returns (scores, rows), best first"""
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        top = _TopK(len(queries), k)
+        n_docs, dim = len(self.embeddings), max(self.embeddings.shape[1], 1)
+        # Bound both the float32 copy of a corpus block and its query score block
+        doc_rows = max(1, min(n_docs, self.block_elements // max(len(queries), 1), self.block_elements // dim))
+        query_rows = max(1, self.block_elements // doc_rows)
+        # Corpus blocks in the outer loop, so a memory-mapped corpus is read once
+        for doc_start in range(0, n_docs, doc_rows):
+            candidates = np.arange(doc_start, min(doc_start + doc_rows, n_docs))
+            block = np.asarray(self.embeddings[doc_start:doc_start + doc_rows], dtype=np.float32)
+            for query_start in range(0, len(queries), query_rows):
+                rows = np.arange(query_start, min(query_start + query_rows, len(queries)))
+                top.update(rows, queries[rows] @ block.T, candidates)
+        return top.sorted()
+
+    def train_ivf(self, n_lists: Optional[int] = None, sample_size: Optional[int] = None,
+                  random_state: int = 0, path: Optional[Union[str, Path]] = None) -> "DenseRetriever":
+        """Train the coarse quantizer and assign every vector to its nearest list
+
+        Defaults to about sqrt(n) lists trained on up to 64 vectors per list.
+        If `path` is given the index is saved next to the embeddings.
+        """
+        from sklearn.cluster import MiniBatchKMeans
+
+        n_docs = len(self.embeddings)
+        n_lists = min(n_lists or max(1, int(np.sqrt(n_docs))), n_docs)
+        rng = np.random.default_rng(random_state)
+        sample_size = min(sample_size or 64 * n_lists, n_docs)
+        sample = np.sort(rng.choice(n_docs, size=sample_size, replace=False))
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, batch_size=4096, n_init=1, random_state=random_state)
+        kmeans.fit(np.asarray(self.embeddings[sample], dtype=np.float32))
+        self.centroids = _normalize(kmeans.cluster_centers_)
+
+        assignments = np.empty(n_docs, dtype=np.int64)
+        rows = max(1, self.block_elements // max(n_lists, self.embeddings.shape[1]))
+        for start in range(0, n_docs, rows):
+            block = np.asarray(self.embeddings[start:start + rows], dtype=np.float32)
+            assignments[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        self.list_order = np.argsort(assignments, kind='stable')
+        self.list_offsets = np.searchsorted(assignments[self.list_order], np.arange(n_lists + 1))
+        if path is not None:
+            np.savez(Path(path) / IVF_FILE, centroids=self.centroids,
+                     list_order=self.list_order, list_offsets=self.list_offsets)
+        return self
+
+    def search_ivf(self, query_embeddings: np.ndarray, k: int = 10,
+                   n_probe: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top-k scanning the n_probe nearest lists of each query"""
+        if self.centroids is None:
+            raise ValueError("IVF index has not been trained; call train_ivf first")
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        n_lists = len(self.centroids)
+        n_probe = min(n_probe, n_lists)
+        top = _TopK(len(queries), k)
+
+        probes = _top_k(queries @ self.centroids.T, n_probe)[1]
+        pair_queries = np.repeat(np.arange(len(queries)), n_probe)
+        pair_lists = probes.ravel()
+        order = np.argsort(pair_lists, kind='stable')
+        pair_queries, pair_lists = pair_queries[order], pair_lists[order]
+        bounds = np.searchsorted(pair_lists, np.arange(n_lists + 1))
+        for list_id in range(n_lists):
+            probing = pair_queries[bounds[list_id]:bounds[list_id + 1]]
+            candidates = self.list_order[self.list_offsets[list_id]:self.list_offsets[list_id + 1]]
+            if probing.size == 0 or candidates.size == 0:
+                continue
+            # Rows within a list are ascending (stable argsort), so memmap reads go forward
+            vectors = np.asarray(self.embeddings[candidates], dtype=np.float32)
+            rows = max(1, self.block_elements // candidates.size)
+            for start in range(0, probing.size, rows):
+                query_rows = probing[start:start + rows]
+                top.update(query_rows, queries[query_rows] @ vectors.T, candidates)
+        return top.sorted()
+
+    def search(self, query_embeddings: np.ndarray, k: int = 10,
+               n_probe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """IVF search when n_probe is given, exact search otherwise"""
+        if n_probe is None:
+            return self.search_exact(query_embeddings, k)
+        return self.search_ivf(query_embeddings, k, n_probe)
+
+    def ivf_recall(self, query_embeddings: np.ndarray, k: int = 10, n_probe: int = 8) -> float:
+        """Mean fraction of the exact top-k that the IVF search also returns"""
+        _, exact = self.search_exact(query_embeddings, k)
+        _, approximate = self.search_ivf(query_embeddings, k, n_probe)
+        hits = [np.intersect1d(e[e >= 0], a).size / max(np.count_nonzero(e >= 0), 1)
+                for e, a in zip(exact, approximate)]
+        return float(np.mean(hits)) if hits else 0.0
+
+    def retrieve_batch(self, queries: Sequence[Union[SearchQuery, str]], k: int = 10,
+                       n_probe: Optional[int] = None) -> List[RetrievalResult]:
+        """Encode and search a batch of queries, packaged as RetrievalResults"""
+        items = [
+            (query.query_id, query.query) if isinstance(query, SearchQuery) else (f"Q{i}", query)
+            for i, query in enumerate(queries)
+        ]
+        scores, rows = self.search(self.encode_queries([text for _, text in items]), k, n_probe)
+        results = []
+        for (query_id, _), query_scores, query_rows in zip(items, scores, rows):
+            found = query_rows >= 0
+            results.append(RetrievalResult(
+                query_id=query_id,
+                retrieved_documents=[
+                    {self.doc_ids[row]: self.contents[row] if self.contents is not None else ""}
+                    for row in query_rows[found].tolist()
+                ],
+                scores=query_scores[found].tolist()
+            ))
+        return results
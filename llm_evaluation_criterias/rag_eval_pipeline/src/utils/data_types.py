@@ -23,6 +23,12 @@ class MetricResult(BaseModel):
     score: float
     details: Optional[Dict[str, float]] = None
 
+class GenerationSample(BaseModel):
+    query_id: str
+    query: str
+    answer: str  # generated answer
+    contexts: List[str]  # retrieved passages the answer was generated from
+
 class EvaluationResult(BaseModel):
     query_id: str
     metrics: List[MetricResult]
@@ -32,3 +38,58 @@ class BatchEvaluationResult(BaseModel):
     results: List[EvaluationResult]
     overall_average: float
     metric_averages: Dict[str, float]
+
+
+class MetricComparison(BaseModel):
+    metric_name: str
+    mean_a: float
+    mean_b: float
+    mean_difference: float  # system B minus system A
+    ci_lower: float
+    ci_upper: float
+    permutation_p_value: float
+    bootstrap_p_value: float
+    wins: int  # queries where B scores higher
+    losses: int
+    ties: int
+
+class ComparisonResult(BaseModel):
+    n_queries: int
+    n_permutations: int
+    n_bootstrap: int
+    confidence: float
+    comparisons: List[MetricComparison]
+
+class MetricRegression(BaseModel):
+    query_id: str
+    metric_name: str
+    score_a: float
+    score_b: float
+    delta: float  # version B minus version A
+
+class VersionDiffResult(BaseModel):
+    domain: str
+    version_a: str
+    version_b: str
+    n_queries: int  # queries present in both versions
+    only_in_a: List[str]
+    only_in_b: List[str]
+    comparisons: List[MetricComparison]
+    worst_regressions: List[MetricRegression]
+
+class MetricEstimate(BaseModel):
+    metric_name: str
+    estimate: float
+    ci_lower: float
+    ci_upper: float
+    standard_error: float
+    baseline: Optional[float] = None
+    decision: Optional[str] = None  # 'pass', 'fail' or 'undecided' against the baseline
+
+class ApproximateEvaluationResult(BaseModel):
+    n_sampled: int
+    n_total: int
+    confidence: float
+    rounds: int
+    estimates: List[MetricEstimate]
+    passed: Optional[bool] = None
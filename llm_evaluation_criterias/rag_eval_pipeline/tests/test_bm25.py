@@ -0,0 +1,68 @@
+import json
+import math
+from pathlib import Path
+import pytest
+from src.retrieval.bm25 import BM25Index, load_corpus, tokenize
+from src.utils.data_types import SearchQuery
+
+TEST_DATA = Path(__file__).parent / "test_data"
+
+def bm25_reference(documents, query, k1=1.5, b=0.75):
+    """Direct BM25 over token lists, one document at a time"""
+    tokenized = [tokenize(text) for text in documents]
+    average_length = sum(map(len, tokenized)) / len(tokenized)
+    scores = []
+    for tokens in tokenized:
+        score = 0.0
+        for term in tokenize(query):
+            df = sum(term in doc for doc in tokenized)
+            tf = tokens.count(term)
+            if df and tf:
+                idf = math.log(1 + (len(tokenized) - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / average_length))
+        scores.append(score)
+    return scores
+
+class TestBM25Index:
+    @pytest.fixture(scope="class")
+    def corpus(self):
+        return load_corpus(TEST_DATA / "financial_corpus.json")
+
+    @pytest.fixture(scope="class")
+    def queries(self):
+        with open(TEST_DATA / "test_queries.json") as f:
+            return json.load(f)["test_cases"]
+
+    def test_scores_match_reference_formula(self, corpus):
+        index = BM25Index().fit(corpus)
+        query = "stock price ratio of the company"
+        expected = bm25_reference(list(corpus.values()), query)
+        for row, score in index.search(query, k=len(corpus)):
+            assert score == pytest.approx(expected[row], rel=1e-5)
+
+    def test_ranks_expected_document_first(self, corpus, queries):
+        index = BM25Index().fit(corpus)
+        results = index.retrieve_batch([SearchQuery(**case["query"]) for case in queries], k=3)
+        for case, result in zip(queries, results):
+            assert result.query_id == case["query"]["query_id"]
+            assert list(result.retrieved_documents[0]) == case["expected_relevant_docs"][:1]
+            assert result.scores == sorted(result.scores, reverse=True)
+
+    def test_process_pool_matches_serial(self, corpus):
+        index = BM25Index().fit(corpus)
+        queries = [f"{word} investors stock" for word in ("dividend", "market", "risk", "earnings")] * 5
+        serial = index.retrieve_batch(queries, k=5)
+        pooled = index.retrieve_batch(queries, k=5, n_jobs=2, chunk_size=4)
+        assert [r.model_dump() for r in pooled] == [r.model_dump() for r in serial]
+
+    def test_unknown_terms_return_no_documents(self, corpus):
+        result = BM25Index().fit(corpus).retrieve("zzzz qqqq", query_id="Q0")
+        assert result.retrieved_documents == [] and result.scores == []
+
+    def test_refit_replaces_the_index(self, corpus):
+        index = BM25Index().fit({"old": "stale stock text"})
+        index.search("stock")
+        index.fit(corpus)
+        fresh = BM25Index().fit(corpus)
+        assert index.doc_ids == fresh.doc_ids
+        assert index.search("stock price ratio", k=5) == fresh.search("stock price ratio", k=5)
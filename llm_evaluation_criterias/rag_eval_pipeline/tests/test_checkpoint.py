@@ -0,0 +1,79 @@
+import pytest
+from src.jobs.checkpoint import CheckpointedEvaluationJob, MetricAggregator, evaluate_pair
+from src.utils.data_types import MetricResult, RelevanceCriteria, RetrievalResult, SearchQuery
+
+class CountingMetrics:
+    """Deterministic stand-in for RetrievalMetrics that counts its calls"""
+    def __init__(self):
+        self.calls = 0
+
+    def evaluate_retrieval(self, query, result, k=5):
+        self.calls += 1
+        n = int(query.query_id[1:])
+        return [MetricResult(metric_name="precision_at_k", score=(n % 7) / 7),
+                MetricResult(metric_name="recall_at_k", score=1 / (n + 1))]
+
+class Interrupted(Exception):
+    pass
+
+def make_inputs(n):
+    queries = [SearchQuery(query_id=f"Q{i}", query=f"query {i}", expected_relevant_content="", keywords=[],
+                           relevance_criteria=RelevanceCriteria(must_contain=[], should_contain=[], semantic_aspects=[]))
+               for i in range(n)]
+    results = [RetrievalResult(query_id=q.query_id, retrieved_documents=[], scores=[]) for q in queries]
+    return queries, results
+
+class TestCheckpointedEvaluationJob:
+    def test_resume_after_crash_matches_uninterrupted_run(self, tmp_path):
+        queries, results = make_inputs(103)
+        reference = CheckpointedEvaluationJob(tmp_path / "reference", CountingMetrics(), chunk_size=10)
+        reference.run(queries, results)
+
+        def crash_after_four(completed, n_chunks):
+            if completed == 4:
+                raise Interrupted()
+
+        metrics = CountingMetrics()
+        job = CheckpointedEvaluationJob(tmp_path / "job", metrics, chunk_size=10)
+        with pytest.raises(Interrupted):
+            job.run(queries, results, on_chunk=crash_after_four)
+        assert metrics.calls == 40
+
+        resumed_metrics = CountingMetrics()
+        CheckpointedEvaluationJob(tmp_path / "job", resumed_metrics, chunk_size=10).run(queries, results)
+        assert resumed_metrics.calls == 63
+        assert job.batch_result() == reference.batch_result()
+        assert [r.query_id for r in job.iter_results()] == [q.query_id for q in queries]
+
+    def test_rejects_checkpoint_of_different_inputs(self, tmp_path):
+        queries, results = make_inputs(20)
+        CheckpointedEvaluationJob(tmp_path, CountingMetrics(), chunk_size=5).run(queries, results)
+        with pytest.raises(ValueError):
+            CheckpointedEvaluationJob(tmp_path, CountingMetrics(), chunk_size=5).run(queries[1:], results[1:])
+
+    def test_rejects_checkpoint_of_changed_results_or_model(self, tmp_path):
+        queries, results = make_inputs(20)
+        CheckpointedEvaluationJob(tmp_path, CountingMetrics(), chunk_size=5).run(queries, results)
+        changed = list(results)
+        changed[7] = RetrievalResult(query_id="Q7", retrieved_documents=[{"D1": "new passage"}], scores=[0.9])
+        with pytest.raises(ValueError):
+            CheckpointedEvaluationJob(tmp_path, CountingMetrics(), chunk_size=5).run(queries, changed)
+
+        other_model = CountingMetrics()
+        other_model.model_name = "all-mpnet-base-v2"
+        with pytest.raises(ValueError):
+            CheckpointedEvaluationJob(tmp_path, other_model, chunk_size=5).run(queries, results)
+
+    def test_aggregator_round_trips_and_merges(self):
+        queries, results = make_inputs(30)
+        job_metrics = CountingMetrics()
+        whole, first, second = MetricAggregator(), MetricAggregator(), MetricAggregator()
+        for i, (query, result) in enumerate(zip(queries, results)):
+            evaluation = evaluate_pair(job_metrics, query, result)
+            whole.add(evaluation)
+            (first if i < 12 else second).add(evaluation)
+        merged = MetricAggregator.from_dict(first.to_dict()).merge(second)
+        assert merged.counts == whole.counts
+        assert merged.minimums == whole.minimums and merged.maximums == whole.maximums
+        assert merged.metric_averages() == pytest.approx(whole.metric_averages())
+        assert merged.overall_average() == pytest.approx(whole.overall_average())
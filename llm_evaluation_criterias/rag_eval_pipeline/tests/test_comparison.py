@@ -0,0 +1,75 @@
+import itertools
+import numpy as np
+import pytest
+from src.metrics.comparison import (
+    bootstrap_means,
+    compare_metric,
+    compare_systems,
+    paired_bootstrap_test,
+    paired_permutation_test,
+    sign_flip_null
+)
+
+def exact_sign_flip_p_value(differences):
+    """Enumerate every sign assignment of a small difference vector"""
+    signs = np.array(list(itertools.product([-1, 1], repeat=len(differences))))
+    return np.mean(np.abs(signs @ differences) >= abs(differences.sum()) - 1e-12)
+
+class TestPermutationTest:
+    def test_matches_exact_enumeration_for_continuous_differences(self):
+        differences = np.random.default_rng(1).normal(0.3, 1.0, 12)
+        p_value = paired_permutation_test(differences, n_permutations=50000, random_state=0)
+        assert p_value == pytest.approx(exact_sign_flip_p_value(differences), abs=0.005)
+
+    def test_grouped_null_variance_for_discrete_differences(self):
+        # Few distinct magnitudes take the grouped binomial path
+        differences = np.array([0.2] * 40 + [-0.2] * 30 + [0.4] * 10 + [0.0] * 20)
+        null = sign_flip_null(differences, n_permutations=20000, random_state=0)
+        assert null.std() == pytest.approx(np.sqrt((differences ** 2).sum()), rel=0.03)
+
+    def test_null_distribution_moments(self):
+        differences = np.random.default_rng(2).normal(0.0, 1.0, 1000)
+        null = sign_flip_null(differences, n_permutations=20000, random_state=0)
+        assert null.mean() == pytest.approx(0.0, abs=1.0)
+        assert null.std() == pytest.approx(np.sqrt((differences ** 2).sum()), rel=0.03)
+
+    def test_identical_systems(self):
+        assert paired_permutation_test(np.zeros(50)) == 1.0
+
+class TestBootstrap:
+    @pytest.mark.parametrize("values", [
+        np.random.default_rng(3).normal(0.05, 1.0, 1000),
+        np.random.default_rng(4).choice([-0.2, 0.0, 0.2], 1000)
+    ])
+    def test_standard_error(self, values):
+        means = bootstrap_means(values, n_resamples=5000, random_state=0)
+        assert means.mean() == pytest.approx(values.mean(), abs=0.01)
+        assert means.std() == pytest.approx(values.std() / np.sqrt(values.size), rel=0.1)
+
+    def test_interval_contains_mean(self):
+        values = np.random.default_rng(5).normal(0.5, 1.0, 500)
+        ci_lower, ci_upper, p_value = paired_bootstrap_test(values, random_state=0)
+        assert ci_lower < values.mean() < ci_upper
+        assert p_value < 0.01
+
+class TestCompareSystems:
+    def test_detects_improvement(self):
+        rng = np.random.default_rng(6)
+        a = rng.random(2000)
+        b = np.clip(a + rng.normal(0.05, 0.1, 2000), 0, 1)
+        comparison = compare_metric("semantic_similarity", a, b, random_state=0)
+        assert comparison.mean_difference > 0
+        assert comparison.permutation_p_value < 0.001
+        assert comparison.wins + comparison.losses + comparison.ties == 2000
+
+    def test_results_are_reproducible_across_threads(self):
+        rng = np.random.default_rng(7)
+        scores_a = {name: rng.random(300) for name in ("precision_at_k", "recall_at_k", "keyword_coverage")}
+        scores_b = {name: rng.random(300) for name in scores_a}
+        parallel = compare_systems(scores_a, scores_b, n_permutations=2000, random_state=0)
+        serial = compare_systems(scores_a, scores_b, n_permutations=2000, random_state=0, max_workers=1)
+        assert parallel == serial
+
+    def test_rejects_unpaired_scores(self):
+        with pytest.raises(ValueError):
+            compare_metric("precision_at_k", [0.1, 0.2], [0.1])
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import HashingVectorizer
+from src.metrics.retrieval_metrics import RetrievalMetrics
+from src.retrieval.bm25 import load_corpus
+from src.retrieval.dense import DenseRetriever
+from src.utils.data_types import RelevanceCriteria, SearchQuery
+from pathlib import Path
+
+TEST_DATA = Path(__file__).parent / "test_data"
+
+class HashingEncoder:
+    """Deterministic stand-in for a SentenceTransformer"""
+    def __init__(self, dim=64):
+        self.vectorizer = HashingVectorizer(n_features=dim, alternate_sign=False, norm=None)
+
+    def encode(self, texts):
+        return self.vectorizer.transform(texts).toarray().astype(np.float32)
+
+class SliceRecorder:
+    """Array wrapper recording how many rows each slice read copies out"""
+    def __init__(self, array):
+        self.array = array
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self.slice_rows = []
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, item):
+        rows = self.array[item]
+        self.slice_rows.append(len(rows))
+        return rows
+
+class TestDenseRetriever:
+    @pytest.fixture(scope="class")
+    def corpus(self):
+        return load_corpus(TEST_DATA / "financial_corpus.json")
+
+    @pytest.fixture(scope="class")
+    def vectors(self):
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(20, 32))
+        points = centers[rng.integers(0, 20, size=3000)] + 0.3 * rng.normal(size=(3000, 32))
+        return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+    def test_blocked_exact_search_matches_brute_force(self, vectors):
+        retriever = DenseRetriever(vectors.astype(np.float32), [f"D{i}" for i in range(len(vectors))],
+                                   block_elements=5000)
+        queries = vectors[:40]
+        scores, rows = retriever.search_exact(queries, k=7)
+        expected = np.argsort(-(queries @ vectors.T), axis=1)[:, :7]
+        assert np.array_equal(rows, expected)
+        assert np.allclose(scores, np.take_along_axis(queries @ vectors.T, expected, axis=1), atol=1e-5)
+
+    def test_single_query_reads_corpus_in_bounded_blocks(self, vectors):
+        embeddings = SliceRecorder(vectors.astype(np.float16))
+        retriever = DenseRetriever(embeddings, [f"D{i}" for i in range(len(vectors))], block_elements=4096)
+        _, rows = retriever.search_exact(vectors[:1], k=5)
+        assert rows[0, 0] == 0
+        assert max(embeddings.slice_rows) * vectors.shape[1] <= 4096
+        assert sum(embeddings.slice_rows) == len(vectors)
+
+    def test_ivf_recall_grows_with_n_probe(self, vectors):
+        retriever = DenseRetriever(vectors.astype(np.float16), [f"D{i}" for i in range(len(vectors))])
+        retriever.train_ivf(n_lists=30)
+        queries = vectors[::50]
+        low = retriever.ivf_recall(queries, k=10, n_probe=1)
+        assert low <= retriever.ivf_recall(queries, k=10, n_probe=5)
+        assert retriever.ivf_recall(queries, k=10, n_probe=30) == 1.0
+
+    def test_saved_index_round_trips_and_feeds_evaluation(self, corpus, tmp_path):
+        encoder = HashingEncoder()
+        built = DenseRetriever.build(corpus, model=encoder, path=tmp_path, batch_size=2)
+        built.train_ivf(n_lists=2, path=tmp_path)
+        loaded = DenseRetriever.load(tmp_path, documents=corpus, model=encoder)
+        assert isinstance(loaded.embeddings, np.memmap)
+        assert loaded.embeddings.dtype == np.float16
+        assert np.array_equal(loaded.list_order, built.list_order)
+
+        query = SearchQuery(
+            query_id="Q1", query="dividend payments to shareholders",
+            expected_relevant_content="", keywords=["dividend"],
+            relevance_criteria=RelevanceCriteria(must_contain=["dividend"], should_contain=[], semantic_aspects=[])
+        )
+        exact, = loaded.retrieve_batch([query], k=3)
+        approximate, = loaded.retrieve_batch([query], k=3, n_probe=2)
+        assert exact.query_id == "Q1" and len(exact.retrieved_documents) == 3
+        assert exact.scores == sorted(exact.scores, reverse=True)
+        assert [list(d) for d in approximate.retrieved_documents] == [list(d) for d in exact.retrieved_documents]
+        metrics = RetrievalMetrics(model=encoder).evaluate_retrieval(query, exact, k=3)
+        assert {m.metric_name for m in metrics} >= {"precision_at_k", "recall_at_k"}
@@ -0,0 +1,89 @@
+import json
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pytest
+from src.metrics.retrieval_metrics import RetrievalMetrics
+from src.models.embedding_store import EmbeddingStore
+from src.utils.data_types import RetrievalResult, SearchQuery
+from tests.test_dense import HashingEncoder
+
+TEST_DATA = Path(__file__).parent / "test_data"
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+class NoEncoder:
+    def encode(self, texts):
+        raise AssertionError("store-backed metrics must not encode")
+
+def semantic_scores(metrics, pairs):
+    return [next(m.score for m in metrics.evaluate_retrieval(q, r) if m.metric_name == "semantic_similarity")
+            for q, r in pairs]
+
+def store_rows(store, texts):
+    return store.get(texts)
+
+class TestEmbeddingStore:
+    @pytest.fixture(scope="class")
+    def pairs(self):
+        with open(TEST_DATA / "test_queries.json") as f:
+            cases = json.load(f)["test_cases"]
+        return [(SearchQuery(**case["query"]), RetrievalResult(**case["simulated_result"])) for case in cases]
+
+    def test_store_backed_similarity_matches_encoder(self, pairs, tmp_path):
+        encoder = HashingEncoder()
+        store = EmbeddingStore.for_evaluation([q for q, _ in pairs], [r for _, r in pairs], encoder, tmp_path,
+                                              model_name=MODEL_NAME)
+        expected = semantic_scores(RetrievalMetrics(model=encoder), pairs)
+        stored = semantic_scores(RetrievalMetrics(model_name=MODEL_NAME, model=NoEncoder(), embedding_store=store),
+                                 pairs)
+        assert stored == pytest.approx(expected, abs=1e-6)
+
+    def test_missing_texts_fall_back_to_encoder(self, pairs, tmp_path):
+        encoder = HashingEncoder()
+        store = EmbeddingStore.build(["unrelated text"], encoder, tmp_path, model_name=MODEL_NAME)
+        expected = semantic_scores(RetrievalMetrics(model=encoder), pairs)
+        metrics = RetrievalMetrics(model_name=MODEL_NAME, model=encoder, embedding_store=store)
+        assert semantic_scores(metrics, pairs) == pytest.approx(expected)
+
+    def test_reused_ids_with_new_text_are_encoded(self, pairs, tmp_path):
+        encoder = HashingEncoder()
+        store = EmbeddingStore.for_evaluation([q for q, _ in pairs], [r for _, r in pairs], encoder, tmp_path,
+                                              model_name=MODEL_NAME)
+        query, result = pairs[0]
+        changed_query = query.model_copy(update={"query": query.query + " with a new twist"})
+        changed_result = result.model_copy(update={"retrieved_documents": [
+            {doc_id: "entirely different passage text"} for d in result.retrieved_documents for doc_id in d
+        ]})
+        changed = [(changed_query, result), (query, changed_result)]
+        expected = semantic_scores(RetrievalMetrics(model=encoder), changed)
+        stored = semantic_scores(RetrievalMetrics(model_name=MODEL_NAME, model=encoder, embedding_store=store), changed)
+        assert stored == pytest.approx(expected)
+        assert expected[0] != pytest.approx(semantic_scores(RetrievalMetrics(model=encoder), [pairs[0]])[0])
+
+    def test_rejects_store_of_another_model(self, tmp_path):
+        store = EmbeddingStore.build(["text"], HashingEncoder(dim=32), tmp_path, model_name="other-model")
+        reopened = EmbeddingStore(tmp_path)
+        assert (reopened.model_name, reopened.dim) == ("other-model", 32)
+        with pytest.raises(ValueError):
+            RetrievalMetrics(model_name=MODEL_NAME, embedding_store=store)
+
+        class SizedEncoder(HashingEncoder):
+            def get_sentence_embedding_dimension(self):
+                return 64
+        with pytest.raises(ValueError):
+            RetrievalMetrics(model_name="other-model", model=SizedEncoder(), embedding_store=store)
+
+    def test_workers_map_the_same_file(self, pairs):
+        store = EmbeddingStore.for_evaluation([q for q, _ in pairs], [r for _, r in pairs], HashingEncoder(),
+                                              model_name=MODEL_NAME)
+        try:
+            assert isinstance(store.embeddings, np.memmap)
+            assert len(pickle.dumps(store)) < 1000
+            texts = [pairs[0][0].query] + [content for d in pairs[0][1].retrieved_documents for content in d.values()]
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                rows = pool.submit(store_rows, store, texts).result()
+            assert np.array_equal(rows, store.get(texts))
+        finally:
+            store.cleanup()
+        assert not store.path.exists()
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+import numpy as np
+import pytest
+from src.metrics.generation_metrics import GenerationMetrics, split_sentences
+from src.utils.data_types import GenerationSample
+from tests.test_dense import HashingEncoder
+
+TEST_DATA = Path(__file__).parent / "test_data"
+
+class CountingEncoder(HashingEncoder):
+    def __init__(self):
+        super().__init__(dim=256)
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return super().encode(texts)
+
+def brute_force(encoder, answer, contexts, threshold):
+    answer_sentences = split_sentences(answer)
+    context_sentences = [s for c in contexts for s in split_sentences(c)]
+    a, c = encoder.encode(answer_sentences), encoder.encode(context_sentences)
+    a /= np.linalg.norm(a, axis=1, keepdims=True)
+    c /= np.linalg.norm(c, axis=1, keepdims=True)
+    similarities = a @ c.T
+    return similarities.max(axis=1).mean(), (similarities.max(axis=0) >= threshold).mean()
+
+class TestGenerationMetrics:
+    @pytest.fixture(scope="class")
+    def samples(self):
+        with open(TEST_DATA / "test_queries.json") as f:
+            cases = json.load(f)["test_cases"]
+        samples = []
+        for case in cases:
+            contexts = [list(d.values())[0] for d in case["simulated_result"]["retrieved_documents"]]
+            # A grounded answer copies context sentences; an ungrounded one is unrelated text
+            samples.append(GenerationSample(query_id=case["query"]["query_id"], query=case["query"]["query"],
+                                            answer=" ".join(split_sentences(contexts[0])[:2]), contexts=contexts))
+            samples.append(GenerationSample(query_id=case["query"]["query_id"] + "-x", query=case["query"]["query"],
+                                            answer="Zebras graze quietly. Volcanoes erupt lava.", contexts=contexts))
+        return samples
+
+    def test_split_sentences(self):
+        assert split_sentences("Revenue rose 3.5% in Q1. Margins fell!\nOutlook: stable?  ") == \
+            ["Revenue rose 3.5% in Q1.", "Margins fell!", "Outlook: stable?"]
+        assert split_sentences("") == []
+
+    def test_scores_match_brute_force(self, samples):
+        encoder = HashingEncoder(dim=256)
+        metrics = GenerationMetrics(model=encoder, support_threshold=0.5, block_elements=7)
+        for sample, result in zip(samples, metrics.evaluate_batch(samples)):
+            scores = {m.metric_name: m.score for m in result.metrics}
+            faithfulness, utilization = brute_force(encoder, sample.answer, sample.contexts, 0.5)
+            assert scores["faithfulness"] == pytest.approx(faithfulness, abs=1e-5)
+            assert scores["context_utilization"] == pytest.approx(utilization)
+            assert set(scores) == {"faithfulness", "context_utilization", "answer_relevance"}
+
+    def test_grounded_answers_score_higher(self, samples):
+        results = GenerationMetrics(model=HashingEncoder(dim=256)).evaluate_batch(samples)
+        faithfulness = [r.metrics[0].score for r in results]
+        for grounded, ungrounded in zip(faithfulness[::2], faithfulness[1::2]):
+            assert grounded == pytest.approx(1.0, abs=1e-5) and ungrounded < 0.5
+
+    def test_sentences_encoded_once_per_batch(self, samples):
+        encoder = CountingEncoder()
+        GenerationMetrics(model=encoder, batch_size=16).evaluate_batch(samples)
+        assert len(encoder.encoded) == len(set(encoder.encoded))
+        assert "Zebras graze quietly." in encoder.encoded
+
+    def test_empty_answer_scores_zero(self):
+        metrics = GenerationMetrics(model=HashingEncoder()).evaluate_generation(
+            GenerationSample(query_id="Q", query="q", answer="", contexts=["Some context."]))
+        assert [m.score for m in metrics] == [0.0, 0.0, 0.0]
@@ -0,0 +1,87 @@
+import threading
+import pytest
+import torch
+from src.models.registry import ANY_MODEL, ModelRegistry, estimate_model_memory
+
+MB = 1024 * 1024
+
+def make_loader(calls):
+    """Loader that builds a float32 module of `name` MB, e.g. '3' -> 3 MB"""
+    def loader(name):
+        calls.append(name)
+        return torch.nn.Linear(int(name) * MB // 4, 1, bias=False)
+    return loader
+
+class TestModelRegistry:
+    def test_models_are_shared(self):
+        calls = []
+        registry = ModelRegistry(memory_budget_mb=10, default_model="1", loader=make_loader(calls))
+        assert registry.get() is registry.get("1")
+        assert calls == ["1"]
+
+    def test_memory_estimate(self):
+        model = torch.nn.Linear(MB // 4, 1, bias=False)
+        assert estimate_model_memory(model) == MB
+
+    def test_lru_eviction_respects_budget(self):
+        calls = []
+        registry = ModelRegistry(memory_budget_mb=5, allowed_models=[ANY_MODEL], loader=make_loader(calls))
+        registry.get("2")
+        registry.get("3")
+        registry.get("2")  # "3" becomes least recently used
+        registry.get("1")
+        assert "3" not in registry
+        assert "2" in registry and "1" in registry
+        assert registry.memory_usage() <= 5 * MB
+
+    def test_oversized_model_is_still_served(self):
+        registry = ModelRegistry(memory_budget_mb=2, allowed_models=[ANY_MODEL], loader=make_loader([]))
+        registry.get("1")
+        model = registry.get("4")
+        assert model is not None
+        assert [m["name"] for m in registry.loaded_models()] == ["4"]
+
+    def test_allow_list(self):
+        registry = ModelRegistry(allowed_models=["1"], loader=make_loader([]))
+        with pytest.raises(KeyError):
+            registry.get("2")
+
+    def test_only_default_model_without_allow_list(self):
+        calls = []
+        registry = ModelRegistry(default_model="1", loader=make_loader(calls))
+        registry.get()
+        with pytest.raises(KeyError):
+            registry.get("2")
+        assert calls == ["1"]
+
+    def test_concurrent_requests_load_once(self):
+        calls = []
+        registry = ModelRegistry(memory_budget_mb=10, allowed_models=[ANY_MODEL], loader=make_loader(calls))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("2"))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert calls == ["2"]
+        assert all(r is results[0] for r in results)
+
+class TestModelSelectionApi:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from fastapi.testclient import TestClient
+        from src.api import main
+
+        def failing_loader(name):
+            raise OSError(f"{name} is not a valid model identifier")
+        monkeypatch.setattr(main, "registry", ModelRegistry(default_model="default", loader=failing_loader))
+        return TestClient(main.app)
+
+    def test_unloadable_model_is_a_client_error(self, client):
+        response = client.post("/evaluate/generation", json=[])
+        assert response.status_code == 400
+        assert "could not be loaded" in response.json()["detail"]
+
+    def test_jobs_reject_models_outside_the_allow_list(self, client):
+        response = client.post("/jobs?job_id=j1&model_name=someone/huge-model", json={"queries": [], "results": []})
+        assert response.status_code == 400
@@ -0,0 +1,64 @@
+import threading
+import time
+import pytest
+from src.jobs.checkpoint import MetricAggregator, evaluate_pair
+from src.jobs.queue import ShardQueue
+from src.jobs.worker import run_worker
+from tests.test_checkpoint import CountingMetrics, make_inputs
+
+class FailingMetrics:
+    def evaluate_retrieval(self, query, result, k=5):
+        raise RuntimeError("encoder crashed")
+
+class TestShardQueue:
+    def test_concurrent_workers_match_sequential_evaluation(self, tmp_path):
+        queries, results = make_inputs(95)
+        queue = ShardQueue(tmp_path / "queue.db")
+        assert queue.submit("job", queries, results, shard_size=10) == 10
+
+        workers = [
+            threading.Thread(target=run_worker, args=(queue, lambda name: CountingMetrics()),
+                             kwargs={"worker_id": f"w{i}", "poll_interval": 0.01, "idle_timeout": 0.2})
+            for i in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        expected = MetricAggregator()
+        evaluations = [evaluate_pair(CountingMetrics(), q, r) for q, r in zip(queries, results)]
+        for evaluation in evaluations:
+            expected.add(evaluation)
+        batch = queue.collect("job")
+        assert queue.progress("job")["done"] == 10
+        assert batch.results == evaluations
+        assert batch.metric_averages == pytest.approx(expected.metric_averages())
+        assert batch.overall_average == pytest.approx(expected.overall_average())
+
+    def test_expired_lease_is_reassigned(self, tmp_path):
+        queries, results = make_inputs(5)
+        queue = ShardQueue(tmp_path / "queue.db", lease_seconds=0.05)
+        queue.submit("job", queries, results, shard_size=5)
+        stalled = queue.lease("stalled")
+        assert queue.lease("other") is None
+        time.sleep(0.1)
+        taken = queue.lease("other")
+        assert taken is not None and taken.shard == stalled.shard
+        assert not queue.heartbeat(stalled, "stalled")
+        evaluations = [evaluate_pair(CountingMetrics(), q, r) for q, r in zip(taken.queries, taken.results)]
+        aggregate = MetricAggregator()
+        for evaluation in evaluations:
+            aggregate.add(evaluation)
+        assert queue.complete(taken, "other", evaluations, aggregate)
+        assert not queue.complete(stalled, "stalled", evaluations, aggregate)
+        assert queue.is_finished("job")
+
+    def test_shard_fails_after_max_attempts(self, tmp_path):
+        queries, results = make_inputs(4)
+        queue = ShardQueue(tmp_path / "queue.db", max_attempts=2)
+        queue.submit("job", queries, results, shard_size=2)
+        run_worker(queue, lambda name: FailingMetrics(), "w", poll_interval=0.01, idle_timeout=0.05)
+        assert queue.progress("job") == {"pending": 0, "leased": 0, "done": 0, "failed": 2}
+        with pytest.raises(ValueError):
+            queue.collect("job")
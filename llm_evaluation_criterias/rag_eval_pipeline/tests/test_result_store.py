@@ -0,0 +1,78 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from src.reporting.result_store import ResultStore
+
+EXAMPLE_REPORTS = Path(__file__).parent.parent / "example_reports"
+METRICS = ["precision_at_k", "recall_at_k", "semantic_similarity"]
+
+def make_version(query_ids, seed):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({"query_id": query_ids, "query": [f"text {q}" for q in query_ids]})
+    for metric in METRICS:
+        frame[metric] = rng.random(len(query_ids))
+    return frame
+
+class TestResultStore:
+    def test_diff_joins_on_query_id(self, tmp_path):
+        store = ResultStore(tmp_path)
+        frame_a = make_version([f"Q{i}" for i in range(500)], seed=0)
+        frame_b = make_version([f"Q{i}" for i in range(450, 50, -1)] + ["Q900"], seed=1)
+        store.write("finance", "1", frame_a)
+        store.write("finance", "2", frame_b)
+        assert store.versions("finance") == ["1", "2"] and store.domains() == ["finance"]
+
+        diff = store.diff("finance", "1", "2", top_n=5, n_permutations=500, n_bootstrap=500, random_state=0)
+        joined = frame_a.merge(frame_b, on="query_id", suffixes=("_a", "_b"))
+        assert diff.n_queries == len(joined)
+        assert diff.only_in_b == ["Q900"] and len(diff.only_in_a) == 500 - len(joined)
+        for comparison in diff.comparisons:
+            expected = (joined[f"{comparison.metric_name}_b"] - joined[f"{comparison.metric_name}_a"]).mean()
+            assert comparison.mean_difference == pytest.approx(expected)
+
+        long = pd.concat([
+            pd.DataFrame({"query_id": joined["query_id"], "metric_name": m, "delta": joined[f"{m}_b"] - joined[f"{m}_a"]})
+            for m in METRICS
+        ]).nsmallest(5, "delta")
+        assert [(r.query_id, r.metric_name) for r in diff.worst_regressions] == \
+            list(zip(long["query_id"], long["metric_name"]))
+        assert all(r.delta == pytest.approx(r.score_b - r.score_a) for r in diff.worst_regressions)
+
+    def test_diff_reads_only_key_and_metric_columns(self, tmp_path, monkeypatch):
+        store = ResultStore(tmp_path)
+        frame = make_version([f"Q{i}" for i in range(20)], seed=3)
+        frame["extra_metric"] = 0.5
+        store.write("ml", "a", frame)
+        store.write("ml", "b", frame.drop(columns="extra_metric"))
+        requested = []
+        read_parquet = pd.read_parquet
+        def recording_read_parquet(path, columns=None, **kwargs):
+            requested.append(columns)
+            return read_parquet(path, columns=columns, **kwargs)
+        monkeypatch.setattr(pd, "read_parquet", recording_read_parquet)
+        diff = store.diff("ml", "a", "b", n_permutations=100, n_bootstrap=100)
+        assert requested == [["query_id", *METRICS]] * 2
+        assert [c.metric_name for c in diff.comparisons] == METRICS
+
+    def test_identical_versions_have_no_regressions(self, tmp_path):
+        store = ResultStore(tmp_path)
+        frame = make_version([f"Q{i}" for i in range(50)], seed=2)
+        store.write("ml", "a", frame)
+        store.write("ml", "b", frame)
+        diff = store.diff("ml", "a", "b", n_permutations=200, n_bootstrap=200)
+        assert diff.worst_regressions == []
+        assert all(c.mean_difference == 0 and c.permutation_p_value == 1.0 for c in diff.comparisons)
+
+    def test_ingests_report_directories(self, tmp_path):
+        store = ResultStore(tmp_path)
+        added = store.ingest_reports(EXAMPLE_REPORTS / "finance")
+        assert added == store.versions("finance") and added
+        assert store.ingest_reports(EXAMPLE_REPORTS / "finance") == []
+        stored = store.read("finance", added[0], columns=["query_id", "precision_at_k"])
+        csv = pd.read_csv(EXAMPLE_REPORTS / "finance" / f"v{added[0]}" / "csv" / "detailed_results.csv")
+        assert stored["precision_at_k"].tolist() == csv["precision_at_k"].tolist()
+
+    def test_rejects_unsafe_partition_names(self, tmp_path):
+        with pytest.raises(ValueError):
+            ResultStore(tmp_path).write("../finance", "1", make_version(["Q1"], seed=0))
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from src.metrics.sampling import StratifiedSampler, allocate_sample, approximate_evaluation, stratified_estimate
+
+class TestStratifiedSampling:
+    def test_allocation_is_proportional_with_minimum(self):
+        allocation = allocate_sample(np.array([1000, 10, 3, 500]), 50)
+        assert allocation.sum() == 50
+        assert list(allocation) == [30, 2, 2, 16]
+
+    def test_allocation_capped_by_stratum_size(self):
+        assert list(allocate_sample(np.array([5, 5]), 100)) == [5, 5]
+
+    def test_growing_sample_keeps_earlier_items(self):
+        sampler = StratifiedSampler(np.repeat([0, 1, 2], 100), random_state=0)
+        small, large = sampler.sample(30), sampler.sample(90)
+        assert set(small) <= set(large)
+
+    def test_full_sample_has_no_error(self):
+        values = np.arange(10.0)
+        strata = np.array([0] * 5 + [1] * 5)
+        estimate, standard_error = stratified_estimate(values, strata, {0: 5, 1: 5})
+        assert estimate == pytest.approx(values.mean())
+        assert standard_error == 0.0
+
+    def test_interval_covers_population_mean(self):
+        rng = np.random.default_rng(0)
+        strata = rng.integers(0, 4, 20000)
+        values = rng.beta(2 + strata, 3)
+        covered = 0
+        for seed in range(100):
+            result = approximate_evaluation(lambda i: {"m": values[i]}, strata, sample_size=300, random_state=seed)
+            estimate = result.estimates[0]
+            covered += estimate.ci_lower <= values.mean() <= estimate.ci_upper
+        assert covered >= 88
+
+    def test_sample_grows_until_decided(self):
+        rng = np.random.default_rng(1)
+        strata = rng.integers(0, 3, 10000)
+        values = rng.random(10000)
+        evaluated = []
+        def evaluate_item(index):
+            evaluated.append(index)
+            return {"m": values[index]}
+        result = approximate_evaluation(evaluate_item, strata, sample_size=20,
+                                        baseline={"m": values.mean() - 0.02}, random_state=0)
+        assert result.rounds > 1
+        assert result.passed is True
+        assert len(evaluated) == len(set(evaluated)) == result.n_sampled
+
+    def test_unchanged_system_passes_on_a_sample(self):
+        rng = np.random.default_rng(2)
+        strata = rng.integers(0, 4, 20000)
+        values = rng.beta(2 + strata, 3)
+        result = approximate_evaluation(lambda i: {"m": values[i]}, strata, sample_size=200,
+                                        baseline={"m": values.mean()}, random_state=0)
+        assert result.passed is True
+        assert result.n_sampled < result.n_total
+        with pytest.raises(ValueError):
+            approximate_evaluation(lambda i: {"m": values[i]}, strata, baseline={"m": values.mean()}, tolerance=0.0)
@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from src.reporting import report_generator
+from src.reporting.report_generator import RAGEvaluationReporter
+from src.reporting.streaming import StreamingReportWriter
+from src.utils.data_types import MetricResult
+
+METRICS = ["precision_at_k", "semantic_similarity"]
+TEST_DATA = Path(__file__).parent / "test_data"
+
+def make_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "query_id": [f"Q{i}" for i in range(n)],
+        "query": [f"question {i}" for i in range(n)],
+        "expected_content": ["content"] * n,
+        "precision_at_k": rng.choice([0.0, 0.2, 0.4, 0.6, 0.8, 1.0], n),
+        "semantic_similarity": rng.random(n)
+    })
+
+class TestStreamingReportWriter:
+    @pytest.fixture
+    def written(self, tmp_path):
+        rows = make_rows(2500)
+        writer = StreamingReportWriter(tmp_path, "test", top_n=5, page_size=1000)
+        for i, row in enumerate(rows.to_dict("records")):
+            writer.add(row, slice_label=f"bucket {i % 3}")
+        report = writer.close(n_test_cases=len(rows), corpus_size=10)
+        return rows, writer, report, tmp_path
+
+    def test_heaps_keep_worst_and_best_queries(self, written):
+        rows, writer, _, _ = written
+        for metric in METRICS:
+            worst = rows.sort_values(metric, kind="stable").head(5)
+            best = rows.loc[rows[metric].sort_values(ascending=False, kind="stable").index[:5]]
+            assert [q for q, _, _ in writer.worst(metric)] == worst["query_id"].tolist()
+            assert [s for _, _, s in writer.best(metric)] == best[metric].tolist()
+
+    def test_summaries_match_pandas(self, written):
+        rows, writer, _, tmp_path = written
+        summaries = pd.read_csv(tmp_path / "csv" / "metric_summaries.csv", index_col=0)
+        for metric in METRICS:
+            assert summaries.loc[metric, "mean"] == pytest.approx(rows[metric].mean())
+            assert summaries.loc[metric, "std"] == pytest.approx(rows[metric].std())
+            assert summaries.loc[metric, "min"] == pytest.approx(rows[metric].min())
+        assert writer.slice_stats["bucket 1"]["semantic_similarity"].mean == \
+            pytest.approx(rows["semantic_similarity"].iloc[1::3].mean())
+        assert writer.histograms["precision_at_k"].sum() == len(rows)
+
+    def test_detail_is_paginated(self, written):
+        rows, writer, report, tmp_path = written
+        pages = sorted((tmp_path / "markdown" / "queries").glob("page_*.md"))
+        assert len(pages) == writer.n_pages == 3
+        assert sum(p.read_text().count("| Q") for p in pages) == len(rows)
+        detailed = pd.read_csv(tmp_path / "csv" / "detailed_results.csv")
+        pd.testing.assert_frame_equal(detailed, rows)
+        text = report.read_text()
+        assert "queries/page_0003.md" in text and text.count("\n") < 100
+
+    def test_files_are_closed_when_evaluation_fails(self, tmp_path, monkeypatch):
+        class FailingMetrics:
+            calls = 0
+            def evaluate_retrieval(self, query, result, k=5):
+                self.calls += 1
+                if self.calls == 2:
+                    raise RuntimeError("encoder crashed")
+                return [MetricResult(metric_name="precision_at_k", score=0.5)]
+
+        opened = []
+        class RecordingWriter(StreamingReportWriter):
+            def add(self, row, slice_label=None):
+                super().add(row, slice_label)
+                opened.extend([self._details_file, self._values_file, self._page_file])
+        monkeypatch.setattr(report_generator, "StreamingReportWriter", RecordingWriter)
+
+        with open(TEST_DATA / "test_queries.json") as f:
+            test_cases = json.load(f)
+        reporter = RAGEvaluationReporter(tmp_path, version="failed")
+        reporter.metrics = FailingMetrics()
+        with pytest.raises(RuntimeError):
+            reporter.generate_report(test_cases, {"documents": []}, streaming=True)
+        assert len(opened) == 3 and all(f.closed for f in opened)
+        assert not (tmp_path / "vfailed" / "markdown" / "evaluation_report.md").exists()